@@ -1,11 +1,172 @@
 # enhanced_admin_dashboard.py - Admin Dashboard dengan Monitoring Terintegrasi
 from PyQt5 import QtWidgets, QtCore, QtGui
-from db import connect
+from app_db_fixed import list_users_page, max_user_id, count_users_since
+from monitoring_store import (
+    MonitoringStore, COUNTER_LOGINS, COUNTER_FAILED_LOGINS, COUNTER_ADMIN_ACTIONS,
+    export_monitoring_data, ExportCancelled
+)
+from monitoring_reports import ReportEngine, REPORT_SUMMARY, REPORT_DETAILED
 import datetime
-import sqlite3
-import json
 from pathlib import Path
 
+
+class UserTableModel(QtCore.QAbstractTableModel):
+    """
+    Model tabel user yang mengambil data per halaman dari server.
+
+    Data tidak pernah dimuat sekaligus: view memanggil canFetchMore/fetchMore
+    saat user scroll ke bawah, dan setiap halaman diambil dengan keyset
+    pagination (index-backed) sehingga halaman ke-N sama cepatnya dengan
+    halaman pertama.
+    """
+
+    HEADERS = ["ID", "Username", "Role", "Status", "Last Login"]
+    # Kolom view -> kolom sort di server (None = tidak bisa di-sort)
+    SORT_COLUMNS = {0: "id", 1: "username", 2: "role"}
+    PAGE_SIZE = 200
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._has_more = True
+        self.search = ""
+        self.prefix_search = False
+        self.role = None
+        self.sort_column = "id"
+        self.descending = True
+        # User dengan id > new_since_id ditandai "Baru"
+        self.new_since_id = 0
+
+    # ---------- Qt model API ----------
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        uid, uname, urole = self._rows[index.row()]
+        col = index.column()
+        is_new = uid > self.new_since_id > 0
+
+        if role == QtCore.Qt.DisplayRole:
+            if col == 0:
+                return str(uid)
+            if col == 1:
+                return uname
+            if col == 2:
+                return urole
+            if col == 3:
+                return "🆕 Baru" if is_new else "✅ Lama"
+            if col == 4:
+                return "N/A"
+        elif role == QtCore.Qt.BackgroundRole and col == 3 and is_new:
+            return QtGui.QColor(QtCore.Qt.yellow)
+        return None
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()):
+        return not parent.isValid() and self._has_more
+
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        if parent.isValid() or not self._has_more:
+            return
+        rows = list_users_page(
+            limit=self.PAGE_SIZE, after=self._last_key(),
+            search=self.search, role=self.role,
+            sort_column=self.sort_column, descending=self.descending,
+            prefix=self.prefix_search,
+        )
+        self._has_more = len(rows) == self.PAGE_SIZE
+        if not rows:
+            return
+        start = len(self._rows)
+        self.beginInsertRows(QtCore.QModelIndex(), start, start + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def sort(self, column, order=QtCore.Qt.AscendingOrder):
+        """Sorting dilakukan di server (index-backed), bukan di memory."""
+        sort_column = self.SORT_COLUMNS.get(column)
+        if not sort_column:
+            return
+        self.sort_column = sort_column
+        self.descending = order == QtCore.Qt.DescendingOrder
+        self.reload()
+
+    # ---------- Helpers ----------
+    def _last_key(self):
+        if not self._rows:
+            return None
+        uid, uname, urole = self._rows[-1]
+        if self.sort_column == "username":
+            return (uname, uid)
+        if self.sort_column == "role":
+            return (urole, uid)
+        return (uid,)
+
+    def set_filter(self, search="", role=None, prefix=False):
+        self.search = search
+        self.role = role
+        self.prefix_search = prefix
+        self.reload()
+
+    def reload(self):
+        """Buang halaman yang sudah dimuat lalu ambil halaman pertama lagi."""
+        self.beginResetModel()
+        self._rows = []
+        self._has_more = True
+        self.endResetModel()
+        self.fetchMore()
+
+    def row_values(self, row):
+        """Return (id, username, role, status) untuk baris tertentu."""
+        uid, uname, urole = self._rows[row]
+        status = self.data(self.index(row, 3))
+        return uid, uname, urole, status
+
+    def loaded_count(self):
+        return len(self._rows)
+
+
+class ExportWorker(QtCore.QThread):
+    """Jalankan streaming export monitoring data di background thread."""
+
+    progress = QtCore.pyqtSignal(int, int)      # done, total
+    finished_ok = QtCore.pyqtSignal(dict)       # rows per table
+    failed = QtCore.pyqtSignal(str)
+    cancelled = QtCore.pyqtSignal()
+
+    def __init__(self, db_path, filename, admin_user, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.filename = filename
+        self.admin_user = admin_user
+        self._cancel = False
+
+    def cancel(self):
+        self._cancel = True
+
+    def run(self):
+        try:
+            counts = export_monitoring_data(
+                self.db_path, self.filename, self.admin_user,
+                progress=self.progress.emit,
+                cancelled=lambda: self._cancel,
+            )
+            self.finished_ok.emit(counts)
+        except ExportCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
 class EnhancedAdminDashboard(QtWidgets.QMainWindow):
     def __init__(self, username="admin"):
         super().__init__()
@@ -35,43 +196,15 @@ class EnhancedAdminDashboard(QtWidgets.QMainWindow):
         self.log_admin_activity("ADMIN_LOGIN", f"Admin {username} logged into dashboard")
         
     def setup_monitoring_db(self):
-        """Setup database untuk monitoring."""
+        """Setup database untuk monitoring (satu koneksi WAL + writer thread)."""
         self.monitoring_db = "admin_monitoring.db"
-        with sqlite3.connect(self.monitoring_db) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS user_activities (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    username TEXT,
-                    action TEXT,
-                    details TEXT,
-                    ip_address TEXT DEFAULT 'localhost',
-                    success BOOLEAN DEFAULT 1
-                )
-            """)
-            
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS login_sessions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT,
-                    login_time DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    logout_time DATETIME,
-                    session_duration INTEGER,
-                    role TEXT,
-                    ip_address TEXT DEFAULT 'localhost'
-                )
-            """)
-            
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS admin_actions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    admin_username TEXT,
-                    action TEXT,
-                    target_user TEXT,
-                    details TEXT
-                )
-            """)
+        self.monitoring = MonitoringStore(self.monitoring_db)
+        
+        # Report dihitung di background + cache per periode
+        self.report_engine = ReportEngine(self.monitoring, self.username, self)
+        self.report_engine.report_ready.connect(self._on_report_ready)
+        self.report_engine.report_failed.connect(self._on_report_failed)
+        self.detailed_report_text = None
         
     def setup_ui(self):
         central = QtWidgets.QWidget()
@@ -151,10 +284,41 @@ class EnhancedAdminDashboard(QtWidgets.QMainWindow):
         toolbar.addStretch()
         layout.addLayout(toolbar)
         
-        # Tabel user
-        self.table = QtWidgets.QTableWidget(0, 5)
-        self.table.setHorizontalHeaderLabels(["ID", "Username", "Role", "Status", "Last Login"])
-        self.table.horizontalHeader().setStretchLastSection(True)
+        # Search & filter (server-side)
+        filter_bar = QtWidgets.QHBoxLayout()
+        self.user_search = QtWidgets.QLineEdit()
+        self.user_search.setPlaceholderText("🔍 Cari username...")
+        self.user_search.setClearButtonEnabled(True)
+        self.prefix_check = QtWidgets.QCheckBox("Awalan saja")
+        self.role_filter = QtWidgets.QComboBox()
+        self.role_filter.addItems(["Semua role", "admin", "penerbit", "user"])
+        self.loaded_label = QtWidgets.QLabel("")
+        self.loaded_label.setStyleSheet("color: #64748b;")
+        filter_bar.addWidget(self.user_search, 1)
+        filter_bar.addWidget(self.prefix_check)
+        filter_bar.addWidget(self.role_filter)
+        filter_bar.addWidget(self.loaded_label)
+        layout.addLayout(filter_bar)
+        
+        # Debounce pencarian supaya tidak query di setiap ketikan
+        self.search_timer = QtCore.QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(300)
+        self.search_timer.timeout.connect(self.apply_user_filter)
+        
+        # Tabel user (model/view, data diambil per halaman)
+        self.user_model = UserTableModel(self)
+        self.user_model.rowsInserted.connect(self.update_loaded_label)
+        self.user_model.modelReset.connect(self.update_loaded_label)
+        self.table = QtWidgets.QTableView()
+        self.table.setModel(self.user_model)
+        user_header = self.table.horizontalHeader()
+        user_header.setStretchLastSection(True)
+        user_header.setSectionsClickable(True)
+        user_header.setSortIndicatorShown(True)
+        user_header.setSortIndicator(0, QtCore.Qt.DescendingOrder)
+        user_header.sortIndicatorChanged.connect(self.user_model.sort)
+        self.table.verticalHeader().setVisible(False)
         self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
         self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
         
@@ -170,6 +334,9 @@ class EnhancedAdminDashboard(QtWidgets.QMainWindow):
         self.copy_btn.clicked.connect(self.copy_selected_rows)
         self.auto_refresh_btn.clicked.connect(self.toggle_auto_refresh)
         self.interval_spin.valueChanged.connect(self.update_refresh_interval)
+        self.user_search.textChanged.connect(lambda _: self.search_timer.start())
+        self.prefix_check.toggled.connect(lambda _: self.apply_user_filter())
+        self.role_filter.currentIndexChanged.connect(lambda _: self.apply_user_filter())
         
         self.tab_widget.addTab(user_tab, "👥 User Management")
         
@@ -342,56 +509,30 @@ class EnhancedAdminDashboard(QtWidgets.QMainWindow):
         
     def log_admin_activity(self, action, details="", target_user=""):
         """Log admin activities untuk monitoring."""
-        with sqlite3.connect(self.monitoring_db) as conn:
-            conn.execute("""
-                INSERT INTO admin_actions (admin_username, action, target_user, details)
-                VALUES (?, ?, ?, ?)
-            """, (self.username, action, target_user, details))
+        self.monitoring.log_admin_action(self.username, action, target_user, details)
         
         self.add_log(f"🔧 ADMIN: {action} - {details}")
         
     def log_user_activity(self, username, action, details="", success=True):
         """Log user activities."""
-        with sqlite3.connect(self.monitoring_db) as conn:
-            conn.execute("""
-                INSERT INTO user_activities (username, action, details, success)
-                VALUES (?, ?, ?, ?)
-            """, (username, action, details, success))
+        self.monitoring.log_user_activity(username, action, details, success)
             
     def load_monitoring_data(self):
         """Load monitoring data untuk tab monitoring."""
         try:
-            with sqlite3.connect(self.monitoring_db) as conn:
-                cursor = conn.cursor()
-                
-                # Total logins
-                cursor.execute("SELECT COUNT(*) FROM user_activities WHERE action LIKE '%LOGIN%'")
-                total_logins = cursor.fetchone()[0]
-                
-                # Active today
-                cursor.execute("""
-                    SELECT COUNT(DISTINCT username) FROM user_activities 
-                    WHERE date(timestamp) = date('now') AND action LIKE '%LOGIN%'
-                """)
-                active_today = cursor.fetchone()[0]
-                
-                # Failed attempts
-                cursor.execute("""
-                    SELECT COUNT(*) FROM user_activities 
-                    WHERE action LIKE '%LOGIN%' AND success = 0
-                """)
-                failed_attempts = cursor.fetchone()[0]
-                
-                # Admin actions
-                cursor.execute("SELECT COUNT(*) FROM admin_actions")
-                admin_actions = cursor.fetchone()[0]
-                
-                # Update statistics cards
-                self.stats_cards["total_logins"].setText(str(total_logins))
-                self.stats_cards["active_today"].setText(str(active_today))
-                self.stats_cards["failed_attempts"].setText(str(failed_attempts))
-                self.stats_cards["admin_actions"].setText(str(admin_actions))
-                
+            # Statistik dari counter & rollup (tidak scan user_activities)
+            total_logins = self.monitoring.counter(COUNTER_LOGINS)
+            active_today = self.monitoring.active_users_on()
+            failed_attempts = self.monitoring.counter(COUNTER_FAILED_LOGINS)
+            admin_actions = self.monitoring.counter(COUNTER_ADMIN_ACTIONS)
+            
+            # Update statistics cards
+            self.stats_cards["total_logins"].setText(str(total_logins))
+            self.stats_cards["active_today"].setText(str(active_today))
+            self.stats_cards["failed_attempts"].setText(str(failed_attempts))
+            self.stats_cards["admin_actions"].setText(str(admin_actions))
+            
+            with self.monitoring.cursor() as cursor:
                 # Load recent activities
                 cursor.execute("""
                     SELECT timestamp, username, action, details, success
@@ -426,137 +567,57 @@ class EnhancedAdminDashboard(QtWidgets.QMainWindow):
             self.add_log(f"❌ Error loading monitoring data: {str(e)}")
             
     def update_statistics(self):
-        """Update statistics based on selected period."""
-        period_map = {
-            "Last 24 hours": 1,
-            "Last 7 days": 7,
-            "Last 30 days": 30
-        }
-        days = period_map.get(self.period_combo.currentText(), 7)
-        
-        try:
-            with sqlite3.connect(self.monitoring_db) as conn:
-                cursor = conn.cursor()
-                
-                # Generate statistics report
-                cursor.execute(f"""
-                    SELECT COUNT(*) FROM user_activities 
-                    WHERE timestamp > datetime('now', '-{days} days')
-                """)
-                total_activities = cursor.fetchone()[0]
-                
-                cursor.execute(f"""
-                    SELECT COUNT(DISTINCT username) FROM user_activities 
-                    WHERE timestamp > datetime('now', '-{days} days') AND action LIKE '%LOGIN%'
-                """)
-                unique_users = cursor.fetchone()[0]
-                
-                cursor.execute(f"""
-                    SELECT username, COUNT(*) as count FROM user_activities 
-                    WHERE timestamp > datetime('now', '-{days} days')
-                    GROUP BY username ORDER BY count DESC LIMIT 10
-                """)
-                top_users = cursor.fetchall()
-                
-                # Format report
-                report = f"""
-=== CRYPTO INSIGHT MONITORING REPORT ===
-Period: {self.period_combo.currentText()}
-Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-📊 SUMMARY:
-• Total Activities: {total_activities}
-• Unique Active Users: {unique_users}
-• Average Activities per User: {total_activities/unique_users if unique_users > 0 else 0:.1f}
-
-👥 TOP ACTIVE USERS:
-"""
-                for i, (username, count) in enumerate(top_users, 1):
-                    report += f"{i:2d}. {username}: {count} activities\n"
-                
-                report += f"""
-
-📈 INSIGHTS:
-• Most active period: {self.period_combo.currentText()}
-• Monitoring since: Admin dashboard launch
-• Real-time tracking: ✅ Active
-
-=== END REPORT ===
-"""
-                
-                self.stats_text.setPlainText(report)
-                
-        except Exception as e:
-            self.stats_text.setPlainText(f"Error generating statistics: {str(e)}")
+        """Update statistics based on selected period (dihitung di background)."""
+        period = self.period_combo.currentText()
+        report = self.report_engine.request(REPORT_SUMMARY, period)
+        if report is not None:
+            # Tampilkan report cache (bisa stale) selama versi baru dihitung
+            self.stats_text.setPlainText(report)
+        else:
+            self.stats_text.setPlainText(f"⏳ Generating report for {period}...")
             
     def generate_detailed_report(self):
         """Generate detailed report in new window."""
-        try:
-            report_dialog = QtWidgets.QDialog(self)
-            report_dialog.setWindowTitle("Detailed Monitoring Report")
-            report_dialog.resize(800, 600)
-            
-            layout = QtWidgets.QVBoxLayout(report_dialog)
-            
-            # Generate comprehensive report
-            with sqlite3.connect(self.monitoring_db) as conn:
-                cursor = conn.cursor()
-                
-                # All activities
-                cursor.execute("""
-                    SELECT timestamp, username, action, details, success
-                    FROM user_activities 
-                    ORDER BY timestamp DESC
-                """)
-                all_activities = cursor.fetchall()
-                
-                # Admin actions
-                cursor.execute("""
-                    SELECT timestamp, admin_username, action, target_user, details
-                    FROM admin_actions 
-                    ORDER BY timestamp DESC
-                """)
-                admin_actions = cursor.fetchall()
-            
-            report_text = QtWidgets.QTextEdit()
-            report_text.setFont(QtGui.QFont("Courier New", 9))
-            
-            detailed_report = f"""
-=== COMPREHENSIVE MONITORING REPORT ===
-Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-Admin: {self.username}
-
-📋 ALL USER ACTIVITIES ({len(all_activities)} total):
-"""
-            
-            for timestamp, username, action, details, success in all_activities[:100]:  # Limit to 100
-                status = "✅" if success else "❌"
-                detailed_report += f"{timestamp} | {username} | {action} | {details} {status}\n"
-            
-            detailed_report += f"""
-
-🔧 ADMIN ACTIONS ({len(admin_actions)} total):
-"""
-            
-            for timestamp, admin_user, action, target, details in admin_actions:
-                detailed_report += f"{timestamp} | {admin_user} | {action} | Target: {target} | {details}\n"
-            
-            report_text.setPlainText(detailed_report)
-            layout.addWidget(report_text)
-            
-            # Export button
-            export_btn = QtWidgets.QPushButton("💾 Export to File")
-            export_btn.clicked.connect(lambda: self.export_report_to_file(detailed_report))
-            layout.addWidget(export_btn)
-            
-            close_btn = QtWidgets.QPushButton("Close")
-            close_btn.clicked.connect(report_dialog.accept)
-            layout.addWidget(close_btn)
+        report_dialog = QtWidgets.QDialog(self)
+        report_dialog.setWindowTitle("Detailed Monitoring Report")
+        report_dialog.resize(800, 600)
+        
+        layout = QtWidgets.QVBoxLayout(report_dialog)
+        
+        report_text = QtWidgets.QTextEdit()
+        report_text.setFont(QtGui.QFont("Courier New", 9))
+        layout.addWidget(report_text)
+        self.detailed_report_text = report_text
+        
+        # Report dari cache langsung tampil; versi terbaru menyusul via report_ready
+        detailed_report = self.report_engine.request(REPORT_DETAILED)
+        report_text.setPlainText(detailed_report or "⏳ Generating detailed report...")
+        
+        # Export button
+        export_btn = QtWidgets.QPushButton("💾 Export to File")
+        export_btn.clicked.connect(lambda: self.export_report_to_file(report_text.toPlainText()))
+        layout.addWidget(export_btn)
+        
+        close_btn = QtWidgets.QPushButton("Close")
+        close_btn.clicked.connect(report_dialog.accept)
+        layout.addWidget(close_btn)
+        
+        report_dialog.exec_()
+        self.detailed_report_text = None
+        
+    def _on_report_ready(self, kind, period, text):
+        """Report baru selesai dihitung di background."""
+        if kind == REPORT_SUMMARY and period == self.period_combo.currentText():
+            self.stats_text.setPlainText(text)
+        elif kind == REPORT_DETAILED and self.detailed_report_text is not None:
+            self.detailed_report_text.setPlainText(text)
             
-            report_dialog.exec_()
-            
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Error", f"Failed to generate report: {str(e)}")
+    def _on_report_failed(self, kind, period, error):
+        if kind == REPORT_SUMMARY:
+            self.stats_text.setPlainText(f"Error generating statistics: {error}")
+        elif self.detailed_report_text is not None:
+            self.detailed_report_text.setPlainText(f"Failed to generate report: {error}")
+        self.add_log(f"❌ Report error ({kind}): {error}")
             
     def export_report_to_file(self, report_content):
         """Export report to text file."""
@@ -576,44 +637,58 @@ Admin: {self.username}
                 QtWidgets.QMessageBox.critical(self, "Error", f"Failed to export report: {str(e)}")
                 
     def export_monitoring_data(self):
-        """Export monitoring data to JSON."""
-        try:
-            filename, _ = QtWidgets.QFileDialog.getSaveFileName(
-                self, "Export Monitoring Data", 
-                f"monitoring_data_{datetime.date.today()}.json",
-                "JSON Files (*.json)"
-            )
-            
-            if filename:
-                with sqlite3.connect(self.monitoring_db) as conn:
-                    cursor = conn.cursor()
-                    
-                    # Get all data
-                    cursor.execute("SELECT * FROM user_activities ORDER BY timestamp DESC")
-                    activities = cursor.fetchall()
-                    
-                    cursor.execute("SELECT * FROM admin_actions ORDER BY timestamp DESC")
-                    admin_actions = cursor.fetchall()
-                
-                export_data = {
-                    'export_info': {
-                        'generated_at': datetime.datetime.now().isoformat(),
-                        'admin_user': self.username,
-                        'total_activities': len(activities),
-                        'total_admin_actions': len(admin_actions)
-                    },
-                    'user_activities': activities,
-                    'admin_actions': admin_actions
-                }
-                
-                with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(export_data, f, indent=2, default=str)
-                
-                QtWidgets.QMessageBox.information(self, "Export Complete", f"Data exported to:\n{filename}")
-                self.log_admin_activity("EXPORT_DATA", f"Exported monitoring data to JSON: {filename}")
-                
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Export Error", f"Failed to export data: {str(e)}")
+        """Export monitoring data (NDJSON / CSV, opsional gzip) secara streaming di background."""
+        if getattr(self, "export_worker", None) and self.export_worker.isRunning():
+            QtWidgets.QMessageBox.information(self, "Export", "Export sebelumnya masih berjalan.")
+            return
+        
+        filename, selected_filter = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Export Monitoring Data", 
+            f"monitoring_data_{datetime.date.today()}.ndjson",
+            "NDJSON (*.ndjson);;NDJSON gzip (*.ndjson.gz);;CSV (*.csv);;CSV gzip (*.csv.gz)"
+        )
+        if not filename:
+            return
+        # Tambahkan ekstensi sesuai filter jika user tidak menulisnya
+        ext = selected_filter[selected_filter.find("*") + 1:-1] if "*" in selected_filter else ""
+        if ext and not filename.endswith(ext):
+            filename += ext
+        
+        # Pastikan event yang masih di antrian ikut ter-export
+        self.monitoring.flush()
+        
+        self.export_progress = QtWidgets.QProgressDialog("Exporting monitoring data...", "Cancel", 0, 100, self)
+        self.export_progress.setWindowTitle("Export Data")
+        self.export_progress.setWindowModality(QtCore.Qt.WindowModal)
+        self.export_progress.setMinimumDuration(0)
+        self.export_progress.setAutoClose(False)
+        self.export_progress.setAutoReset(False)
+        
+        self.export_worker = ExportWorker(self.monitoring_db, filename, self.username, self)
+        self.export_worker.progress.connect(self._on_export_progress)
+        self.export_worker.finished_ok.connect(lambda counts: self._on_export_done(filename, counts))
+        self.export_worker.failed.connect(self._on_export_failed)
+        self.export_worker.cancelled.connect(self._on_export_cancelled)
+        self.export_progress.canceled.connect(self.export_worker.cancel)
+        self.export_worker.start()
+        
+    def _on_export_progress(self, done, total):
+        self.export_progress.setValue(int(done * 100 / total) if total else 100)
+        self.export_progress.setLabelText(f"Exporting monitoring data... {done:,}/{total:,} rows")
+        
+    def _on_export_done(self, filename, counts):
+        self.export_progress.close()
+        total = sum(counts.values())
+        QtWidgets.QMessageBox.information(self, "Export Complete", f"{total:,} rows exported to:\n{filename}")
+        self.log_admin_activity("EXPORT_DATA", f"Exported monitoring data ({total} rows): {filename}")
+        
+    def _on_export_failed(self, error):
+        self.export_progress.close()
+        QtWidgets.QMessageBox.critical(self, "Export Error", f"Failed to export data: {error}")
+        
+    def _on_export_cancelled(self):
+        self.export_progress.close()
+        self.add_log("⏹️ Export monitoring data dibatalkan")
             
     def clear_logs(self):
         """Clear system logs display."""
@@ -671,20 +746,15 @@ Admin: {self.username}
     def auto_check_new_users(self):
         """Cek otomatis apakah ada user baru."""
         try:
-            conn = connect()
-            cur = conn.cursor()
-            cur.execute("SELECT COUNT(*) FROM users")
-            current_count = cur.fetchone()[0]
-            conn.close()
-            
+            # Bandingkan id terakhir (index-only) - tidak perlu COUNT(*) seluruh tabel
             if self.last_user_count == 0:
                 # First time initialization
-                self.last_user_count = current_count
+                self.last_user_count = max_user_id()
                 return
                 
-            if current_count > self.last_user_count:
+            new_users = count_users_since(self.last_user_count)
+            if new_users > 0:
                 # Ada user baru!
-                new_users = current_count - self.last_user_count
                 self.add_log(f"🚨 ALERT: {new_users} user baru terdeteksi!")
                 self.status_label.setText(f"🔔 {new_users} user baru terdeteksi! Memuat ulang data...")
                 self.status_label.setStyleSheet("color: #dc2626; font-weight: 600; padding: 8px; background: #fef2f2; border-radius: 6px; margin: 4px 0;")
@@ -695,7 +765,7 @@ Admin: {self.username}
                 # Refresh table
                 self.load_users()
                 self.load_monitoring_data()  # Refresh monitoring data too
-                self.last_user_count = current_count
+                self.last_user_count = max_user_id()
                 
                 # Show notification
                 QtWidgets.QMessageBox.information(
@@ -724,46 +794,28 @@ Admin: {self.username}
         self.load_monitoring_data()
         
     def load_users(self):
-        """Ambil semua user dari database dan tampilkan di tabel."""
-        try:
-            conn = connect()
-            cur = conn.cursor()
-            cur.execute("SELECT id, username, role FROM users ORDER BY id DESC")  # DESC untuk user terbaru di atas
-            rows = cur.fetchall()
-            conn.close()
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "DB Error", str(e))
-            self.add_log(f"❌ DB Error: {str(e)}")
-            return
-
-        self.table.setRowCount(0)
-        for r, (uid, uname, role) in enumerate(rows):
-            self.table.insertRow(r)
-            self.table.setItem(r, 0, QtWidgets.QTableWidgetItem(str(uid)))
-            self.table.setItem(r, 1, QtWidgets.QTableWidgetItem(uname))
-            self.table.setItem(r, 2, QtWidgets.QTableWidgetItem(role))
-            
-            # Status column - highlight user baru (ID tinggi)
-            if uid > self.last_user_count - len(rows) + 5:  # Rough estimation for "new"
-                status_item = QtWidgets.QTableWidgetItem("🆕 Baru")
-                status_item.setBackground(QtCore.Qt.yellow)
-            else:
-                status_item = QtWidgets.QTableWidgetItem("✅ Lama")
-            
-            self.table.setItem(r, 3, status_item)
-            
-            # Last login info (placeholder - could be enhanced with actual login tracking)
-            last_login_item = QtWidgets.QTableWidgetItem("N/A")
-            self.table.setItem(r, 4, last_login_item)
-            
-        self.table.resizeColumnsToContents()
+        """Muat ulang halaman pertama user dari database (sisanya saat scroll)."""
+        if self.user_model.new_since_id == 0:
+            # User dengan id di atas ini dianggap "Baru" selama sesi dashboard
+            self.user_model.new_since_id = max_user_id()
+        self.user_model.reload()
         
-        # Update last user count
-        if rows:
-            self.last_user_count = len(rows)
-            
         # Log user view action
-        self.log_admin_activity("VIEW_USERS", f"Viewed user list - {len(rows)} users total")
+        self.log_admin_activity("VIEW_USERS", f"Viewed user list - {self.user_model.loaded_count()} users loaded")
+        
+    def apply_user_filter(self):
+        """Terapkan pencarian username dan filter role di server."""
+        role = self.role_filter.currentText()
+        self.user_model.set_filter(
+            search=self.user_search.text().strip(),
+            role=None if role == "Semua role" else role,
+            prefix=self.prefix_check.isChecked(),
+        )
+        
+    def update_loaded_label(self, *args):
+        """Tampilkan jumlah baris yang sudah dimuat."""
+        more = "+" if self.user_model.canFetchMore() else ""
+        self.loaded_label.setText(f"{self.user_model.loaded_count()}{more} user")
         
     def copy_selected_rows(self):
         """Salin baris terpilih (ID, Username, Role) ke clipboard."""
@@ -772,18 +824,16 @@ Admin: {self.username}
             QtWidgets.QMessageBox.information(self, "Info", "Pilih minimal satu baris.")
             return
         lines = []
+        copied_users = []
         for idx in sel:
-            rid = self.table.item(idx.row(), 0).text()
-            uname = self.table.item(idx.row(), 1).text()
-            role = self.table.item(idx.row(), 2).text()
-            status = self.table.item(idx.row(), 3).text()
+            rid, uname, role, status = self.user_model.row_values(idx.row())
             lines.append(f"{rid}\t{uname}\t{role}\t{status}")
+            copied_users.append(uname)
         QtWidgets.QApplication.clipboard().setText("\n".join(lines))
         QtWidgets.QMessageBox.information(self, "Disalin", "Data user sudah disalin ke clipboard.")
         self.add_log(f"📋 Data {len(sel)} user disalin ke clipboard")
         
         # Log copy action
-        copied_users = [self.table.item(idx.row(), 1).text() for idx in sel]
         self.log_admin_activity("COPY_USER_DATA", f"Copied data for users: {', '.join(copied_users)}")
         
     def add_log(self, message):
@@ -801,4 +851,9 @@ Admin: {self.username}
         self.stop_auto_refresh()
         self.add_log("🔴 Enhanced Admin dashboard ditutup")
         self.log_admin_activity("ADMIN_LOGOUT", f"Admin {self.username} logged out from dashboard")
+        if getattr(self, "export_worker", None) and self.export_worker.isRunning():
+            self.export_worker.cancel()
+            self.export_worker.wait()
+        self.report_engine.shutdown()
+        self.monitoring.close()
         event.accept()
\ No newline at end of file
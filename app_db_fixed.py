@@ -1,8 +1,9 @@
 # app_db_fixed.py — Railway PostgreSQL helpers with IMPROVED ERROR HANDLING
-import os, sys, configparser, hashlib
+import os, sys, configparser, hashlib, threading, time
 from typing import Optional, Tuple, List
 import psycopg2
 from psycopg2 import OperationalError, DatabaseError
+from psycopg2.extras import execute_values
 
 # ---------- Config ----------
 def _app_dir() -> str:
@@ -49,21 +50,85 @@ def _load_database_url() -> Optional[str]:
 
 DATABASE_URL: Optional[str] = _load_database_url()
 
-# ---------- Core DB with Error Handling ----------
-def connect() -> Tuple[Optional[psycopg2.extensions.connection], Optional[str]]:
-    """
-    Connect to PostgreSQL database with comprehensive error handling.
-    Returns: (connection, db_type) or (None, None) on failure
-    """
-    if not DATABASE_URL:
-        print("❌ DATABASE_URL tidak ditemukan!")
-        print("   Pastikan file config.ini ada dan berisi DATABASE_URL yang valid.")
-        print("   Atau set environment variable DATABASE_URL.")
-        return None, None
-    
+# ---------- Connection pool ----------
+# SSL handshake ke Railway mahal: connect() memakai ulang koneksi idle,
+# dan conn.close() mengembalikan koneksi ke pool (transaksi di-rollback).
+POOL_MAX_IDLE = 4
+POOL_PING_AFTER = 30.0   # detik idle sebelum koneksi dicek dengan SELECT 1
+
+_idle: List[Tuple[psycopg2.extensions.connection, float]] = []
+_idle_lock = threading.Lock()
+
+
+class PooledConnection:
+    """Proxy koneksi psycopg2; close() mengembalikan koneksi ke pool."""
+
+    __slots__ = ("_raw",)
+
+    def __init__(self, raw):
+        object.__setattr__(self, "_raw", raw)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._raw, name, value)
+
+    @property
+    def closed(self) -> int:
+        return 1 if self._raw is None else self._raw.closed
+
+    def close(self):
+        raw = self._raw
+        if raw is not None:
+            object.__setattr__(self, "_raw", None)
+            _release(raw)
+
+
+def _release(raw):
+    try:
+        if not raw.closed:
+            raw.rollback()
+            raw.autocommit = False
+            with _idle_lock:
+                if len(_idle) < POOL_MAX_IDLE:
+                    _idle.append((raw, time.monotonic()))
+                    return
+        raw.close()
+    except Exception:
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+
+def _acquire_idle():
+    while True:
+        with _idle_lock:
+            if not _idle:
+                return None
+            raw, released_at = _idle.pop()
+        if raw.closed:
+            continue
+        if time.monotonic() - released_at > POOL_PING_AFTER:
+            # Koneksi lama bisa sudah diputus server / proxy
+            try:
+                cur = raw.cursor()
+                cur.execute("SELECT 1;")
+                cur.close()
+                raw.rollback()
+            except Exception:
+                try:
+                    raw.close()
+                except Exception:
+                    pass
+                continue
+        return raw
+
+
+def _open_connection() -> Optional[psycopg2.extensions.connection]:
     try:
-        conn = psycopg2.connect(DATABASE_URL, sslmode="require", connect_timeout=10)
-        return conn, "postgres"
+        return psycopg2.connect(DATABASE_URL, sslmode="require", connect_timeout=10)
     except OperationalError as e:
         print(f"❌ Database connection failed (Operational Error):")
         print(f"   {str(e)}")
@@ -72,13 +137,67 @@ def connect() -> Tuple[Optional[psycopg2.extensions.connection], Optional[str]]:
         print("   - Wrong credentials in DATABASE_URL")
         print("   - Database server is down")
         print("   - Firewall blocking connection")
-        return None, None
+        return None
     except DatabaseError as e:
         print(f"❌ Database error: {str(e)}")
-        return None, None
+        return None
     except Exception as e:
         print(f"❌ Unexpected error connecting to database: {str(e)}")
+        return None
+
+
+def warm_pool(size: int = 2) -> int:
+    """Buka beberapa koneksi paralel ke pool (startup). Return jumlah yang berhasil."""
+    if not DATABASE_URL:
+        return 0
+    opened = []
+
+    def open_one():
+        raw = _open_connection()
+        if raw is not None:
+            opened.append(raw)
+
+    threads = [threading.Thread(target=open_one, daemon=True) for _ in range(min(size, POOL_MAX_IDLE))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for raw in opened:
+        _release(raw)
+    return len(opened)
+
+
+def close_pool():
+    """Tutup semua koneksi idle (saat aplikasi keluar)."""
+    with _idle_lock:
+        idle = list(_idle)
+        _idle.clear()
+    for raw, _ in idle:
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+
+# ---------- Core DB with Error Handling ----------
+def connect() -> Tuple[Optional[PooledConnection], Optional[str]]:
+    """
+    Connect to PostgreSQL database with comprehensive error handling.
+    Reuses an idle pooled connection when available; close() returns it.
+    Returns: (connection, db_type) or (None, None) on failure
+    """
+    if not DATABASE_URL:
+        print("❌ DATABASE_URL tidak ditemukan!")
+        print("   Pastikan file config.ini ada dan berisi DATABASE_URL yang valid.")
+        print("   Atau set environment variable DATABASE_URL.")
         return None, None
+    
+    raw = _acquire_idle()
+    if raw is None:
+        raw = _open_connection()
+        if raw is None:
+            return None, None
+    return PooledConnection(raw), "postgres"
 
 def setup_database() -> bool:
     """
@@ -98,21 +217,33 @@ def setup_database() -> bool:
                 id SERIAL PRIMARY KEY,
                 username VARCHAR(100) UNIQUE NOT NULL,
                 password VARCHAR(256) NOT NULL,
-                role VARCHAR(50) DEFAULT 'user'
+                role VARCHAR(50) NOT NULL DEFAULT 'user'
             );
         """)
+        # Keyset paging (role, id) butuh role NOT NULL (migration_phase2_admin_users.sql)
+        cur.execute("UPDATE users SET role = 'user' WHERE role IS NULL;")
+        cur.execute("ALTER TABLE users ALTER COLUMN role SET NOT NULL;")
 
         # Tabel presence
         cur.execute("""
             CREATE TABLE IF NOT EXISTS user_sessions (
               id SERIAL PRIMARY KEY,
               username VARCHAR(100) NOT NULL,
+              user_id    INTEGER REFERENCES users(id) ON DELETE CASCADE,
               started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
               last_seen  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
               status     VARCHAR(16) NOT NULL DEFAULT 'online'
             );
         """)
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_user_sessions_username ON user_sessions(username);")
+        # Presence memakai user_id (lihat migration_phase11_user_ids.sql)
+        cur.execute("""
+            ALTER TABLE user_sessions
+            ADD COLUMN IF NOT EXISTS user_id INTEGER REFERENCES users(id) ON DELETE CASCADE;
+        """)
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_user_sessions_user_id_last_seen
+            ON user_sessions(user_id, last_seen DESC) INCLUDE (status);
+        """)
         cur.execute("CREATE INDEX IF NOT EXISTS idx_user_sessions_last_seen ON user_sessions(last_seen);")
 
         # Tabel berita (khusus role 'penerbit')
@@ -122,12 +253,44 @@ def setup_database() -> bool:
               title VARCHAR(200) NOT NULL,
               content TEXT NOT NULL,
               author VARCHAR(100) NOT NULL,
+              author_id INTEGER REFERENCES users(id) ON DELETE SET NULL,
               status VARCHAR(20) NOT NULL DEFAULT 'draft',
-              created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+              created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+              updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+            );
+        """)
+        # Index mengikuti query list_my_news / list_published_news
+        # (lihat migration_phase8_query_indexes.sql)
+        cur.execute("""
+            ALTER TABLE news
+            ADD COLUMN IF NOT EXISTS author_id INTEGER REFERENCES users(id) ON DELETE SET NULL;
+        """)
+        # Artikel lama (sebelum author_id) - query penerbit hanya memakai author_id
+        # (lihat migration_phase11_user_ids.sql)
+        cur.execute("""
+            UPDATE news n SET author_id = u.id
+            FROM users u
+            WHERE n.author_id IS NULL AND u.username = n.author;
+        """)
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_news_author_id_created
+            ON news(author_id, created_at DESC) INCLUDE (id, title, status);
+        """)
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_news_published_created
+            ON news(created_at DESC) INCLUDE (id, title, author)
+            WHERE status = 'published';
+        """)
+        # Watermark untuk local_replica (lihat migration_phase17_news_updated_at.sql)
+        cur.execute("ALTER TABLE news ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW();")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_news_updated_at ON news(updated_at, id);")
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS news_deletions (
+              id INTEGER PRIMARY KEY,
+              deleted_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
             );
         """)
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_news_created_at ON news(created_at DESC);")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_news_author ON news(author);")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_news_deletions_deleted_at ON news_deletions(deleted_at, id);")
 
         conn.commit()
         conn.close()
@@ -140,6 +303,32 @@ def setup_database() -> bool:
             conn.close()
         return False
 
+# Naikkan jika setup_database() berubah
+SCHEMA_SETUP_VERSION = 4
+
+def ensure_schema() -> bool:
+    """
+    Run setup_database() once per SCHEMA_SETUP_VERSION per database instead
+    of on every launch. A local marker file remembers the last version set up.
+    """
+    marker = os.path.join(_app_dir(), ".schema_version")
+    expected = f"{hashlib.sha256((DATABASE_URL or '').encode()).hexdigest()[:16]}:{SCHEMA_SETUP_VERSION}"
+    try:
+        with open(marker, "r", encoding="utf-8") as f:
+            if f.read().strip() == expected:
+                return True
+    except OSError:
+        pass
+
+    if not setup_database():
+        return False
+    try:
+        with open(marker, "w", encoding="utf-8") as f:
+            f.write(expected)
+    except OSError as e:
+        print(f"⚠️ Cannot write schema marker: {e}")
+    return True
+
 # ---------- Users with Error Handling ----------
 def user_exists(username: str) -> bool:
     """Check if user exists in database. Returns False on error."""
@@ -202,12 +391,133 @@ def verify_user(username: str, password: str) -> Optional[str]:
         print(f"❌ Error verifying user: {str(e)}")
         return None
 
+# ---------- User id lookup ----------
+# username -> users.id, di-cache per proses (username tidak pernah berubah),
+# jadi setiap user cukup di-resolve sekali per sesi aplikasi
+_user_ids: dict = {}
+
+def resolve_user_id(username: str) -> Optional[int]:
+    """Get users.id for username (cached). Returns None if not found or on error."""
+    if not username:
+        return None
+    user_id = _user_ids.get(username)
+    if user_id is not None:
+        return user_id
+        
+    try:
+        conn, _ = connect()
+        if not conn:
+            return None
+        cur = conn.cursor()
+        cur.execute("SELECT id FROM users WHERE username=%s", (username,))
+        row = cur.fetchone()
+        conn.close()
+        if row:
+            _user_ids[username] = row[0]
+        return row[0] if row else None
+    except Exception as e:
+        print(f"❌ Error resolving user id: {str(e)}")
+        return None
+
+# ---------- Admin user listing (server-side paging) ----------
+# Kolom yang boleh dipakai untuk sorting. Setiap kolom punya index:
+#   id       -> users_pkey
+#   username -> users_username_key (UNIQUE)
+#   role     -> idx_users_role_id (role, id)
+USER_SORT_COLUMNS = ("id", "username", "role")
+
+def list_users_page(limit: int = 200, after: Optional[tuple] = None,
+                    search: str = "", role: Optional[str] = None,
+                    sort_column: str = "id", descending: bool = True,
+                    prefix: bool = False) -> List[tuple]:
+    """
+    Get one page of users using keyset pagination.
+
+    after: sort key of the last row already loaded, e.g. (id,) for sort_column
+           'id', or (value, id) for 'username'/'role'. None = first page.
+    search: username filter. Substring match (ILIKE '%q%', trigram index)
+            or prefix match (ILIKE 'q%') when prefix=True.
+    role: exact role filter, applied server-side.
+    Returns: [(id, username, role), ...]
+    """
+    if sort_column not in USER_SORT_COLUMNS:
+        sort_column = "id"
+    direction = "DESC" if descending else "ASC"
+    op = "<" if descending else ">"
+
+    where, params = [], []
+    if search:
+        escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        where.append("username ILIKE %s")
+        params.append(f"{escaped}%" if prefix else f"%{escaped}%")
+    if role:
+        where.append("role = %s")
+        params.append(role)
+    if after:
+        if sort_column == "id":
+            where.append(f"id {op} %s")
+            params.append(after[0])
+        else:
+            where.append(f"({sort_column}, id) {op} (%s, %s)")
+            params.extend(after[:2])
+
+    order = f"id {direction}" if sort_column == "id" else f"{sort_column} {direction}, id {direction}"
+    sql = "SELECT id, username, role FROM users"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" ORDER BY {order} LIMIT %s;"
+    params.append(limit)
+
+    try:
+        conn, _ = connect()
+        if not conn:
+            return []
+        cur = conn.cursor()
+        cur.execute(sql, params)
+        rows = cur.fetchall()
+        conn.close()
+        return rows
+    except Exception as e:
+        print(f"⚠️ Error fetching users page: {str(e)}")
+        return []
+
+def max_user_id() -> int:
+    """Get the highest user id (index-only lookup). Returns 0 on error."""
+    try:
+        conn, _ = connect()
+        if not conn:
+            return 0
+        cur = conn.cursor()
+        cur.execute("SELECT COALESCE(MAX(id), 0) FROM users;")
+        r = cur.fetchone()
+        conn.close()
+        return r[0] if r else 0
+    except Exception as e:
+        print(f"⚠️ Error fetching max user id: {str(e)}")
+        return 0
+
+def count_users_since(last_id: int) -> int:
+    """Count users registered after last_id (range scan on users_pkey)."""
+    try:
+        conn, _ = connect()
+        if not conn:
+            return 0
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM users WHERE id > %s;", (last_id,))
+        r = cur.fetchone()
+        conn.close()
+        return r[0] if r else 0
+    except Exception as e:
+        print(f"⚠️ Error counting new users: {str(e)}")
+        return 0
+
 # ---------- Presence (online tracking) ----------
 ONLINE_WINDOW_SECONDS = 45
 
 def start_session(username: str) -> Optional[int]:
     """Start user session. Returns session_id or None on error."""
-    if not username:
+    user_id = resolve_user_id(username)
+    if not user_id:
         return None
         
     try:
@@ -216,8 +526,8 @@ def start_session(username: str) -> Optional[int]:
             return None
         cur = conn.cursor()
         cur.execute(
-            "INSERT INTO user_sessions (username, status) VALUES (%s, 'online') RETURNING id;",
-            (username,)
+            "INSERT INTO user_sessions (username, user_id, status) VALUES (%s, %s, 'online') RETURNING id;",
+            (username, user_id)
         )
         sid = cur.fetchone()[0]
         conn.commit()
@@ -275,23 +585,24 @@ def latest_presence_per_user() -> List[tuple]:
         cur = conn.cursor()
         cur.execute(f"""
             WITH latest AS (
-                SELECT username, MAX(last_seen) AS ls
+                SELECT user_id, MAX(last_seen) AS ls
                 FROM user_sessions
-                GROUP BY username
+                WHERE user_id IS NOT NULL
+                GROUP BY user_id
             )
-            SELECT l.username,
+            SELECT u.username,
                    COALESCE(u.role, 'user') AS role,
                    EXISTS(
                      SELECT 1 FROM user_sessions s
-                     WHERE s.username = l.username
+                     WHERE s.user_id = l.user_id
                        AND s.last_seen = l.ls
                        AND s.status = 'online'
                        AND s.last_seen > NOW() - INTERVAL '{ONLINE_WINDOW_SECONDS} seconds'
                    ) AS is_online,
                    to_char(l.ls AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI:SS UTC') AS last_seen_utc
             FROM latest l
-            LEFT JOIN users u ON u.username = l.username
-            ORDER BY l.username;
+            JOIN users u ON u.id = l.user_id
+            ORDER BY u.username;
         """)
         rows = cur.fetchall()
         conn.close()
@@ -301,31 +612,156 @@ def latest_presence_per_user() -> List[tuple]:
         return []
 
 # ---------- NEWS (untuk role 'penerbit') ----------
-def create_news(author: str, title: str, content: str, publish: bool = True) -> bool:
-    """Create news article. Returns True if successful."""
+# Kolom yang dikembalikan oleh create/bulk API (sama dengan list_my_news)
+_NEWS_ROW_SQL = "id, title, status, to_char(created_at AT TIME ZONE 'UTC','YYYY-MM-DD HH24:MI UTC')"
+
+def create_news(author: str, title: str, content: str, publish: bool = True) -> Optional[tuple]:
+    """
+    Create news article.
+    Returns the new row (id, title, status, created) - same shape as
+    list_my_news() - or None if it failed.
+    """
     if not author or not title or not content:
-        return False
+        return None
         
     try:
         conn, _ = connect()
         if not conn:
-            return False
+            return None
         cur = conn.cursor()
         status = 'published' if publish else 'draft'
         cur.execute(
-            "INSERT INTO news (title, content, author, status) VALUES (%s, %s, %s, %s);",
-            (title, content, author, status)
+            f"INSERT INTO news (title, content, author, author_id, status) VALUES (%s, %s, %s, %s, %s) RETURNING {_NEWS_ROW_SQL};",
+            (title, content, author, resolve_user_id(author), status)
         )
+        row = cur.fetchone()
         conn.commit()
         conn.close()
-        return True
+        return row
     except Exception as e:
         print(f"❌ Error creating news: {str(e)}")
-        return False
+        return None
+
+def update_news(author: str, news_id: int, title: str, content: str,
+                publish: Optional[bool] = None) -> Optional[tuple]:
+    """
+    Update title/content of one of the author's articles.
+    publish=None keeps the current status, True/False sets published/draft.
+    Returns the updated row (id, title, status, created) or None.
+    """
+    if not author or not news_id or not title or not content:
+        return None
+    author_id = resolve_user_id(author)
+    if not author_id:
+        return None
+        
+    try:
+        conn, _ = connect()
+        if not conn:
+            return None
+        cur = conn.cursor()
+        status = None if publish is None else ('published' if publish else 'draft')
+        cur.execute(f"""
+            UPDATE news
+            SET title = %s, content = %s, status = COALESCE(%s, status), updated_at = NOW()
+            WHERE id = %s AND author_id = %s
+            RETURNING {_NEWS_ROW_SQL};
+        """, (title, content, status, news_id, author_id))
+        row = cur.fetchone()
+        conn.commit()
+        conn.close()
+        return row
+    except Exception as e:
+        print(f"❌ Error updating news: {str(e)}")
+        return None
+
+def bulk_create_news(author: str, articles: List[Tuple[str, str]], publish: bool = False) -> List[tuple]:
+    """
+    Create many articles in one multi-row INSERT on one connection.
+    articles: [(title, content), ...] - rows with empty title/content are skipped.
+    Returns the inserted rows (id, title, status, created), empty list on failure.
+    """
+    status = 'published' if publish else 'draft'
+    author_id = resolve_user_id(author)
+    values = [(title, content, author, author_id, status)
+              for title, content in articles if title and content]
+    if not author or not values:
+        return []
+        
+    try:
+        conn, _ = connect()
+        if not conn:
+            return []
+        cur = conn.cursor()
+        rows = execute_values(
+            cur,
+            f"INSERT INTO news (title, content, author, author_id, status) VALUES %s RETURNING {_NEWS_ROW_SQL};",
+            values,
+            page_size=500,
+            fetch=True,
+        )
+        conn.commit()
+        conn.close()
+        return rows
+    except Exception as e:
+        print(f"❌ Error bulk creating news: {str(e)}")
+        return []
+
+def bulk_set_news_status(author: str, ids: List[int], publish: bool) -> List[tuple]:
+    """
+    Publish (publish=True) or unpublish many of the author's articles in one UPDATE.
+    Returns the updated rows (id, title, status, created).
+    """
+    author_id = resolve_user_id(author)
+    if not author_id or not ids:
+        return []
+        
+    try:
+        conn, _ = connect()
+        if not conn:
+            return []
+        cur = conn.cursor()
+        status = 'published' if publish else 'draft'
+        cur.execute(f"""
+            UPDATE news SET status = %s, updated_at = NOW()
+            WHERE author_id = %s AND id = ANY(%s) AND status <> %s
+            RETURNING {_NEWS_ROW_SQL};
+        """, (status, author_id, list(ids), status))
+        rows = cur.fetchall()
+        conn.commit()
+        conn.close()
+        return rows
+    except Exception as e:
+        print(f"❌ Error updating news status: {str(e)}")
+        return []
+
+def bulk_delete_news(author: str, ids: List[int]) -> List[int]:
+    """Delete many of the author's articles in one DELETE. Returns deleted ids."""
+    author_id = resolve_user_id(author)
+    if not author_id or not ids:
+        return []
+        
+    try:
+        conn, _ = connect()
+        if not conn:
+            return []
+        cur = conn.cursor()
+        cur.execute(
+            "DELETE FROM news WHERE author_id = %s AND id = ANY(%s) RETURNING id;",
+            (author_id, list(ids))
+        )
+        deleted = [row[0] for row in cur.fetchall()]
+        conn.commit()
+        conn.close()
+        return deleted
+    except Exception as e:
+        print(f"❌ Error deleting news: {str(e)}")
+        return []
 
 def list_my_news(author: str, limit: int = 50) -> List[tuple]:
     """Get news articles by author."""
-    if not author:
+    author_id = resolve_user_id(author)
+    if not author_id:
         return []
         
     try:
@@ -336,10 +772,10 @@ def list_my_news(author: str, limit: int = 50) -> List[tuple]:
         cur.execute("""
             SELECT id, title, status, to_char(created_at AT TIME ZONE 'UTC','YYYY-MM-DD HH24:MI UTC')
             FROM news
-            WHERE author=%s
+            WHERE author_id=%s
             ORDER BY created_at DESC
             LIMIT %s;
-        """, (author, limit))
+        """, (author_id, limit))
         rows = cur.fetchall()
         conn.close()
         return rows
@@ -368,6 +804,45 @@ def list_published_news(limit: int = 50) -> List[tuple]:
         print(f"⚠️ Error fetching published news: {str(e)}")
         return []
 
+# ---------- App settings (tabel app_settings, lihat migration_phase6) ----------
+def get_app_settings(prefix: str = "") -> dict:
+    """Get numeric settings whose key starts with prefix, as {key: value}."""
+    try:
+        conn, _ = connect()
+        if not conn:
+            return {}
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT key, value FROM app_settings WHERE key LIKE %s ORDER BY key;",
+            (prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%",)
+        )
+        rows = dict(cur.fetchall())
+        conn.close()
+        return rows
+    except Exception as e:
+        print(f"⚠️ Error fetching settings: {str(e)}")
+        return {}
+
+def set_app_settings(values: dict) -> bool:
+    """Insert/update numeric settings {key: value} in one transaction."""
+    if not values:
+        return True
+    try:
+        conn, _ = connect()
+        if not conn:
+            return False
+        cur = conn.cursor()
+        execute_values(cur, """
+            INSERT INTO app_settings (key, value) VALUES %s
+            ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, updated_at = NOW();
+        """, [(key, float(value)) for key, value in values.items()])
+        conn.commit()
+        conn.close()
+        return True
+    except Exception as e:
+        print(f"❌ Error saving settings: {str(e)}")
+        return False
+
 # ---------- Health Check ----------
 def health_check() -> bool:
     """Check if database connection is healthy."""
@@ -7,12 +7,19 @@ Complete backend functions untuk Phase 1 features:
 - Get user interaction data
 - Get article statistics
 
+User di tabel interaksi direferensikan lewat users.id (user_id); username
+di-resolve sekali per sesi dengan resolve_user_id() (lihat
+migration_phase11_user_ids.sql).
+
 Author: Claude + Reza
 Version: 1.0 - Phase 1 Complete
 """
 
-from app_db_fixed import connect
+from app_db_fixed import connect, get_app_settings, set_app_settings, resolve_user_id
+from hyperloglog import merge_all
 from typing import Optional, List, Tuple, Dict
+import hashlib
+import html
 import psycopg2
 
 # ============================================
@@ -24,6 +31,10 @@ def like_article(article_id: int, username: str) -> bool:
     User likes an article.
     Returns True if successful, False if already liked or error.
     """
+    user_id = resolve_user_id(username)
+    if not user_id:
+        return False
+    
     try:
         conn, _ = connect()
         if not conn:
@@ -34,11 +45,11 @@ def like_article(article_id: int, username: str) -> bool:
         
         # Insert like (will fail if already liked due to UNIQUE constraint)
         cur.execute("""
-            INSERT INTO article_likes (article_id, username)
+            INSERT INTO article_likes (article_id, user_id)
             VALUES (%s, %s)
-            ON CONFLICT (article_id, username) DO NOTHING
-            RETURNING id;
-        """, (article_id, username))
+            ON CONFLICT (article_id, user_id) DO NOTHING
+            RETURNING article_id;
+        """, (article_id, user_id))
         
         result = cur.fetchone()
         conn.commit()
@@ -62,6 +73,10 @@ def unlike_article(article_id: int, username: str) -> bool:
     User unlikes an article.
     Returns True if successful, False if not liked or error.
     """
+    user_id = resolve_user_id(username)
+    if not user_id:
+        return False
+    
     try:
         conn, _ = connect()
         if not conn:
@@ -73,9 +88,9 @@ def unlike_article(article_id: int, username: str) -> bool:
         # Delete like
         cur.execute("""
             DELETE FROM article_likes
-            WHERE article_id = %s AND username = %s
-            RETURNING id;
-        """, (article_id, username))
+            WHERE article_id = %s AND user_id = %s
+            RETURNING article_id;
+        """, (article_id, user_id))
         
         result = cur.fetchone()
         conn.commit()
@@ -99,6 +114,10 @@ def is_article_liked(article_id: int, username: str) -> bool:
     Check if user has liked an article.
     Returns True if liked, False otherwise.
     """
+    user_id = resolve_user_id(username)
+    if not user_id:
+        return False
+    
     try:
         conn, _ = connect()
         if not conn:
@@ -107,8 +126,8 @@ def is_article_liked(article_id: int, username: str) -> bool:
         cur = conn.cursor()
         cur.execute("""
             SELECT 1 FROM article_likes
-            WHERE article_id = %s AND username = %s;
-        """, (article_id, username))
+            WHERE article_id = %s AND user_id = %s;
+        """, (article_id, user_id))
         
         result = cur.fetchone()
         conn.close()
@@ -148,6 +167,10 @@ def get_user_liked_articles(username: str, limit: int = 50) -> List[Tuple]:
     Get list of articles liked by user.
     Returns: [(article_id, title, author, like_count, liked_at), ...]
     """
+    user_id = resolve_user_id(username)
+    if not user_id:
+        return []
+    
     try:
         conn, _ = connect()
         if not conn:
@@ -163,11 +186,11 @@ def get_user_liked_articles(username: str, limit: int = 50) -> List[Tuple]:
                 to_char(al.liked_at AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI UTC') as liked_at
             FROM article_likes al
             JOIN news n ON al.article_id = n.id
-            WHERE al.username = %s
+            WHERE al.user_id = %s
             AND n.status = 'published'
             ORDER BY al.liked_at DESC
             LIMIT %s;
-        """, (username, limit))
+        """, (user_id, limit))
         
         rows = cur.fetchall()
         conn.close()
@@ -191,11 +214,12 @@ def get_article_likers(article_id: int, limit: int = 50) -> List[Tuple]:
         cur = conn.cursor()
         cur.execute("""
             SELECT 
-                username,
-                to_char(liked_at AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI UTC') as liked_at
-            FROM article_likes
-            WHERE article_id = %s
-            ORDER BY liked_at DESC
+                u.username,
+                to_char(al.liked_at AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI UTC') as liked_at
+            FROM article_likes al
+            JOIN users u ON u.id = al.user_id
+            WHERE al.article_id = %s
+            ORDER BY al.liked_at DESC
             LIMIT %s;
         """, (article_id, limit))
         
@@ -212,11 +236,15 @@ def get_article_likers(article_id: int, limit: int = 50) -> List[Tuple]:
 # VIEW TRACKING
 # ============================================
 
-def track_article_view(article_id: int, username: Optional[str] = None, ip_address: str = "0.0.0.0") -> bool:
+def track_article_view(article_id: int, username: Optional[str] = None, ip_address: Optional[str] = None) -> bool:
     """
     Track an article view.
+    ip_address is stored as inet; None (or "0.0.0.0") means unknown.
     Returns True if successful.
     """
+    if ip_address == "0.0.0.0":
+        ip_address = None
+    user_id = resolve_user_id(username) if username else None
     try:
         conn, _ = connect()
         if not conn:
@@ -224,11 +252,11 @@ def track_article_view(article_id: int, username: Optional[str] = None, ip_addre
         
         cur = conn.cursor()
         
-        # Insert view record
+        # Insert view record (bulan tanpa partisi masuk article_views_default)
         cur.execute("""
-            INSERT INTO article_views (article_id, username, ip_address)
+            INSERT INTO article_views (article_id, user_id, ip_address)
             VALUES (%s, %s, %s);
-        """, (article_id, username, ip_address))
+        """, (article_id, user_id, ip_address))
         
         conn.commit()
         conn.close()
@@ -239,9 +267,11 @@ def track_article_view(article_id: int, username: Optional[str] = None, ip_addre
         return False
 
 
-def get_article_views(article_id: int) -> int:
+def get_article_views(article_id: int, days: Optional[int] = None) -> int:
     """
     Get total views for an article.
+    With days, only views from the last N days (UTC) are counted, read from
+    article_views_by_day (daily rollups + raw partitions).
     Returns view count.
     """
     try:
@@ -250,9 +280,17 @@ def get_article_views(article_id: int) -> int:
             return 0
         
         cur = conn.cursor()
-        cur.execute("""
-            SELECT views FROM news WHERE id = %s;
-        """, (article_id,))
+        if days is None:
+            cur.execute("""
+                SELECT views FROM news WHERE id = %s;
+            """, (article_id,))
+        else:
+            cur.execute("""
+                SELECT COALESCE(SUM(views), 0)
+                FROM article_views_by_day
+                WHERE article_id = %s
+                AND day > (NOW() AT TIME ZONE 'UTC')::date - %s;
+            """, (article_id, days))
         
         result = cur.fetchone()
         conn.close()
@@ -263,18 +301,56 @@ def get_article_views(article_id: int) -> int:
         return 0
 
 
-def get_trending_articles(limit: int = 10, days: int = 7) -> List[Tuple]:
+def get_article_views_by_day(article_id: int, days: int = 30) -> List[Tuple]:
+    """
+    Daily view counts for an article over the last N days (UTC).
+    Old days come from article_views_daily, recent ones from raw partitions.
+    Returns list of (day, views, unique_viewers), oldest first.
     """
-    Get trending articles based on views in last N days.
+    try:
+        conn, _ = connect()
+        if not conn:
+            return []
+        
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT day, views, unique_viewers
+            FROM article_views_by_day
+            WHERE article_id = %s
+            AND day > (NOW() AT TIME ZONE 'UTC')::date - %s
+            ORDER BY day;
+        """, (article_id, days))
+        
+        results = cur.fetchall()
+        conn.close()
+        return results
+        
+    except Exception as e:
+        print(f"❌ Error getting daily views: {e}")
+        return []
+
+
+def get_trending_articles(limit: int = 10, days: int = 7,
+                          max_staleness: Optional[float] = None) -> List[Tuple]:
+    """
+    Get trending articles by time-decayed score (migration_phase6_trending.sql).
+    Top-K read from idx_trending_log_score; only articles with activity
+    in the last N days are considered. The default 7-day window is served
+    from the v_trending_articles materialized view when it is fresh enough.
     Returns: [(article_id, title, author, views, likes, bookmarks, created_at), ...]
     """
     try:
+        if days == 7:
+            rows = _read_ranking_view('v_trending_articles', limit, max_staleness)
+            if rows is not None:
+                return rows
+        
         conn, _ = connect()
         if not conn:
             return []
         
         cur = conn.cursor()
-        cur.execute(f"""
+        cur.execute("""
             SELECT 
                 n.id,
                 n.title,
@@ -283,12 +359,13 @@ def get_trending_articles(limit: int = 10, days: int = 7) -> List[Tuple]:
                 n.like_count,
                 n.bookmark_count,
                 to_char(n.created_at AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI UTC') as created_at
-            FROM news n
+            FROM article_trending_scores s
+            JOIN news n ON n.id = s.article_id
             WHERE n.status = 'published'
-            AND n.created_at > NOW() - INTERVAL '{days} days'
-            ORDER BY n.views DESC, n.like_count DESC
+            AND s.last_event_at > NOW() - make_interval(days => %s)
+            ORDER BY s.log_score DESC
             LIMIT %s;
-        """, (limit,))
+        """, (days, limit))
         
         rows = cur.fetchall()
         conn.close()
@@ -299,12 +376,101 @@ def get_trending_articles(limit: int = 10, days: int = 7) -> List[Tuple]:
         return []
 
 
-def get_popular_articles(limit: int = 10) -> List[Tuple]:
+TRENDING_SETTING_KEYS = {
+    'view': 'trending.weight_view',
+    'like': 'trending.weight_like',
+    'bookmark': 'trending.weight_bookmark',
+    'publish': 'trending.weight_publish',
+    'half_life_hours': 'trending.half_life_hours',
+}
+
+
+def get_trending_settings() -> Dict[str, float]:
+    """Current trending weights + half-life: {'view': 1.0, 'like': 4.0, ...}"""
+    settings = get_app_settings('trending.')
+    return {name: settings[key] for name, key in TRENDING_SETTING_KEYS.items() if key in settings}
+
+
+def set_trending_settings(**values: float) -> bool:
+    """
+    Tune trending weights / half-life, e.g. set_trending_settings(like=5, half_life_hours=12).
+    Stored scores are rebuilt from recent events so the new weights apply everywhere.
+    """
+    unknown = set(values) - set(TRENDING_SETTING_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown trending setting(s): {', '.join(sorted(unknown))}")
+    if any(value <= 0 for value in values.values()):
+        raise ValueError("Trending weights and half-life must be positive")
+    
+    if not set_app_settings({TRENDING_SETTING_KEYS[name]: value for name, value in values.items()}):
+        return False
+    
+    try:
+        conn, _ = connect()
+        if not conn:
+            return False
+        cur = conn.cursor()
+        cur.execute("SELECT trending_rebuild();")
+        count = cur.fetchone()[0]
+        conn.commit()
+        conn.close()
+        print(f"✅ Trending scores rebuilt for {count} articles")
+        return True
+    except Exception as e:
+        print(f"❌ Error rebuilding trending scores: {e}")
+        return False
+
+
+def _read_ranking_view(view_name: str, limit: int, max_staleness: Optional[float]) -> Optional[List[Tuple]]:
+    """
+    Top-K read from a materialized ranking view (migration_phase7).
+    Returns None when the view is older than max_staleness seconds
+    (default: app_settings 'matview.max_staleness_seconds'), so the caller
+    can fall back to a live query. Errors (e.g. matview_refresh_log or the
+    view missing before phase 7) also return None.
+    """
+    conn, _ = connect()
+    if not conn:
+        return None
+    
+    try:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT refreshed_at > NOW() - make_interval(
+                secs => COALESCE(%s, app_setting('matview.max_staleness_seconds', 300)))
+            FROM matview_refresh_log
+            WHERE view_name = %s;
+        """, (max_staleness, view_name))
+        fresh = cur.fetchone()
+        if not fresh or not fresh[0]:
+            return None
+        
+        cur.execute(f"""
+            SELECT id, title, author, views, like_count, bookmark_count, created_at_formatted
+            FROM {view_name}
+            ORDER BY rank
+            LIMIT %s;
+        """, (limit,))
+        return cur.fetchall()
+    except Exception as e:
+        print(f"⚠️ Ranking view {view_name} unavailable, using live query: {e}")
+        return None
+    finally:
+        conn.close()
+
+
+def get_popular_articles(limit: int = 10, max_staleness: Optional[float] = None) -> List[Tuple]:
     """
     Get all-time popular articles by views.
+    Reads the v_popular_articles materialized view when it is fresh enough,
+    otherwise queries news directly.
     Returns: [(article_id, title, author, views, likes, bookmarks, created_at), ...]
     """
     try:
+        rows = _read_ranking_view('v_popular_articles', limit, max_staleness)
+        if rows is not None:
+            return rows
+        
         conn, _ = connect()
         if not conn:
             return []
@@ -334,12 +500,18 @@ def get_popular_articles(limit: int = 10) -> List[Tuple]:
         return []
 
 
-def get_most_liked_articles(limit: int = 10) -> List[Tuple]:
+def get_most_liked_articles(limit: int = 10, max_staleness: Optional[float] = None) -> List[Tuple]:
     """
     Get most liked articles.
+    Reads the v_most_liked_articles materialized view when it is fresh
+    enough, otherwise queries news directly.
     Returns: [(article_id, title, author, views, likes, bookmarks, created_at), ...]
     """
     try:
+        rows = _read_ranking_view('v_most_liked_articles', limit, max_staleness)
+        if rows is not None:
+            return rows
+        
         conn, _ = connect()
         if not conn:
             return []
@@ -378,6 +550,10 @@ def bookmark_article(article_id: int, username: str) -> bool:
     User bookmarks an article.
     Returns True if successful, False if already bookmarked or error.
     """
+    user_id = resolve_user_id(username)
+    if not user_id:
+        return False
+    
     try:
         conn, _ = connect()
         if not conn:
@@ -388,11 +564,11 @@ def bookmark_article(article_id: int, username: str) -> bool:
         
         # Insert bookmark
         cur.execute("""
-            INSERT INTO article_bookmarks (article_id, username)
+            INSERT INTO article_bookmarks (article_id, user_id)
             VALUES (%s, %s)
-            ON CONFLICT (article_id, username) DO NOTHING
-            RETURNING id;
-        """, (article_id, username))
+            ON CONFLICT (article_id, user_id) DO NOTHING
+            RETURNING article_id;
+        """, (article_id, user_id))
         
         result = cur.fetchone()
         conn.commit()
@@ -416,6 +592,10 @@ def unbookmark_article(article_id: int, username: str) -> bool:
     User removes bookmark from an article.
     Returns True if successful, False if not bookmarked or error.
     """
+    user_id = resolve_user_id(username)
+    if not user_id:
+        return False
+    
     try:
         conn, _ = connect()
         if not conn:
@@ -427,9 +607,9 @@ def unbookmark_article(article_id: int, username: str) -> bool:
         # Delete bookmark
         cur.execute("""
             DELETE FROM article_bookmarks
-            WHERE article_id = %s AND username = %s
-            RETURNING id;
-        """, (article_id, username))
+            WHERE article_id = %s AND user_id = %s
+            RETURNING article_id;
+        """, (article_id, user_id))
         
         result = cur.fetchone()
         conn.commit()
@@ -453,6 +633,10 @@ def is_article_bookmarked(article_id: int, username: str) -> bool:
     Check if user has bookmarked an article.
     Returns True if bookmarked, False otherwise.
     """
+    user_id = resolve_user_id(username)
+    if not user_id:
+        return False
+    
     try:
         conn, _ = connect()
         if not conn:
@@ -461,8 +645,8 @@ def is_article_bookmarked(article_id: int, username: str) -> bool:
         cur = conn.cursor()
         cur.execute("""
             SELECT 1 FROM article_bookmarks
-            WHERE article_id = %s AND username = %s;
-        """, (article_id, username))
+            WHERE article_id = %s AND user_id = %s;
+        """, (article_id, user_id))
         
         result = cur.fetchone()
         conn.close()
@@ -502,6 +686,10 @@ def get_user_bookmarked_articles(username: str, limit: int = 50) -> List[Tuple]:
     Get list of articles bookmarked by user.
     Returns: [(article_id, title, author, bookmark_count, bookmarked_at), ...]
     """
+    user_id = resolve_user_id(username)
+    if not user_id:
+        return []
+    
     try:
         conn, _ = connect()
         if not conn:
@@ -517,11 +705,11 @@ def get_user_bookmarked_articles(username: str, limit: int = 50) -> List[Tuple]:
                 to_char(ab.bookmarked_at AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI UTC') as bookmarked_at
             FROM article_bookmarks ab
             JOIN news n ON ab.article_id = n.id
-            WHERE ab.username = %s
+            WHERE ab.user_id = %s
             AND n.status = 'published'
             ORDER BY ab.bookmarked_at DESC
             LIMIT %s;
-        """, (username, limit))
+        """, (user_id, limit))
         
         rows = cur.fetchall()
         conn.close()
@@ -536,15 +724,22 @@ def get_user_bookmarked_articles(username: str, limit: int = 50) -> List[Tuple]:
 # STATISTICS & ANALYTICS
 # ============================================
 
-def get_article_stats(article_id: int) -> Dict[str, int]:
+def get_article_stats(article_id: int, include_unique: bool = False) -> Dict[str, int]:
     """
-    Get all statistics for an article.
+    Get all statistics for an article (single counter query).
+    With include_unique, also approximate unique viewers over the last 7 / 30
+    days (union of daily HyperLogLog sketches, ~2% error); this merges up to
+    30 sketches, so only request it where the numbers are shown.
     Returns: {'views': int, 'likes': int, 'bookmarks': int}
+             (+ 'unique_week', 'unique_month' with include_unique)
     """
+    empty = {'views': 0, 'likes': 0, 'bookmarks': 0}
+    if include_unique:
+        empty.update(unique_week=0, unique_month=0)
     try:
         conn, _ = connect()
         if not conn:
-            return {'views': 0, 'likes': 0, 'bookmarks': 0}
+            return empty
         
         cur = conn.cursor()
         cur.execute("""
@@ -557,19 +752,25 @@ def get_article_stats(article_id: int) -> Dict[str, int]:
         """, (article_id,))
         
         result = cur.fetchone()
+        unique = {}
+        if result and include_unique:
+            unique = _unique_viewers(cur, 'article_daily_stats', article_id, (7, 30))
         conn.close()
         
         if result:
-            return {
+            stats = {
                 'views': result[0],
                 'likes': result[1],
                 'bookmarks': result[2]
             }
-        return {'views': 0, 'likes': 0, 'bookmarks': 0}
+            if include_unique:
+                stats.update(unique_week=unique[7], unique_month=unique[30])
+            return stats
+        return empty
         
     except Exception as e:
         print(f"❌ Error getting article stats: {e}")
-        return {'views': 0, 'likes': 0, 'bookmarks': 0}
+        return empty
 
 
 def get_user_interaction_summary(username: str) -> Dict[str, int]:
@@ -577,6 +778,10 @@ def get_user_interaction_summary(username: str) -> Dict[str, int]:
     Get summary of user's interactions.
     Returns: {'liked': int, 'bookmarked': int}
     """
+    user_id = resolve_user_id(username)
+    if not user_id:
+        return {'liked': 0, 'bookmarked': 0}
+    
     try:
         conn, _ = connect()
         if not conn:
@@ -586,14 +791,14 @@ def get_user_interaction_summary(username: str) -> Dict[str, int]:
         
         # Count likes
         cur.execute("""
-            SELECT COUNT(*) FROM article_likes WHERE username = %s;
-        """, (username,))
+            SELECT COUNT(*) FROM article_likes WHERE user_id = %s;
+        """, (user_id,))
         liked = cur.fetchone()[0]
         
         # Count bookmarks
         cur.execute("""
-            SELECT COUNT(*) FROM article_bookmarks WHERE username = %s;
-        """, (username,))
+            SELECT COUNT(*) FROM article_bookmarks WHERE user_id = %s;
+        """, (user_id,))
         bookmarked = cur.fetchone()[0]
         
         conn.close()
@@ -608,18 +813,31 @@ def get_user_interaction_summary(username: str) -> Dict[str, int]:
         return {'liked': 0, 'bookmarked': 0}
 
 
-def get_penerbit_stats(author: str) -> Dict[str, int]:
+def get_penerbit_stats(author: str, days: int = 7) -> Dict[str, int]:
     """
     Get statistics for a penerbit (author).
+    Lifetime totals come from the news counters; the period_* values cover
+    the last N days and are read from author_daily_stats (analytics rollup).
+    unique_* are approximate distinct viewers (HyperLogLog union).
     Returns: {
         'total_articles': int,
         'total_views': int,
         'total_likes': int,
         'total_bookmarks': int,
         'avg_views': float,
-        'avg_likes': float
+        'avg_likes': float,
+        'period_days': int,
+        'period_views': int,
+        'period_likes': int,
+        'period_bookmarks': int,
+        'period_unique': int,
+        'unique_week': int,
+        'unique_month': int
     }
     """
+    author_id = resolve_user_id(author)
+    period = {'period_days': days, 'period_views': 0, 'period_likes': 0, 'period_bookmarks': 0,
+              'period_unique': 0, 'unique_week': 0, 'unique_month': 0}
     try:
         conn, _ = connect()
         if not conn:
@@ -629,7 +847,8 @@ def get_penerbit_stats(author: str) -> Dict[str, int]:
                 'total_likes': 0,
                 'total_bookmarks': 0,
                 'avg_views': 0.0,
-                'avg_likes': 0.0
+                'avg_likes': 0.0,
+                **period
             }
         
         cur = conn.cursor()
@@ -642,12 +861,27 @@ def get_penerbit_stats(author: str) -> Dict[str, int]:
                 COALESCE(AVG(views), 0) as avg_views,
                 COALESCE(AVG(like_count), 0) as avg_likes
             FROM news
-            WHERE author = %s AND status = 'published';
-        """, (author,))
-        
+            WHERE author_id = %s AND status = 'published';
+        """, (author_id,))
         result = cur.fetchone()
+        
+        cur.execute("""
+            SELECT 
+                COALESCE(SUM(views), 0),
+                COALESCE(SUM(likes), 0),
+                COALESCE(SUM(bookmarks), 0)
+            FROM author_daily_stats
+            WHERE author_id = %s
+            AND day > (NOW() AT TIME ZONE 'UTC')::date - %s;
+        """, (author_id, days))
+        period_row = cur.fetchone()
+        unique = _unique_viewers(cur, 'author_daily_stats', author_id, (7, 30, days))
         conn.close()
         
+        if period_row:
+            period['period_views'], period['period_likes'], period['period_bookmarks'] = period_row
+        period.update(period_unique=unique[days], unique_week=unique[7], unique_month=unique[30])
+        
         if result:
             return {
                 'total_articles': result[0],
@@ -655,7 +889,8 @@ def get_penerbit_stats(author: str) -> Dict[str, int]:
                 'total_likes': result[2],
                 'total_bookmarks': result[3],
                 'avg_views': round(float(result[4]), 1),
-                'avg_likes': round(float(result[5]), 1)
+                'avg_likes': round(float(result[5]), 1),
+                **period
             }
         
         return {
@@ -664,7 +899,8 @@ def get_penerbit_stats(author: str) -> Dict[str, int]:
             'total_likes': 0,
             'total_bookmarks': 0,
             'avg_views': 0.0,
-            'avg_likes': 0.0
+            'avg_likes': 0.0,
+            **period
         }
         
     except Exception as e:
@@ -675,17 +911,74 @@ def get_penerbit_stats(author: str) -> Dict[str, int]:
             'total_likes': 0,
             'total_bookmarks': 0,
             'avg_views': 0.0,
-            'avg_likes': 0.0
+            'avg_likes': 0.0,
+            **period
         }
 
 
+def get_author_summary(author: str) -> Dict:
+    """
+    Get status counts and engagement totals for an author in one query.
+    Uses idx_news_author_id_status (author_id, status) INCLUDE (...) -> index-only scan.
+    Returns: {
+        'total': int, 'published': int, 'draft': int,
+        'views': int, 'likes': int, 'bookmarks': int,
+        'change_token': str   # berubah jika ada artikel/angka yang berubah
+    }
+    """
+    summary = {'total': 0, 'published': 0, 'draft': 0,
+               'views': 0, 'likes': 0, 'bookmarks': 0, 'change_token': ''}
+    author_id = resolve_user_id(author)
+    if not author_id:
+        return summary
+    
+    try:
+        conn, _ = connect()
+        if not conn:
+            return summary
+        
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT 
+                status,
+                COUNT(*),
+                COALESCE(SUM(views), 0),
+                COALESCE(SUM(like_count), 0),
+                COALESCE(SUM(bookmark_count), 0),
+                MAX(id)
+            FROM news
+            WHERE author_id = %s
+            GROUP BY status
+            ORDER BY status;
+        """, (author_id,))
+        
+        rows = cur.fetchall()
+        conn.close()
+        
+        for status, count, views, likes, bookmarks, _ in rows:
+            summary['total'] += count
+            if status in ('published', 'draft'):
+                summary[status] = count
+            summary['views'] += views
+            summary['likes'] += likes
+            summary['bookmarks'] += bookmarks
+        
+        # Token = hash dari hasil agregat; sama persis jika tidak ada perubahan
+        summary['change_token'] = hashlib.md5(repr(rows).encode()).hexdigest()
+        return summary
+        
+    except Exception as e:
+        print(f"❌ Error getting author summary: {e}")
+        return summary
+
+
 def get_engagement_rate(article_id: int) -> float:
     """
     Calculate engagement rate for an article.
     Engagement Rate = (Likes + Bookmarks) / Views * 100
     Returns: float (percentage)
     """
-    stats = get_article_stats(article_id)
+    stats = get_article_stats(article_id, include_unique=False)
     
     if stats['views'] == 0:
         return 0.0
@@ -695,6 +988,498 @@ def get_engagement_rate(article_id: int) -> float:
     return round(rate, 2)
 
 
+# ============================================
+# ANALYTICS TIME SERIES
+# ============================================
+
+# Tabel rollup harian (migration_phase13_analytics_rollups.sql) -> kolom key
+_DAILY_STATS_TABLES = {
+    'article_daily_stats': 'article_id',
+    'author_daily_stats': 'author_id',
+}
+
+
+def _daily_series(table: str, key: int, days: int) -> List[Tuple]:
+    """Zero-filled daily series dari tabel rollup, hari terlama dulu."""
+    key_column = _DAILY_STATS_TABLES[table]
+    try:
+        conn, _ = connect()
+        if not conn:
+            return []
+        
+        cur = conn.cursor()
+        cur.execute(f"""
+            SELECT 
+                to_char(d.day, 'YYYY-MM-DD') as day,
+                COALESCE(s.views, 0),
+                COALESCE(s.unique_viewers, 0),
+                COALESCE(s.likes, 0),
+                COALESCE(s.bookmarks, 0)
+            FROM generate_series(
+                (NOW() AT TIME ZONE 'UTC')::date - (%s - 1),
+                (NOW() AT TIME ZONE 'UTC')::date,
+                INTERVAL '1 day'
+            ) AS d(day)
+            LEFT JOIN {table} s ON s.{key_column} = %s AND s.day = d.day::date
+            ORDER BY d.day;
+        """, (days, key))
+        
+        rows = cur.fetchall()
+        conn.close()
+        return rows
+        
+    except Exception as e:
+        print(f"❌ Error getting daily stats: {e}")
+        return []
+
+
+def _unique_viewers(cur, table: str, key: int, windows: Tuple[int, ...]) -> Dict[int, int]:
+    """
+    Approximate distinct viewers for each window (last N days, UTC):
+    union of the daily viewers_hll sketches (migration_phase14_viewer_sketches.sql).
+    Returns {days: count}.
+    """
+    key_column = _DAILY_STATS_TABLES[table]
+    cur.execute(f"""
+        SELECT (NOW() AT TIME ZONE 'UTC')::date - day, viewers_hll
+        FROM {table}
+        WHERE {key_column} = %s
+        AND day > (NOW() AT TIME ZONE 'UTC')::date - %s
+        AND viewers_hll IS NOT NULL;
+    """, (key, max(windows)))
+    rows = cur.fetchall()
+    return {days: merge_all(sketch for age, sketch in rows if age < days).count()
+            for days in windows}
+
+
+def get_article_daily_stats(article_id: int, days: int = 30) -> List[Tuple]:
+    """
+    Daily stats for an article over the last N days (UTC), days without
+    activity included as zeros. Served from article_daily_stats.
+    Returns: [(day, views, unique_viewers, likes, bookmarks), ...] oldest first
+    """
+    return _daily_series('article_daily_stats', article_id, days)
+
+
+def get_author_daily_stats(author: str, days: int = 30) -> List[Tuple]:
+    """
+    Daily stats across all of an author's articles over the last N days (UTC).
+    Served from author_daily_stats.
+    Returns: [(day, views, unique_viewers, likes, bookmarks), ...] oldest first
+    """
+    author_id = resolve_user_id(author)
+    if not author_id:
+        return []
+    return _daily_series('author_daily_stats', author_id, days)
+
+
+# ============================================
+# FULL-TEXT SEARCH
+# ============================================
+
+# ts_rank weights {D, C, B, A}: title (A) > content (B)
+SEARCH_RANK_WEIGHTS = '{0.1, 0.2, 0.4, 1.0}'
+
+
+# Penanda match dari ts_headline: karakter kontrol yang tidak muncul di teks
+# artikel, supaya snippet bisa di-escape dulu sebelum diberi <b>
+HEADLINE_START = "\x02"
+HEADLINE_STOP = "\x03"
+HEADLINE_OPTIONS = (f"StartSel={HEADLINE_START}, StopSel={HEADLINE_STOP}, "
+                    "MaxWords=30, MinWords=12, MaxFragments=2")
+
+
+def _snippet_html(snippet: Optional[str]) -> str:
+    """Escape isi artikel untuk QLabel rich text; hanya penanda match menjadi <b>."""
+    text = html.escape(snippet or "")
+    return text.replace(HEADLINE_START, "<b>").replace(HEADLINE_STOP, "</b>")
+
+
+def search_news(query: str, limit: int = 20, after: Optional[Tuple[float, int]] = None,
+                author: Optional[str] = None, status: Optional[str] = 'published') -> List[Tuple]:
+    """
+    Full-text search over news title + content (migration_phase4_news_search.sql).
+    
+    query  : web-search syntax ("exact phrase", -exclude, OR)
+    after  : (rank, article_id) of the last row from the previous page (keyset)
+    author : only articles by this author
+    status : 'published' (default), 'draft', or None for any status
+    
+    Returns: [(article_id, title, author, views, likes, bookmarks, created_at,
+               rank, snippet), ...]  snippet is HTML-escaped text with matches
+               wrapped in <b>...</b>
+    """
+    query = (query or "").strip()
+    if not query:
+        return []
+    
+    try:
+        conn, _ = connect()
+        if not conn:
+            return []
+        
+        conditions = ["n.search_vector @@ q.tsq"]
+        params = [query]
+        if author:
+            conditions.append("n.author = %s")
+            params.append(author)
+        if status:
+            conditions.append("n.status = %s")
+            params.append(status)
+        if after:
+            conditions.append(
+                f"(ts_rank('{SEARCH_RANK_WEIGHTS}', n.search_vector, q.tsq), n.id) < (%s::real, %s)"
+            )
+            params.extend(after)
+        params.append(limit)
+        params.append(HEADLINE_OPTIONS)
+        
+        cur = conn.cursor()
+        # Halaman dipilih dulu (index GIN + rank), ts_headline hanya untuk baris halaman ini
+        cur.execute(f"""
+            WITH q AS (SELECT websearch_to_tsquery('simple', %s) AS tsq),
+            page AS (
+                SELECT n.id, ts_rank('{SEARCH_RANK_WEIGHTS}', n.search_vector, q.tsq) AS rank
+                FROM news n, q
+                WHERE {' AND '.join(conditions)}
+                ORDER BY rank DESC, n.id DESC
+                LIMIT %s
+            )
+            SELECT 
+                n.id,
+                n.title,
+                n.author,
+                n.views,
+                n.like_count,
+                n.bookmark_count,
+                to_char(n.created_at AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI UTC') as created_at,
+                page.rank,
+                ts_headline('simple', n.content, q.tsq, %s)
+            FROM page
+            JOIN news n ON n.id = page.id
+            CROSS JOIN q
+            ORDER BY page.rank DESC, n.id DESC;
+        """, params)
+        
+        rows = [row[:-1] + (_snippet_html(row[-1]),) for row in cur.fetchall()]
+        conn.close()
+        return rows
+        
+    except Exception as e:
+        print(f"❌ Error searching news: {e}")
+        return []
+
+
+# ============================================
+# AUTOCOMPLETE
+# ============================================
+
+def get_autocomplete_entries(after: Optional[Tuple] = None, limit: int = 5000,
+                             published_only: bool = False) -> Optional[List[Tuple]]:
+    """
+    Articles changed after the keyset (updated_at, id), for the client-side
+    prefix index (migration_phase17_news_updated_at.sql). after=None starts
+    from the beginning; published_only=True skips drafts (full rebuild).
+    Returns: [(article_id, title, author, status, updated_at), ...] ordered by
+    (updated_at, id), or None on error.
+    """
+    try:
+        conn, _ = connect()
+        if not conn:
+            return None
+        
+        cur = conn.cursor()
+        status_filter = "AND status = 'published'" if published_only else ""
+        cur.execute(f"""
+            SELECT id, title, author, status, updated_at
+            FROM news
+            WHERE (updated_at, id) > (%s, %s) {status_filter}
+            ORDER BY updated_at, id
+            LIMIT %s;
+        """, (after or ('-infinity', 0)) + (limit,))
+        
+        rows = cur.fetchall()
+        conn.close()
+        return rows
+        
+    except Exception as e:
+        print(f"❌ Error getting autocomplete entries: {e}")
+        return None
+
+
+def autocomplete_news(text: str, limit: int = 10) -> List[Tuple]:
+    """
+    Typo-tolerant suggestions over published titles and author names (pg_trgm).
+    Returns: [(kind, value, article_id), ...]  kind = 'title' | 'author',
+             article_id is None for authors
+    """
+    text = (text or "").strip()
+    if not text:
+        return []
+    
+    try:
+        conn, _ = connect()
+        if not conn:
+            return []
+        
+        cur = conn.cursor()
+        cur.execute("""
+            (
+                SELECT 'title', title, id, word_similarity(%(q)s, title) AS score
+                FROM news
+                WHERE status = 'published' AND %(q)s <%% title
+                ORDER BY score DESC, id DESC
+                LIMIT %(limit)s
+            )
+            UNION ALL
+            (
+                SELECT 'author', author, NULL, MAX(word_similarity(%(q)s, author)) AS score
+                FROM news
+                WHERE status = 'published' AND %(q)s <%% author
+                GROUP BY author
+                ORDER BY score DESC
+                LIMIT %(limit)s
+            )
+            ORDER BY score DESC
+            LIMIT %(limit)s;
+        """, {'q': text, 'limit': limit})
+        
+        rows = [(kind, value, article_id) for kind, value, article_id, _ in cur.fetchall()]
+        conn.close()
+        return rows
+        
+    except Exception as e:
+        print(f"❌ Error getting autocomplete suggestions: {e}")
+        return []
+
+
+# ============================================
+# INTERACTION SYNC (lihat interaction_state.py)
+# ============================================
+
+def get_user_interaction_ids(username: str) -> Optional[Dict]:
+    """
+    All article ids the user has liked / bookmarked, in one round trip.
+    Returns: {'liked': [ids], 'bookmarked': [ids], 'as_of': server time}
+    or None on error.
+    """
+    user_id = resolve_user_id(username)
+    if not user_id:
+        return None
+
+    try:
+        conn, _ = connect()
+        if not conn:
+            return None
+
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT
+                NOW(),
+                ARRAY(SELECT article_id FROM article_likes WHERE user_id = %s),
+                ARRAY(SELECT article_id FROM article_bookmarks WHERE user_id = %s);
+        """, (user_id, user_id))
+        as_of, liked, bookmarked = cur.fetchone()
+        conn.close()
+
+        return {'liked': liked, 'bookmarked': bookmarked, 'as_of': as_of}
+
+    except Exception as e:
+        print(f"❌ Error getting user interaction ids: {e}")
+        return None
+
+
+def get_user_interaction_changes(username: str, since) -> Optional[Dict]:
+    """
+    Like/bookmark changes with changed_at > since (migration_phase16).
+    Returns: {'changes': [(kind, article_id, active)], 'as_of': server time,
+              'complete': False if since is older than the change log retention}
+    or None on error. kind is 'L' (like) or 'B' (bookmark).
+    """
+    user_id = resolve_user_id(username)
+    if not user_id:
+        return None
+
+    try:
+        conn, _ = connect()
+        if not conn:
+            return None
+
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT NOW(),
+                   %s > NOW() - make_interval(days => app_setting('interactions.change_retention_days', 30)::INTEGER);
+        """, (since,))
+        as_of, complete = cur.fetchone()
+
+        changes = []
+        if complete:
+            cur.execute("""
+                SELECT kind, article_id, active
+                FROM user_interaction_changes
+                WHERE user_id = %s AND changed_at > %s;
+            """, (user_id, since))
+            changes = cur.fetchall()
+        conn.close()
+
+        return {'changes': changes, 'as_of': as_of, 'complete': complete}
+
+    except Exception as e:
+        print(f"❌ Error getting user interaction changes: {e}")
+        return None
+
+
+# ============================================
+# REPLICA SYNC (lihat local_replica.py)
+# ============================================
+
+def get_news_changes(after: Optional[Tuple] = None, limit: int = 500,
+                     since=None) -> Optional[Dict]:
+    """
+    News rows changed after the keyset (updated_at, id), oldest first
+    (migration_phase17_news_updated_at.sql). after=None starts from the beginning.
+    since: server time of the caller's last complete sync (None = first sync).
+    Returns: {'rows': [(id, title, author, content, status, created_at, views,
+                        likes, bookmarks, updated_at), ...],
+              'as_of': server time,
+              'complete': False if since is older than the deletion log retention}
+    or None on error.
+    Non-published rows are included so the replica can drop them; deleted
+    rows come from news_deletions with status 'deleted' and deleted_at as
+    updated_at.
+    """
+    try:
+        conn, _ = connect()
+        if not conn:
+            return None
+
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT NOW(),
+                   %s::timestamptz IS NULL
+                   OR %s::timestamptz > NOW() - make_interval(days => app_setting('news.deletion_retention_days', 90)::INTEGER);
+        """, (since, since))
+        as_of, complete = cur.fetchone()
+        if not complete:
+            conn.close()
+            return {'rows': [], 'as_of': as_of, 'complete': False}
+
+        after = after or ('-infinity', 0)
+        cur.execute("""
+            SELECT
+                id,
+                title,
+                author,
+                content,
+                status,
+                to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI UTC'),
+                views,
+                like_count,
+                bookmark_count,
+                updated_at
+            FROM news
+            WHERE (updated_at, id) > (%s, %s)
+            ORDER BY updated_at, id
+            LIMIT %s;
+        """, after + (limit,))
+        rows = cur.fetchall()
+
+        cur.execute("""
+            SELECT id, NULL, NULL, NULL, 'deleted', NULL, 0, 0, 0, deleted_at
+            FROM news_deletions
+            WHERE (deleted_at, id) > (%s, %s)
+            ORDER BY deleted_at, id
+            LIMIT %s;
+        """, after + (limit,))
+        # Dua stream terurut (timestamp, id): gabungkan, ambil `limit` pertama
+        rows = sorted(rows + cur.fetchall(), key=lambda r: (r[9], r[0]))[:limit]
+        conn.close()
+        return {'rows': rows, 'as_of': as_of, 'complete': True}
+
+    except Exception as e:
+        print(f"❌ Error getting news changes: {e}")
+        return None
+
+
+def get_article_counters(article_ids: List[int]) -> Optional[List[Tuple]]:
+    """
+    Counters of the given published articles: [(id, views, likes, bookmarks), ...]
+    or None on error.
+    """
+    if not article_ids:
+        return []
+    try:
+        conn, _ = connect()
+        if not conn:
+            return None
+
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT id, views, like_count, bookmark_count
+            FROM news
+            WHERE id = ANY(%s) AND status = 'published';
+        """, (list(article_ids),))
+
+        rows = cur.fetchall()
+        conn.close()
+        return rows
+
+    except Exception as e:
+        print(f"❌ Error getting article counters: {e}")
+        return None
+
+
+def apply_interaction_batch(username: str, likes: Dict[int, bool], bookmarks: Dict[int, bool],
+                            views: List[int]) -> bool:
+    """
+    Replay offline writes in one transaction.
+    likes / bookmarks: {article_id: final state}, views: [article_id, ...].
+    Articles that no longer exist are skipped. Returns True if committed.
+    """
+    user_id = resolve_user_id(username)
+    if not user_id:
+        return False
+
+    def apply(cur):
+        for table, states in (("article_likes", likes), ("article_bookmarks", bookmarks)):
+            added = [article_id for article_id, active in states.items() if active]
+            removed = [article_id for article_id, active in states.items() if not active]
+            if added:
+                cur.execute(f"""
+                    INSERT INTO {table} (article_id, user_id)
+                    SELECT n.id, %s FROM news n WHERE n.id = ANY(%s)
+                    ON CONFLICT (article_id, user_id) DO NOTHING;
+                """, (user_id, added))
+            if removed:
+                cur.execute(f"""
+                    DELETE FROM {table}
+                    WHERE user_id = %s AND article_id = ANY(%s);
+                """, (user_id, removed))
+        if views:
+            cur.execute("""
+                INSERT INTO article_views (article_id, user_id)
+                SELECT v.article_id, %s
+                FROM unnest(%s::int[]) AS v(article_id)
+                WHERE EXISTS (SELECT 1 FROM news n WHERE n.id = v.article_id);
+            """, (user_id, views))
+
+    try:
+        conn, _ = connect()
+        if not conn:
+            return False
+
+        cur = conn.cursor()
+        apply(cur)
+
+        conn.commit()
+        conn.close()
+        return True
+
+    except Exception as e:
+        print(f"❌ Error applying interaction batch: {e}")
+        return False
+
+
 # ============================================
 # UTILITY FUNCTIONS
 # ============================================
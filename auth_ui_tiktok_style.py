@@ -11,6 +11,7 @@ Features:
 
 import sys
 import os
+from typing import Optional
 from PyQt5 import QtCore, QtGui, QtWidgets
 from PyQt5.QtCore import (
     QPropertyAnimation, QEasingCurve, QParallelAnimationGroup, QRect
@@ -18,7 +19,7 @@ from PyQt5.QtCore import (
 
 # Backend
 from app_db_fixed import (
-    verify_user, create_user, user_exists, setup_database,
+    verify_user, create_user, user_exists, ensure_schema,
     start_session, health_check
 )
 
@@ -34,7 +35,11 @@ class TikTokAuthWindow(QtWidgets.QWidget):
     ANIMATION_DURATION = 600 
     EASING_CURVE = QEasingCurve.InOutCubic
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, db_ready: Optional[bool] = None, db_pending: bool = False):
+        """
+        db_ready: hasil cek database dari startup pipeline (None = cek di sini)
+        db_pending: pipeline masih jalan; hasilnya datang lewat set_db_ready()
+        """
         super().__init__(parent)
         
         # State tracking
@@ -53,7 +58,14 @@ class TikTokAuthWindow(QtWidgets.QWidget):
         # Terapkan teks awal
         self.retranslateUi() 
         
-        self._init_database()
+        self.db_ready = db_ready
+        self.db_pending = db_pending
+        if db_pending:
+            self.db_ready = False
+        elif db_ready is None:
+            self._init_database()
+        elif not db_ready:
+            self.toast(self._get_trans_text("toast_db_failed"), "error")
         
     def _define_themes(self):
         """Mendefinisikan palet warna untuk Light dan Dark mode"""
@@ -144,6 +156,7 @@ class TikTokAuthWindow(QtWidgets.QWidget):
                 "toast_register_success": "Account '{0}' created successfully!",
                 "toast_register_failed": "Failed to create account.",
                 "toast_db_failed": "Database connection failed.",
+                "toast_db_connected": "Database connected.",
                 "toast_db_error": "Database error:",
                 "notif_success": "Success!",
                 "notif_error": "Error",
@@ -176,6 +189,7 @@ class TikTokAuthWindow(QtWidgets.QWidget):
                 "toast_register_success": "Akun '{0}' berhasil dibuat!",
                 "toast_register_failed": "Gagal membuat akun.",
                 "toast_db_failed": "Koneksi database gagal.",
+                "toast_db_connected": "Database terhubung.",
                 "toast_db_error": "Database error:",
                 "notif_success": "Berhasil!",
                 "notif_error": "Error",
@@ -209,6 +223,7 @@ class TikTokAuthWindow(QtWidgets.QWidget):
                 "toast_register_success": "jeAkun '{0}' jadi!",
                 "toast_register_failed": "jeGag buat akun.",
                 "toast_db_failed": "jeDB gagal.",
+                "toast_db_connected": "jeDB nyambung.",
                 "toast_db_error": "jeDB error:",
                 "notif_success": "jeSil!", # jeBerhasil
                 "notif_error": "jeEror",
@@ -611,6 +626,11 @@ class TikTokAuthWindow(QtWidgets.QWidget):
             if sid is None:
                 return self.toast(self._get_trans_text("toast_session_failed"), "error")
             
+            if role.lower() not in ("admin", "penerbit"):
+                # Liked/bookmarked ids dimuat di background selagi dashboard dibuat
+                import interaction_state
+                interaction_state.prefetch(u)
+            
             try:
                 from dashboard_ui import DashboardWindow
             except ImportError as e:
@@ -677,13 +697,23 @@ class TikTokAuthWindow(QtWidgets.QWidget):
             notif = ModernNotification.info(self, title, text)
         notif.show_notification()
     
+    def set_db_ready(self, ready: bool):
+        """Dipanggil launcher saat startup pipeline selesai setelah window tampil"""
+        was_ready, was_pending = self.db_ready, self.db_pending
+        self.db_ready = ready
+        self.db_pending = False
+        if ready and not was_ready:
+            self.toast(self._get_trans_text("toast_db_connected"), "success")
+        elif not ready and was_pending:
+            self.toast(self._get_trans_text("toast_db_failed"), "error")
+
     def _init_database(self):
         """Initialize database"""
         try:
             if not health_check():
                 self.toast(self._get_trans_text("toast_db_failed"), "error")
                 return
-            setup_database()
+            self.db_ready = ensure_schema()
         except Exception as e:
             self.toast(f"{self._get_trans_text('toast_db_error')} {str(e)}", "error")
     
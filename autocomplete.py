@@ -0,0 +1,313 @@
+# autocomplete.py — Autocomplete judul artikel & nama penerbit
+"""
+Autocomplete untuk search box EnhancedUserDashboard:
+- PrefixIndex: trie in-memory atas awal kata judul + nama author
+  (artikel published)
+- Refresh incremental lewat watermark news.updated_at: artikel baru,
+  draft yang di-publish, judul yang diedit dan artikel yang di-unpublish
+  ikut terambil; full rebuild berkala membuang artikel yang dihapus
+- Sebagian besar ketikan dijawab lokal dari trie; server (pg_trgm,
+  typo-tolerant) hanya dipanggil jika trie tidak punya cukup hasil
+"""
+
+import datetime
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from PyQt5 import QtCore, QtWidgets
+
+from app_db_interactions import autocomplete_news, get_autocomplete_entries
+
+KIND_TITLE = "title"
+KIND_AUTHOR = "author"
+
+# (kind, value, article_id) — sama dengan row autocomplete_news()
+Suggestion = Tuple[str, str, Optional[int]]
+
+
+class _Node:
+    __slots__ = ("children", "top")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        # Suggestion terbaru yang lewat node ini (maks PrefixIndex.TOP_K)
+        self.top: List[Suggestion] = []
+
+
+class PrefixIndex:
+    """
+    Trie atas awal setiap kata dari judul/author (lowercase, maks
+    MAX_WORD_PREFIX karakter per kata), jadi "bitc" cocok dengan "Harga
+    Bitcoin Naik". Setiap node menyimpan top-K suggestion (tuple yang sama
+    dipakai bersama oleh semua node), sehingga lookup = O(panjang prefix).
+    Prefix beberapa kata dicari lewat kata pertamanya lalu difilter.
+    """
+
+    TOP_K = 10
+    MAX_WORD_PREFIX = 12
+
+    def __init__(self):
+        self._root = _Node()
+        self._authors = set()
+        # article_id -> judul published saat ini; suggestion judul lain
+        # (sudah diedit / di-unpublish) disaring saat lookup
+        self._titles: Dict[int, str] = {}
+        self.size = 0
+
+    def add(self, suggestion: Suggestion):
+        kind, value, article_id = suggestion
+        if kind == KIND_AUTHOR:
+            if value in self._authors:
+                return
+            self._authors.add(value)
+        else:
+            if self._titles.get(article_id) == value:
+                return
+            self._titles[article_id] = value
+
+        for word in set(value.lower().split()):
+            node = self._root
+            for ch in word[:self.MAX_WORD_PREFIX]:
+                child = node.children.get(ch)
+                if child is None:
+                    child = node.children[ch] = _Node()
+                node = child
+                if suggestion not in node.top:
+                    # Entry baru ditambah di depan; yang paling lama dibuang
+                    node.top.insert(0, suggestion)
+                    del node.top[self.TOP_K:]
+        self.size += 1
+
+    def remove_title(self, article_id: int):
+        """Artikel tidak lagi published: judulnya tidak dikembalikan lookup."""
+        self._titles.pop(article_id, None)
+
+    def _is_live(self, suggestion: Suggestion) -> bool:
+        kind, value, article_id = suggestion
+        return kind == KIND_AUTHOR or self._titles.get(article_id) == value
+
+    def lookup(self, prefix: str, limit: int = TOP_K) -> List[Suggestion]:
+        words = prefix.lower().split()
+        if not words:
+            return []
+        node = self._root
+        for ch in words[0][:self.MAX_WORD_PREFIX]:
+            node = node.children.get(ch)
+            if node is None:
+                return []
+
+        # Node hanya menjamin kata pertama (maks MAX_WORD_PREFIX karakter)
+        phrase = " " + " ".join(words)
+        exact = len(words) == 1 and len(words[0]) <= self.MAX_WORD_PREFIX
+        results = []
+        for suggestion in node.top:
+            if not self._is_live(suggestion):
+                continue
+            if not exact and phrase not in " " + " ".join(suggestion[1].lower().split()):
+                continue
+            results.append(suggestion)
+            if len(results) >= limit:
+                break
+        return results
+
+
+class AutocompleteService:
+    """
+    Trie lokal + fallback server dengan cache kecil (LRU).
+
+    refresh() dan server_suggest() melakukan query DB; panggil dari worker
+    thread (lihat AutocompleteController).
+    """
+
+    SERVER_CACHE_SIZE = 256
+    FULL_REBUILD_EVERY = 20  # refresh incremental ke-N = full rebuild
+    PAGE_SIZE = 5000
+    # Transaksi yang commit terlambat bisa punya updated_at < watermark
+    SYNC_OVERLAP = datetime.timedelta(seconds=60)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = PrefixIndex()
+        self._watermark = None  # updated_at terbaru yang sudah diindeks
+        self._refreshes = 0
+        self._server_cache: "OrderedDict[str, List[Suggestion]]" = OrderedDict()
+
+    def refresh(self):
+        """Masukkan artikel yang berubah sejak watermark ke trie (atau bangun ulang)."""
+        with self._lock:
+            self._refreshes += 1
+            watermark = self._watermark
+            rebuild = watermark is None or self._refreshes % self.FULL_REBUILD_EVERY == 0
+
+        after = None if rebuild else (watermark - self.SYNC_OVERLAP, 0)
+        rows = []
+        while True:
+            page = get_autocomplete_entries(after, self.PAGE_SIZE, published_only=rebuild)
+            if page is None:
+                return  # DB tidak tersedia: trie tetap
+            rows.extend(page)
+            if len(page) < self.PAGE_SIZE:
+                break
+            after = (page[-1][4], page[-1][0])
+        if rows:
+            watermark = max(watermark, rows[-1][4]) if watermark else rows[-1][4]
+
+        if rebuild:
+            # Trie baru dibangun di luar lock; lookup tetap memakai trie lama.
+            # Hasil kosong juga dipasang: artikel yang dihapus ikut hilang
+            index = PrefixIndex()
+            self._fill(index, rows)
+            with self._lock:
+                self._index = index
+                self._watermark = watermark
+                self._server_cache.clear()
+            return
+
+        if not rows:
+            return
+        with self._lock:
+            self._fill(self._index, rows)
+            self._watermark = watermark
+            self._server_cache.clear()
+
+    @staticmethod
+    def _fill(index: PrefixIndex, rows):
+        for article_id, title, author, status, _ in rows:
+            if status != 'published':
+                index.remove_title(article_id)
+                continue
+            index.add((KIND_TITLE, title, article_id))
+            index.add((KIND_AUTHOR, author, None))
+
+    def local_suggest(self, text: str, limit: int = 10) -> List[Suggestion]:
+        with self._lock:
+            return self._index.lookup(text, limit)
+
+    def cached_server_suggest(self, text: str) -> Optional[List[Suggestion]]:
+        key = text.lower().strip()
+        with self._lock:
+            if key in self._server_cache:
+                self._server_cache.move_to_end(key)
+                return self._server_cache[key]
+        return None
+
+    def server_suggest(self, text: str, limit: int = 10) -> List[Suggestion]:
+        """Typo-tolerant (pg_trgm). Hasil di-cache per teks."""
+        cached = self.cached_server_suggest(text)
+        if cached is not None:
+            return cached
+        rows = autocomplete_news(text, limit)
+        with self._lock:
+            self._server_cache[text.lower().strip()] = rows
+            while len(self._server_cache) > self.SERVER_CACHE_SIZE:
+                self._server_cache.popitem(last=False)
+        return rows
+
+
+class AutocompleteController(QtCore.QObject):
+    """
+    Pasang QCompleter di QLineEdit.
+
+    Setiap ketikan dijawab dari trie (UI thread, tanpa I/O). Jika hasil
+    lokal kurang dari MIN_LOCAL_RESULTS, query server dijadwalkan di worker
+    thread setelah debounce; hasilnya hanya dipakai jika teks belum berubah.
+    """
+
+    MIN_LOCAL_RESULTS = 3
+    MIN_SERVER_CHARS = 3
+    SERVER_DEBOUNCE_MS = 250
+    REFRESH_INTERVAL_MS = 30000
+
+    _server_done = QtCore.pyqtSignal(str, list)  # text, suggestions
+
+    def __init__(self, line_edit: QtWidgets.QLineEdit, parent=None):
+        super().__init__(parent)
+        self.line_edit = line_edit
+        self.service = AutocompleteService()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="Autocomplete")
+
+        self.model = QtCore.QStringListModel(self)
+        self.completer = QtWidgets.QCompleter(self.model, self)
+        self.completer.setCaseSensitivity(QtCore.Qt.CaseInsensitive)
+        # Model sudah difilter oleh trie/server: tampilkan apa adanya
+        self.completer.setCompletionMode(QtWidgets.QCompleter.UnfilteredPopupCompletion)
+        line_edit.setCompleter(self.completer)
+
+        self._server_timer = QtCore.QTimer(self)
+        self._server_timer.setSingleShot(True)
+        self._server_timer.setInterval(self.SERVER_DEBOUNCE_MS)
+        self._server_timer.timeout.connect(self._query_server)
+
+        self._refresh_timer = QtCore.QTimer(self)
+        self._refresh_timer.timeout.connect(self.refresh)
+        self._refresh_timer.start(self.REFRESH_INTERVAL_MS)
+
+        self._server_done.connect(self._on_server_done)
+        line_edit.textEdited.connect(self._on_text_edited)
+        self.refresh()
+
+    def refresh(self):
+        self._executor.submit(self._safe_refresh)
+
+    def _safe_refresh(self):
+        try:
+            self.service.refresh()
+        except Exception as e:
+            print(f"⚠️ Autocomplete refresh failed: {e}")
+
+    def _on_text_edited(self, text: str):
+        self._server_timer.stop()
+        text = text.strip()
+        if not text:
+            self._show([])
+            return
+
+        suggestions = self.service.local_suggest(text)
+        if len(suggestions) < self.MIN_LOCAL_RESULTS and len(text) >= self.MIN_SERVER_CHARS:
+            cached = self.service.cached_server_suggest(text)
+            if cached is not None:
+                suggestions = self._merge(suggestions, cached)
+            else:
+                self._server_timer.start()
+        self._show(suggestions)
+
+    def _query_server(self):
+        text = self.line_edit.text().strip()
+        self._executor.submit(self._server_job, text)
+
+    def _server_job(self, text: str):
+        try:
+            rows = self.service.server_suggest(text)
+        except Exception as e:
+            print(f"⚠️ Autocomplete query failed: {e}")
+            rows = []
+        self._server_done.emit(text, rows)
+
+    def _on_server_done(self, text: str, rows: list):
+        if text != self.line_edit.text().strip():
+            return  # user sudah mengetik lagi
+        self._show(self._merge(self.service.local_suggest(text), rows))
+
+    @staticmethod
+    def _merge(local: List[Suggestion], remote: List[Suggestion]) -> List[Suggestion]:
+        merged = list(local)
+        for suggestion in remote:
+            if suggestion not in merged:
+                merged.append(suggestion)
+        return merged[:PrefixIndex.TOP_K]
+
+    def _show(self, suggestions: List[Suggestion]):
+        values = []
+        for _, value, _ in suggestions:
+            if value not in values:
+                values.append(value)
+        self.model.setStringList(values)
+        if values and self.line_edit.hasFocus():
+            self.completer.complete()
+
+    def shutdown(self):
+        self._refresh_timer.stop()
+        self._server_timer.stop()
+        self._executor.shutdown(wait=False)
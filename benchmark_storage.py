@@ -0,0 +1,212 @@
+# benchmark_storage.py - Ukuran & insert throughput layout tabel interaksi
+"""
+Bandingkan layout lama (migration_phase1) dengan layout compact
+(migration_phase10_compact_storage.sql) untuk article_likes dan article_views:
+- Tabel dibuat di schema sementara bench_storage (tanpa foreign key,
+  supaya yang diukur hanya layout tabel + index)
+- Data sintetis yang sama di-insert ke kedua layout (append-ordered,
+  seperti di produksi), diukur rows/detik termasuk maintenance index
+- Setelah VACUUM ANALYZE: ukuran heap, index, dan total
+
+Jalankan:
+    python benchmark_storage.py            # 200000 rows per tabel
+    python benchmark_storage.py 1000000
+
+Juga menampilkan ukuran tabel interaksi yang sebenarnya di database ini,
+jadi bisa dijalankan sebelum dan sesudah migrasi untuk membandingkan.
+Schema bench_storage dihapus di akhir.
+"""
+
+import sys
+import time
+
+from app_db_fixed import connect
+
+SCHEMA = "bench_storage"
+DEFAULT_ROWS = 200000
+
+LAYOUTS = {
+    "likes": {
+        "legacy": [
+            """CREATE TABLE {t} (
+                id SERIAL PRIMARY KEY,
+                article_id INTEGER NOT NULL,
+                username VARCHAR(100) NOT NULL,
+                liked_at TIMESTAMPTZ DEFAULT NOW(),
+                UNIQUE(article_id, username)
+            )""",
+            "CREATE INDEX ON {t}(liked_at DESC)",
+            "CREATE INDEX ON {t}(username, liked_at DESC) INCLUDE (article_id)",
+            "CREATE INDEX ON {t}(article_id, liked_at DESC) INCLUDE (username)",
+        ],
+        "compact": [
+            """CREATE TABLE {t} (
+                article_id INTEGER NOT NULL,
+                username VARCHAR(100) NOT NULL,
+                liked_at TIMESTAMPTZ DEFAULT NOW(),
+                PRIMARY KEY (article_id, username)
+            )""",
+            "CREATE INDEX ON {t} USING BRIN (liked_at)",
+            "CREATE INDEX ON {t}(username, liked_at DESC) INCLUDE (article_id)",
+            "CREATE INDEX ON {t}(article_id, liked_at DESC) INCLUDE (username)",
+        ],
+        # Pasangan (article_id, username) unik
+        "insert": """
+            INSERT INTO {t} (article_id, username, liked_at)
+            SELECT 1 + i % 5000,
+                   'user_' || (i / 5000),
+                   NOW() - INTERVAL '30 days' + i * INTERVAL '10 milliseconds'
+            FROM generate_series(0, %s - 1) AS i
+        """,
+    },
+    "views": {
+        "legacy": [
+            """CREATE TABLE {t} (
+                id SERIAL PRIMARY KEY,
+                article_id INTEGER NOT NULL,
+                username VARCHAR(100),
+                viewed_at TIMESTAMPTZ DEFAULT NOW(),
+                ip_address VARCHAR(50) DEFAULT '0.0.0.0'
+            )""",
+            "CREATE INDEX ON {t}(article_id)",
+            "CREATE INDEX ON {t}(username)",
+            "CREATE INDEX ON {t}(viewed_at DESC)",
+        ],
+        "compact": [
+            """CREATE TABLE {t} (
+                article_id INTEGER NOT NULL,
+                username VARCHAR(100),
+                viewed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                ip_address inet
+            )""",
+            "CREATE INDEX ON {t}(article_id, viewed_at DESC)",
+            "CREATE INDEX ON {t} USING BRIN (viewed_at)",
+        ],
+        # 1/3 anonymous; IP 10.x.y.z
+        "insert": """
+            INSERT INTO {t} (article_id, username, viewed_at, ip_address)
+            SELECT 1 + i % 5000,
+                   CASE WHEN i % 3 = 0 THEN NULL ELSE 'user_' || (i % 20000) END,
+                   NOW() - INTERVAL '30 days' + i * INTERVAL '10 milliseconds',
+                   '10.' || ((i >> 16) & 255) || '.' || ((i >> 8) & 255) || '.' || (i & 255)
+            FROM generate_series(0, %s - 1) AS i
+        """,
+    },
+}
+
+LIVE_TABLES = ("article_likes", "article_bookmarks", "article_views", "user_sessions")
+
+
+def _mb(size_bytes: int) -> float:
+    return size_bytes / (1024 * 1024)
+
+
+def _sizes(cur, table: str):
+    """(heap, index) bytes. Untuk tabel partisi dijumlahkan semua partisi."""
+    cur.execute("""
+        SELECT COALESCE(SUM(pg_table_size(relid)), 0),
+               COALESCE(SUM(pg_indexes_size(relid)), 0)
+        FROM pg_partition_tree(%s::regclass)
+        WHERE isleaf;
+    """, (table,))
+    heap, index = cur.fetchone()
+    return int(heap), int(index)
+
+
+def bench_layout(conn, name: str, layout: str, rows: int) -> dict:
+    spec = LAYOUTS[name]
+    table = f"{SCHEMA}.{name}_{layout}"
+    cur = conn.cursor()
+    for ddl in spec[layout]:
+        cur.execute(ddl.format(t=table))
+    conn.commit()
+
+    started = time.perf_counter()
+    cur.execute(spec["insert"].format(t=table), (rows,))
+    conn.commit()
+    elapsed = time.perf_counter() - started
+
+    conn.autocommit = True
+    cur.execute(f"VACUUM ANALYZE {table};")
+    conn.autocommit = False
+
+    heap, index = _sizes(cur, table)
+    conn.commit()
+    return {"heap": heap, "index": index, "rows_per_sec": rows / elapsed if elapsed else 0.0}
+
+
+def print_live_sizes(conn):
+    cur = conn.cursor()
+    print("📦 Current interaction tables:")
+    for table in LIVE_TABLES:
+        try:
+            cur.execute("SELECT COUNT(*) FROM " + table)
+            count = cur.fetchone()[0]
+            heap, index = _sizes(cur, table)
+            print(f"   {table:<20} {count:>10} rows  heap {_mb(heap):8.2f} MB  "
+                  f"index {_mb(index):8.2f} MB")
+        except Exception as e:
+            print(f"   {table:<20} ⚠️ {e}")
+        conn.rollback()
+    print()
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+
+    print()
+    print("=" * 60)
+    print("📏 CRYPTO INSIGHT - STORAGE BENCHMARK")
+    print("=" * 60)
+    print()
+
+    conn, _ = connect()
+    if not conn:
+        print("❌ Cannot connect to database")
+        sys.exit(1)
+
+    print_live_sizes(conn)
+
+    cur = conn.cursor()
+    try:
+        cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;")
+        cur.execute(f"CREATE SCHEMA {SCHEMA};")
+        conn.commit()
+
+        print(f"🧪 Synthetic benchmark ({rows} rows per table)")
+        for name in LAYOUTS:
+            legacy = bench_layout(conn, name, "legacy", rows)
+            compact = bench_layout(conn, name, "compact", rows)
+
+            print(f"\n   {name}")
+            print(f"   {'layout':<10} {'heap MB':>10} {'index MB':>10} {'total MB':>10} {'rows/s':>12}")
+            for label, result in (("legacy", legacy), ("compact", compact)):
+                total = result["heap"] + result["index"]
+                print(f"   {label:<10} {_mb(result['heap']):>10.2f} {_mb(result['index']):>10.2f} "
+                      f"{_mb(total):>10.2f} {result['rows_per_sec']:>12.0f}")
+
+            legacy_total = legacy["heap"] + legacy["index"]
+            compact_total = compact["heap"] + compact["index"]
+            saved = 100.0 * (legacy_total - compact_total) / legacy_total if legacy_total else 0.0
+            speedup = (compact["rows_per_sec"] / legacy["rows_per_sec"]
+                       if legacy["rows_per_sec"] else 0.0)
+            print(f"   ✅ size -{saved:.1f}%, insert throughput x{speedup:.2f}")
+    except Exception as e:
+        print(f"❌ Benchmark failed: {e}")
+        conn.rollback()
+        sys.exit(1)
+    finally:
+        try:
+            cur = conn.cursor()
+            cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;")
+            conn.commit()
+        except Exception:
+            pass
+        conn.close()
+
+    print()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
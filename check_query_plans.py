@@ -0,0 +1,222 @@
+# check_query_plans.py - EXPLAIN-based regression check untuk index
+"""
+Pastikan setiap hot query di app_db_fixed.py / app_db_interactions.py
+dilayani index (Index Scan / Index Only Scan) tanpa Sort node.
+
+Jalankan setelah migration_phase8_query_indexes.sql, migration_phase11_user_ids.sql,
+migration_phase16_interaction_changes.sql dan migration_phase17_news_updated_at.sql:
+    python check_query_plans.py
+
+Seq scan dan sort diberi penalti (SET LOCAL enable_seqscan / enable_sort
+= off) supaya hasil sama di database kecil maupun besar: planner hanya
+memakai Seq Scan / Sort jika tidak ada index yang cocok, dan check gagal.
+Exit code 1 jika ada query yang gagal.
+"""
+
+import json
+import sys
+
+from app_db_fixed import connect
+
+USER_ID = 0
+ARTICLE_ID = 1
+LIMIT = 20
+
+# (nama, sql, params) — SQL sama dengan query di aplikasi
+HOT_QUERIES = [
+    ("list_my_news", """
+        SELECT id, title, status, created_at
+        FROM news
+        WHERE author_id = %s
+        ORDER BY created_at DESC
+        LIMIT %s;
+    """, (USER_ID, LIMIT)),
+
+    ("list_published_news", """
+        SELECT id, title, author, created_at
+        FROM news
+        WHERE status = 'published'
+        ORDER BY created_at DESC
+        LIMIT %s;
+    """, (LIMIT,)),
+
+    ("get_popular_articles (live)", """
+        SELECT n.id, n.title, n.author, n.views, n.like_count, n.bookmark_count, n.created_at
+        FROM news n
+        WHERE n.status = 'published'
+        ORDER BY n.views DESC, n.like_count DESC
+        LIMIT %s;
+    """, (LIMIT,)),
+
+    ("get_most_liked_articles (live)", """
+        SELECT n.id, n.title, n.author, n.views, n.like_count, n.bookmark_count, n.created_at
+        FROM news n
+        WHERE n.status = 'published'
+        ORDER BY n.like_count DESC, n.views DESC
+        LIMIT %s;
+    """, (LIMIT,)),
+
+    ("get_popular_articles (materialized)", """
+        SELECT id, title, author, views, like_count, bookmark_count, created_at_formatted
+        FROM v_popular_articles
+        ORDER BY rank
+        LIMIT %s;
+    """, (LIMIT,)),
+
+    ("get_trending_articles", """
+        SELECT n.id, n.title, n.author, n.views, n.like_count, n.bookmark_count, n.created_at
+        FROM article_trending_scores s
+        JOIN news n ON n.id = s.article_id
+        WHERE n.status = 'published'
+        AND s.last_event_at > NOW() - make_interval(days => 7)
+        ORDER BY s.log_score DESC
+        LIMIT %s;
+    """, (LIMIT,)),
+
+    ("get_author_summary", """
+        SELECT status, COUNT(*), SUM(views), SUM(like_count), SUM(bookmark_count), MAX(id)
+        FROM news
+        WHERE author_id = %s
+        GROUP BY status
+        ORDER BY status;
+    """, (USER_ID,)),
+
+    ("is_article_liked", """
+        SELECT 1 FROM article_likes
+        WHERE article_id = %s AND user_id = %s;
+    """, (ARTICLE_ID, USER_ID)),
+
+    ("get_user_liked_articles", """
+        SELECT n.id, n.title, n.author, n.like_count, al.liked_at
+        FROM article_likes al
+        JOIN news n ON al.article_id = n.id
+        WHERE al.user_id = %s
+        AND n.status = 'published'
+        ORDER BY al.liked_at DESC
+        LIMIT %s;
+    """, (USER_ID, LIMIT)),
+
+    ("get_article_likers", """
+        SELECT u.username, al.liked_at
+        FROM article_likes al
+        JOIN users u ON u.id = al.user_id
+        WHERE al.article_id = %s
+        ORDER BY al.liked_at DESC
+        LIMIT %s;
+    """, (ARTICLE_ID, LIMIT)),
+
+    ("get_user_bookmarked_articles", """
+        SELECT n.id, n.title, n.author, ab.bookmarked_at
+        FROM article_bookmarks ab
+        JOIN news n ON ab.article_id = n.id
+        WHERE ab.user_id = %s
+        AND n.status = 'published'
+        ORDER BY ab.bookmarked_at DESC
+        LIMIT %s;
+    """, (USER_ID, LIMIT)),
+
+    ("get_user_interaction_changes", """
+        SELECT kind, article_id, active
+        FROM user_interaction_changes
+        WHERE user_id = %s AND changed_at > NOW() - INTERVAL '1 minute';
+    """, (USER_ID,)),
+
+    ("get_news_changes", """
+        SELECT id, title, author, content, status, created_at, views, like_count, bookmark_count, updated_at
+        FROM news
+        WHERE (updated_at, id) > (NOW() - INTERVAL '1 minute', 0)
+        ORDER BY updated_at, id
+        LIMIT %s;
+    """, (LIMIT,)),
+
+    ("get_news_changes_deletions", """
+        SELECT id, deleted_at
+        FROM news_deletions
+        WHERE (deleted_at, id) > (NOW() - INTERVAL '1 minute', 0)
+        ORDER BY deleted_at, id
+        LIMIT %s;
+    """, (LIMIT,)),
+
+    ("get_article_counters", """
+        SELECT id, views, like_count, bookmark_count
+        FROM news
+        WHERE id = ANY(%s) AND status = 'published';
+    """, ([ARTICLE_ID],)),
+
+    ("get_autocomplete_entries", """
+        SELECT id, title, author, status, updated_at
+        FROM news
+        WHERE (updated_at, id) > (NOW() - INTERVAL '1 minute', 0)
+        ORDER BY updated_at, id
+        LIMIT %s;
+    """, (LIMIT,)),
+]
+
+INDEX_NODES = {"Index Scan", "Index Only Scan"}
+FORBIDDEN_NODES = {"Seq Scan", "Sort", "Incremental Sort"}
+
+
+def _walk(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _walk(child)
+
+
+def check_query(cur, name, sql, params):
+    """Return (ok, ringkasan plan)."""
+    cur.execute("SET LOCAL enable_seqscan = off;")
+    cur.execute("SET LOCAL enable_sort = off;")
+    cur.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+    plan = cur.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    nodes = list(_walk(plan[0]["Plan"]))
+    node_types = [n["Node Type"] for n in nodes]
+    forbidden = [t for t in node_types if t in FORBIDDEN_NODES]
+    index_names = [n.get("Index Name") for n in nodes if n["Node Type"] in INDEX_NODES]
+
+    ok = not forbidden and bool(index_names)
+    summary = " -> ".join(node_types)
+    if index_names:
+        summary += f"  [{', '.join(index_names)}]"
+    return ok, summary
+
+
+def main():
+    print()
+    print("=" * 60)
+    print("🔍 CRYPTO INSIGHT - QUERY PLAN CHECK")
+    print("=" * 60)
+    print()
+
+    conn, _ = connect()
+    if not conn:
+        print("❌ Cannot connect to database")
+        sys.exit(1)
+
+    failures = 0
+    cur = conn.cursor()
+    for name, sql, params in HOT_QUERIES:
+        try:
+            ok, summary = check_query(cur, name, sql, params)
+        except Exception as e:
+            ok, summary = False, f"error: {e}"
+        conn.rollback()
+
+        print(f"   {'✅' if ok else '❌'} {name}")
+        print(f"      {summary}")
+        if not ok:
+            failures += 1
+
+    conn.close()
+    print()
+    if failures:
+        print(f"❌ {failures} of {len(HOT_QUERIES)} queries are not index-backed")
+        sys.exit(1)
+    print(f"🎊 All {len(HOT_QUERIES)} hot queries use index scans without sorting")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
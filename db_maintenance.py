@@ -0,0 +1,430 @@
+# db_maintenance.py — Background maintenance scheduler (PostgreSQL)
+"""
+Maintenance scheduler untuk tugas berkala di database:
+- Refresh materialized view ranking (REFRESH ... CONCURRENTLY)
+- Partisi bulanan article_views: buat partisi ke depan, rollup + drop
+  partisi lama (migration_phase9_views_partitioning.sql)
+- Rollup analytics harian per artikel / author dari watermark terakhir
+  (migration_phase13_analytics_rollups.sql), termasuk sketch HyperLogLog
+  unique viewers (migration_phase14_viewer_sketches.sql)
+- Prune log perubahan like/bookmark untuk delta sync client
+  (migration_phase16_interaction_changes.sql)
+- Prune tombstone news yang dihapus (migration_phase17_news_updated_at.sql)
+- Cadence tiap task diatur lewat app_settings (bisa diubah tanpa deploy)
+- pg_try_advisory_lock: jika beberapa client jalan bersamaan, hanya satu
+  yang mengerjakan task; yang lain skip
+- Jadwal global: task dianggap "due" berdasarkan waktu terakhir dijalankan
+  (matview_refresh_log / maintenance_log), bukan per client
+
+Scheduler berjalan di daemon thread dengan koneksi sendiri, jadi tidak
+pernah memblok UI.
+
+Backfill sketch unique viewers (sekali, setelah migration phase 14):
+    python db_maintenance.py backfill_sketches [days]
+"""
+
+import datetime
+import sys
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from psycopg2.extras import execute_values
+
+from app_db_fixed import connect, get_app_settings
+from hyperloglog import HyperLogLog
+
+RANKING_VIEWS = ("v_popular_articles", "v_trending_articles", "v_most_liked_articles")
+
+# Namespace advisory lock (pg_try_advisory_lock(int, int))
+_LOCK_NAMESPACE = 7301
+_ANALYTICS_LOCK_ID = 3
+
+
+@dataclass
+class MaintenanceTask:
+    name: str
+    lock_id: int
+    interval_key: str          # key di app_settings
+    default_interval: float    # detik
+    run: Callable              # run(conn) -> None
+    last_run_at: Optional[Callable] = None  # last_run_at(conn) -> detik sejak run terakhir
+
+
+def refresh_materialized_view(conn, view_name: str) -> float:
+    """REFRESH MATERIALIZED VIEW CONCURRENTLY + catat di matview_refresh_log."""
+    if view_name not in RANKING_VIEWS:
+        raise ValueError(f"Unknown materialized view: {view_name}")
+    started = time.monotonic()
+    cur = conn.cursor()
+    cur.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view_name};")
+    duration_ms = int((time.monotonic() - started) * 1000)
+    cur.execute("""
+        INSERT INTO matview_refresh_log (view_name, refreshed_at, duration_ms)
+        VALUES (%s, NOW(), %s)
+        ON CONFLICT (view_name) DO UPDATE
+        SET refreshed_at = EXCLUDED.refreshed_at, duration_ms = EXCLUDED.duration_ms;
+    """, (view_name, duration_ms))
+    conn.commit()
+    return duration_ms
+
+
+def _refresh_ranking_views(conn):
+    for view_name in RANKING_VIEWS:
+        duration_ms = refresh_materialized_view(conn, view_name)
+        print(f"🔄 Refreshed {view_name} ({duration_ms} ms)")
+
+
+def _ranking_views_age(conn) -> float:
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT COALESCE(EXTRACT(EPOCH FROM NOW() - MIN(refreshed_at)), 1e9)
+        FROM matview_refresh_log
+        WHERE view_name = ANY(%s);
+    """, (list(RANKING_VIEWS),))
+    age = cur.fetchone()[0]
+    conn.commit()
+    return float(age)
+
+
+def _task_age(task_name: str) -> Callable:
+    def age(conn) -> float:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT COALESCE(EXTRACT(EPOCH FROM NOW() - MAX(ran_at)), 1e9)
+            FROM maintenance_log
+            WHERE task_name = %s;
+        """, (task_name,))
+        value = cur.fetchone()[0]
+        conn.commit()
+        return float(value)
+    return age
+
+
+def _log_task_run(conn, task_name: str, duration_ms: int):
+    cur = conn.cursor()
+    cur.execute("""
+        INSERT INTO maintenance_log (task_name, ran_at, duration_ms)
+        VALUES (%s, NOW(), %s)
+        ON CONFLICT (task_name) DO UPDATE
+        SET ran_at = EXCLUDED.ran_at, duration_ms = EXCLUDED.duration_ms;
+    """, (task_name, duration_ms))
+    conn.commit()
+
+
+def _maintain_article_views(conn):
+    """Partisi bulan depan + rollup/drop partisi di luar retention."""
+    started = time.monotonic()
+    cur = conn.cursor()
+    cur.execute("SELECT ensure_article_views_partitions();")
+    created = cur.fetchone()[0]
+    conn.commit()
+    cur.execute("SELECT maintain_article_views();")
+    dropped = cur.fetchone()[0]
+    conn.commit()
+    duration_ms = int((time.monotonic() - started) * 1000)
+    _log_task_run(conn, "article_views_partitions", duration_ms)
+    print(f"🗂️ article_views partitions: {created} created, {dropped} rolled up ({duration_ms} ms)")
+
+
+def _prune_interaction_changes(conn):
+    """Hapus log perubahan like/bookmark di luar retention."""
+    started = time.monotonic()
+    cur = conn.cursor()
+    cur.execute("SELECT prune_interaction_changes();")
+    deleted = cur.fetchone()[0]
+    conn.commit()
+    duration_ms = int((time.monotonic() - started) * 1000)
+    _log_task_run(conn, "interaction_changes_prune", duration_ms)
+    print(f"🧹 Interaction change log: {deleted} rows pruned ({duration_ms} ms)")
+
+
+def _prune_news_deletions(conn):
+    """Hapus tombstone news di luar retention."""
+    started = time.monotonic()
+    cur = conn.cursor()
+    cur.execute("SELECT prune_news_deletions();")
+    deleted = cur.fetchone()[0]
+    conn.commit()
+    duration_ms = int((time.monotonic() - started) * 1000)
+    _log_task_run(conn, "news_deletions_prune", duration_ms)
+    print(f"🧹 News deletion log: {deleted} rows pruned ({duration_ms} ms)")
+
+
+# Tabel rollup harian -> kolom key (sketch di kolom viewers_hll)
+_SKETCH_TABLES = (("article_daily_stats", "article_id"), ("author_daily_stats", "author_id"))
+
+
+def _store_sketches(cur, table: str, key_column: str,
+                    sketches: Dict[Tuple[int, datetime.date], HyperLogLog], rebuild: bool):
+    if not sketches:
+        return
+    if not rebuild:
+        # Gabungkan dengan sketch yang sudah tersimpan untuk hari yang sama
+        keys, days = zip(*sketches)
+        cur.execute(f"""
+            SELECT s.{key_column}, s.day, s.viewers_hll
+            FROM {table} s
+            JOIN unnest(%s::int[], %s::date[]) AS k(key, day)
+              ON s.{key_column} = k.key AND s.day = k.day
+            WHERE s.viewers_hll IS NOT NULL;
+        """, (list(keys), list(days)))
+        for key, day, data in cur.fetchall():
+            sketches[(key, day)].merge(HyperLogLog.from_bytes(data))
+
+    execute_values(cur, f"""
+        INSERT INTO {table} AS s ({key_column}, day, viewers_hll, unique_viewers)
+        VALUES %s
+        ON CONFLICT ({key_column}, day) DO UPDATE
+        SET viewers_hll = EXCLUDED.viewers_hll, unique_viewers = EXCLUDED.unique_viewers;
+    """, [(key, day, sketch.to_bytes(), sketch.count())
+          for (key, day), sketch in sketches.items()], page_size=500)
+
+
+def update_viewer_sketches(conn, window_from, window_to, rebuild: bool = False) -> int:
+    """
+    Tambahkan viewer dari article_views di (window_from, window_to] ke sketch
+    harian per artikel dan per author. rebuild=True: sketch lama untuk hari
+    yang tersentuh diganti (window harus mencakup hari penuh).
+    Tidak commit: caller commit bersama watermark. Return jumlah view.
+    """
+    articles = defaultdict(HyperLogLog)
+    authors = defaultdict(HyperLogLog)
+    cur = conn.cursor(name="viewer_sketches")  # server-side cursor
+    cur.itersize = 10000
+    cur.execute("""
+        SELECT v.article_id, n.author_id, (v.viewed_at AT TIME ZONE 'UTC')::date,
+               COALESCE(v.user_id::text, host(v.ip_address))
+        FROM article_views v
+        JOIN news n ON n.id = v.article_id
+        WHERE v.viewed_at > %s AND v.viewed_at <= %s;
+    """, (window_from, window_to))
+    views = 0
+    for article_id, author_id, day, viewer in cur:
+        if viewer is None:
+            continue  # anonymous tanpa IP: tidak bisa dibedakan
+        articles[(article_id, day)].add(viewer)
+        if author_id is not None:
+            authors[(author_id, day)].add(viewer)
+        views += 1
+    cur.close()
+
+    cur = conn.cursor()
+    for (table, key_column), sketches in zip(_SKETCH_TABLES, (articles, authors)):
+        _store_sketches(cur, table, key_column, sketches, rebuild)
+    return views
+
+
+def _analytics_rollup(conn, max_windows: int = 50):
+    """Proses event baru window per window (satu transaksi per window)."""
+    started = time.monotonic()
+    cur = conn.cursor()
+    total = 0
+    for _ in range(max_windows):
+        cur.execute("SELECT events, caught_up, window_from, window_to FROM analytics_rollup();")
+        events, caught_up, window_from, window_to = cur.fetchone()
+        if window_to > window_from:
+            update_viewer_sketches(conn, window_from, window_to)
+        conn.commit()
+        total += events
+        if caught_up:
+            break
+    duration_ms = int((time.monotonic() - started) * 1000)
+    _log_task_run(conn, "analytics_rollup", duration_ms)
+    if total:
+        print(f"📊 Analytics rollup: {total} events ({duration_ms} ms)")
+
+
+def backfill_viewer_sketches(conn, days: int = 35) -> int:
+    """
+    Bangun ulang sketch harian N hari terakhir dari raw article_views (per hari,
+    sampai watermark analytics). Memegang lock task analytics_rollup supaya
+    scheduler tidak jalan bersamaan. Return jumlah view yang diproses.
+    """
+    cur = conn.cursor()
+    cur.execute("SELECT pg_advisory_lock(%s, %s);", (_LOCK_NAMESPACE, _ANALYTICS_LOCK_ID))
+    conn.commit()
+    total = 0
+    try:
+        cur.execute("SELECT watermark FROM rollup_watermarks WHERE name = 'analytics_daily';")
+        watermark = cur.fetchone()[0]
+        conn.commit()
+        first_day = datetime.datetime.now(datetime.timezone.utc).date() - datetime.timedelta(days=days - 1)
+        day = first_day
+        while True:
+            day_start = datetime.datetime.combine(day, datetime.time(), tzinfo=datetime.timezone.utc)
+            if day_start > watermark:
+                break
+            window_to = min(day_start + datetime.timedelta(days=1), watermark)
+            views = update_viewer_sketches(conn, day_start - datetime.timedelta(microseconds=1),
+                                           window_to, rebuild=True)
+            conn.commit()
+            total += views
+            print(f"🧮 {day}: {views} views")
+            day += datetime.timedelta(days=1)
+    finally:
+        conn.rollback()
+        cur = conn.cursor()
+        cur.execute("SELECT pg_advisory_unlock(%s, %s);", (_LOCK_NAMESPACE, _ANALYTICS_LOCK_ID))
+        conn.commit()
+    return total
+
+
+def default_tasks() -> List[MaintenanceTask]:
+    return [
+        MaintenanceTask(
+            name="refresh_ranking_views",
+            lock_id=1,
+            interval_key="matview.refresh_interval_seconds",
+            default_interval=60,
+            run=_refresh_ranking_views,
+            last_run_at=_ranking_views_age,
+        ),
+        MaintenanceTask(
+            name="article_views_partitions",
+            lock_id=2,
+            interval_key="views.maintenance_interval_seconds",
+            default_interval=86400,
+            run=_maintain_article_views,
+            last_run_at=_task_age("article_views_partitions"),
+        ),
+        MaintenanceTask(
+            name="analytics_rollup",
+            lock_id=_ANALYTICS_LOCK_ID,
+            interval_key="analytics.rollup_interval_seconds",
+            default_interval=300,
+            run=_analytics_rollup,
+            last_run_at=_task_age("analytics_rollup"),
+        ),
+        MaintenanceTask(
+            name="interaction_changes_prune",
+            lock_id=4,
+            interval_key="interactions.prune_interval_seconds",
+            default_interval=86400,
+            run=_prune_interaction_changes,
+            last_run_at=_task_age("interaction_changes_prune"),
+        ),
+        MaintenanceTask(
+            name="news_deletions_prune",
+            lock_id=5,
+            interval_key="news.deletion_prune_interval_seconds",
+            default_interval=86400,
+            run=_prune_news_deletions,
+            last_run_at=_task_age("news_deletions_prune"),
+        ),
+    ]
+
+
+class MaintenanceScheduler:
+    """
+    Jalankan MaintenanceTask secara berkala di background thread.
+
+    Setiap tick: baca cadence dari app_settings (di-cache), lalu untuk tiap
+    task yang due ambil advisory lock, cek ulang umur run terakhir (client
+    lain mungkin baru saja menjalankannya), jalankan, lepas lock.
+    """
+
+    TICK_SECONDS = 5
+    SETTINGS_TTL_SECONDS = 60
+
+    def __init__(self, tasks: Optional[List[MaintenanceTask]] = None):
+        self.tasks = tasks if tasks is not None else default_tasks()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._conn = None
+        self._settings = {}
+        self._settings_loaded_at = 0.0
+        self._next_check = {task.name: 0.0 for task in self.tasks}
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="MaintenanceScheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self._close_conn()
+
+    # ---------- Internal ----------
+    def _interval(self, task: MaintenanceTask) -> float:
+        now = time.monotonic()
+        if now - self._settings_loaded_at > self.SETTINGS_TTL_SECONDS:
+            self._settings = get_app_settings("") or self._settings
+            self._settings_loaded_at = now
+        return float(self._settings.get(task.interval_key, task.default_interval))
+
+    def _connection(self):
+        if self._conn is None or self._conn.closed:
+            self._conn, _ = connect()
+        return self._conn
+
+    def _close_conn(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+    def _loop(self):
+        while not self._stop.is_set():
+            for task in self.tasks:
+                if self._stop.is_set():
+                    break
+                if time.monotonic() >= self._next_check[task.name]:
+                    self._run_if_due(task)
+            self._stop.wait(self.TICK_SECONDS)
+
+    def _run_if_due(self, task: MaintenanceTask):
+        interval = self._interval(task)
+        self._next_check[task.name] = time.monotonic() + interval
+        conn = self._connection()
+        if not conn:
+            return
+
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT pg_try_advisory_lock(%s, %s);", (_LOCK_NAMESPACE, task.lock_id))
+            locked = cur.fetchone()[0]
+            conn.commit()
+            if not locked:
+                return  # client lain sedang mengerjakan task ini
+            try:
+                age = task.last_run_at(conn) if task.last_run_at else interval
+                if age >= interval:
+                    task.run(conn)
+                else:
+                    # Client lain sudah menjalankan; cek lagi saat jatuh tempo
+                    self._next_check[task.name] = time.monotonic() + (interval - age)
+            finally:
+                conn.rollback()  # advisory lock (session-level) tidak ikut ter-rollback
+                cur = conn.cursor()
+                cur.execute("SELECT pg_advisory_unlock(%s, %s);", (_LOCK_NAMESPACE, task.lock_id))
+                conn.commit()
+        except Exception as e:
+            print(f"⚠️ Maintenance task {task.name} failed: {e}")
+            try:
+                conn.rollback()
+            except Exception:
+                self._close_conn()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "backfill_sketches":
+        print("Usage: python db_maintenance.py backfill_sketches [days]")
+        sys.exit(1)
+    conn, _ = connect()
+    if not conn:
+        print("❌ Cannot connect to database")
+        sys.exit(1)
+    try:
+        processed = backfill_viewer_sketches(conn, int(sys.argv[2]) if len(sys.argv) > 2 else 35)
+        print(f"✅ Rebuilt viewer sketches from {processed} views")
+    finally:
+        conn.close()
@@ -0,0 +1,218 @@
+# draft_journal.py — Crash-safe journal untuk draft artikel penerbit
+"""
+Journal lokal untuk autosave PenerbitDashboard:
+- File append-only (satu JSON per baris), tidak pernah ditulis ulang saat mengetik
+- Perubahan disimpan sebagai delta (posisi, jumlah karakter dihapus, teks baru)
+- Penulisan + fsync di background thread; fsync dijalankan per interval
+- Saat aplikasi dibuka lagi, draft direkonstruksi dengan replay journal
+
+Format baris:
+    {"op": "base",  "title": ..., "content": ..., "draft_id": ..., "hash": ...}
+    {"op": "title", "value": ...}
+    {"op": "delta", "pos": 10, "del": 3, "ins": "abc"}
+    {"op": "saved", "draft_id": 42, "hash": "..."}
+"""
+
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+_STOP = object()
+_RESET = object()
+
+
+def content_hash(title: str, content: str) -> str:
+    """
+    Hash isi draft; dipakai untuk memutuskan perlu push ke DB atau tidak.
+    Whitespace di awal/akhir diabaikan (yang disimpan ke DB sudah di-strip).
+    """
+    return hashlib.sha256(f"{title.strip()}\0{content.strip()}".encode("utf-8")).hexdigest()
+
+
+def text_delta(old: str, new: str) -> Optional[Tuple[int, int, str]]:
+    """Delta minimal old -> new sebagai (pos, deleted, inserted), None jika sama."""
+    if old == new:
+        return None
+    limit = min(len(old), len(new))
+    start = 0
+    while start < limit and old[start] == new[start]:
+        start += 1
+    end_old, end_new = len(old), len(new)
+    while end_old > start and end_new > start and old[end_old - 1] == new[end_new - 1]:
+        end_old -= 1
+        end_new -= 1
+    return start, end_old - start, new[start:end_new]
+
+
+@dataclass
+class DraftState:
+    title: str = ""
+    content: str = ""
+    draft_id: Optional[int] = None
+    saved_hash: Optional[str] = None
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.title and not self.content
+
+    @property
+    def has_unsaved_changes(self) -> bool:
+        return not self.is_empty and content_hash(self.title, self.content) != self.saved_hash
+
+
+def recover_draft(path: str) -> Optional[DraftState]:
+    """Replay journal. Baris terakhir yang terpotong (crash) diabaikan."""
+    if not os.path.exists(path):
+        return None
+
+    state = DraftState()
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                op = entry.get("op")
+                if op == "base":
+                    state = DraftState(entry.get("title", ""), entry.get("content", ""),
+                                       entry.get("draft_id"), entry.get("hash"))
+                elif op == "title":
+                    state.title = entry["value"]
+                elif op == "delta":
+                    pos, deleted = entry["pos"], entry["del"]
+                    state.content = state.content[:pos] + entry["ins"] + state.content[pos + deleted:]
+                elif op == "saved":
+                    state.draft_id = entry["draft_id"]
+                    state.saved_hash = entry["hash"]
+    except Exception as e:
+        print(f"⚠️ Error reading draft journal: {e}")
+        return None
+
+    return None if state.is_empty else state
+
+
+class DraftJournal:
+    """
+    Append-only journal dengan writer thread.
+
+    Semua method hanya memasukkan entry ke antrian, jadi tidak pernah
+    menyentuh disk di UI thread. Writer thread menulis tiap entry dan
+    menjalankan fsync paling lambat setiap fsync_interval detik.
+    """
+
+    def __init__(self, path: str, fsync_interval: float = 2.0):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        # Salinan isi terakhir yang sudah dijurnal (untuk menghitung delta)
+        self._title = ""
+        self._content = ""
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop,
+                                        name="DraftJournalWriter", daemon=True)
+        self._writer.start()
+
+    # ---------- API (dipanggil dari UI thread) ----------
+    def start(self, state: Optional[DraftState] = None):
+        """Mulai journal baru (compact): ganti file dengan snapshot secara atomik."""
+        state = state or DraftState()
+        self._title, self._content = state.title, state.content
+        base = None
+        if not state.is_empty or state.draft_id is not None:
+            base = {"op": "base", "title": state.title, "content": state.content,
+                    "draft_id": state.draft_id, "hash": state.saved_hash}
+        self._queue.put((_RESET, base))
+
+    def record(self, title: str, content: str):
+        """Jurnal perubahan sejak record() terakhir (hanya delta)."""
+        if title != self._title:
+            self._queue.put({"op": "title", "value": title})
+            self._title = title
+        delta = text_delta(self._content, content)
+        if delta:
+            pos, deleted, inserted = delta
+            self._queue.put({"op": "delta", "pos": pos, "del": deleted, "ins": inserted})
+            self._content = content
+
+    def mark_saved(self, draft_id: int, saved_hash: str):
+        self._queue.put({"op": "saved", "draft_id": draft_id, "hash": saved_hash})
+
+    def close(self):
+        """Tulis sisa antrian, fsync, dan hentikan writer thread."""
+        self._queue.put(_STOP)
+        self._writer.join(timeout=5)
+
+    # ---------- Writer thread ----------
+    def _writer_loop(self):
+        f = open(self.path, "a", encoding="utf-8")
+        dirty = False
+        last_sync = time.monotonic()
+        try:
+            while True:
+                timeout = max(0.0, self.fsync_interval - (time.monotonic() - last_sync))
+                try:
+                    item = self._queue.get(timeout=timeout if dirty else None)
+                except queue.Empty:
+                    item = None
+
+                if item is _STOP:
+                    break
+                if isinstance(item, tuple) and item[0] is _RESET:
+                    f.close()
+                    f = self._compact(item[1])
+                elif item is not None:
+                    f.write(json.dumps(item, ensure_ascii=False) + "\n")
+                    dirty = True
+
+                if dirty and time.monotonic() - last_sync >= self.fsync_interval:
+                    self._sync(f)
+                    dirty = False
+                    last_sync = time.monotonic()
+        except Exception as e:
+            print(f"❌ Draft journal writer error: {e}")
+        finally:
+            try:
+                self._sync(f)
+                f.close()
+            except Exception:
+                pass
+
+    def _compact(self, base: Optional[dict]):
+        """
+        Tulis snapshot ke file sementara, fsync, lalu os.replace ke journal.
+        Crash di tengah jalan menyisakan journal lama yang utuh, bukan file kosong.
+        Return file journal baru yang dibuka untuk append.
+        """
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as tmp:
+            if base is not None:
+                tmp.write(json.dumps(base, ensure_ascii=False) + "\n")
+            self._sync(tmp)
+        os.replace(tmp_path, self.path)
+        self._sync_dir()
+        return open(self.path, "a", encoding="utf-8")
+
+    def _sync_dir(self):
+        """fsync direktori supaya rename ikut persist (tidak tersedia di Windows)."""
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        fd = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _sync(f):
+        f.flush()
+        os.fsync(f.fileno())
@@ -0,0 +1,237 @@
+# interaction_state.py — Liked/bookmarked article ids di memory per user
+"""
+Pengganti is_article_liked / is_article_bookmarked per widget (satu query
+per artikel per widget):
+- Saat login, semua liked dan bookmarked article id user dimuat sekali
+  (get_user_interaction_ids) ke bitmap (1 bit per article id)
+- Toggle dari user sendiri langsung meng-update bitmap
+- Background thread mengambil perubahan sejak sync terakhir
+  (get_user_interaction_changes, log dari migration_phase16), mis. dari
+  device lain; jika terlalu lama tidak sync, muat ulang penuh
+- is_liked() / is_bookmarked(): O(1), tanpa query. Sebelum state siap
+  (atau jika load gagal) fallback ke local replica, lalu query database
+
+Pakai:
+    interaction_state.prefetch(username)    # saat login
+    interaction_state.is_liked(article_id, username)
+    interaction_state.record_like(article_id, username, True)   # setelah like_article sukses
+    interaction_state.release(username)     # saat logout
+"""
+
+import datetime
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from app_db_fixed import get_app_settings
+from app_db_interactions import (
+    get_user_interaction_ids, get_user_interaction_changes,
+    is_article_liked, is_article_bookmarked
+)
+import local_replica
+
+SYNC_INTERVAL = 60.0    # detik (app_settings 'interactions.sync_interval_seconds')
+SYNC_OVERLAP = datetime.timedelta(seconds=60)  # change dari transaksi yang commit terlambat tetap terambil
+
+LIKE = "L"
+BOOKMARK = "B"
+
+
+class IdBitmap:
+    """Set article id (int >= 0) sebagai bitmap; add/discard/contains O(1)."""
+
+    __slots__ = ("_bits", "_count")
+
+    def __init__(self, ids: Iterable[int] = ()):
+        self._bits = bytearray()
+        self._count = 0
+        for article_id in ids:
+            self.add(article_id)
+
+    def __contains__(self, article_id: int) -> bool:
+        index = article_id >> 3
+        return index < len(self._bits) and bool(self._bits[index] & (1 << (article_id & 7)))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, article_id: int):
+        index = article_id >> 3
+        if index >= len(self._bits):
+            self._bits.extend(bytes(index + 1 + (index >> 2) - len(self._bits)))
+        mask = 1 << (article_id & 7)
+        if not self._bits[index] & mask:
+            self._bits[index] |= mask
+            self._count += 1
+
+    def discard(self, article_id: int):
+        index = article_id >> 3
+        mask = 1 << (article_id & 7)
+        if index < len(self._bits) and self._bits[index] & mask:
+            self._bits[index] &= ~mask & 0xFF
+            self._count -= 1
+
+
+class InteractionState:
+    """Liked/bookmarked ids satu user, disinkronkan di background thread."""
+
+    def __init__(self, username: str):
+        self.username = username
+        self._lock = threading.Lock()
+        self._sets = {LIKE: IdBitmap(), BOOKMARK: IdBitmap()}
+        self._as_of = None              # waktu server saat load/sync terakhir
+        self._local: Dict[tuple, float] = {}  # (kind, article_id) -> waktu toggle lokal
+        self._loaded = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ---------- Query ----------
+    def contains(self, kind: str, article_id: int) -> Optional[bool]:
+        """True/False, atau None jika state belum dimuat (caller fallback). Tidak menunggu."""
+        if not self._loaded:
+            return None
+        with self._lock:
+            return article_id in self._sets[kind]
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return {"liked": len(self._sets[LIKE]), "bookmarked": len(self._sets[BOOKMARK])}
+
+    # ---------- Update ----------
+    def record(self, kind: str, article_id: int, active: bool):
+        """Toggle dari user sendiri (setelah write ke database sukses)."""
+        with self._lock:
+            self._apply(kind, article_id, active)
+            self._local[(kind, article_id)] = time.monotonic()
+
+    def load(self) -> bool:
+        """Muat ulang semua id dari database."""
+        started = time.monotonic()
+        result = get_user_interaction_ids(self.username)
+        if result is None:
+            return False
+        sets = {LIKE: IdBitmap(result["liked"]), BOOKMARK: IdBitmap(result["bookmarked"])}
+        with self._lock:
+            # Toggle lokal selama query berjalan lebih baru dari hasil query
+            for (kind, article_id), toggled_at in self._local.items():
+                if toggled_at > started:
+                    if article_id in self._sets[kind]:
+                        sets[kind].add(article_id)
+                    else:
+                        sets[kind].discard(article_id)
+            self._sets = sets
+            self._as_of = result["as_of"]
+            self._forget_local(started)
+            self._loaded = True
+        print(f"✅ Interaction state loaded for {self.username}: "
+              f"{len(sets[LIKE])} liked, {len(sets[BOOKMARK])} bookmarked")
+        return True
+
+    def sync(self) -> bool:
+        """Terapkan perubahan sejak sync terakhir (atau load penuh)."""
+        if self._as_of is None:
+            return self.load()
+        started = time.monotonic()
+        since = self._as_of
+        result = get_user_interaction_changes(self.username, since - SYNC_OVERLAP)
+        if result is None:
+            return False
+        if not result["complete"]:
+            return self.load()
+        with self._lock:
+            for kind, article_id, active in result["changes"]:
+                if self._local.get((kind, article_id), 0.0) > started:
+                    continue  # toggle lokal lebih baru
+                self._apply(kind, article_id, active)
+            self._as_of = result["as_of"]
+            self._forget_local(started)
+        return True
+
+    def _apply(self, kind: str, article_id: int, active: bool):
+        if active:
+            self._sets[kind].add(article_id)
+        else:
+            self._sets[kind].discard(article_id)
+
+    def _forget_local(self, before: float):
+        """Toggle lokal yang lebih lama dari query terakhir sudah tercermin di server."""
+        self._local = {key: t for key, t in self._local.items() if t > before}
+
+    # ---------- Background sync ----------
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name=f"InteractionState-{self.username}",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        try:
+            self.load()  # gagal: widget fallback ke replica / query sampai sync berhasil
+        except Exception as e:
+            print(f"⚠️ Interaction state load failed: {e}")
+        interval = float(get_app_settings("interactions.").get(
+            "interactions.sync_interval_seconds", SYNC_INTERVAL))
+        while not self._stop.wait(interval):
+            try:
+                self.sync()
+            except Exception as e:
+                print(f"⚠️ Interaction sync failed: {e}")
+
+
+_states: Dict[str, InteractionState] = {}
+_states_lock = threading.Lock()
+
+
+def prefetch(username: str) -> InteractionState:
+    """Mulai load + sync background untuk user (dipanggil saat login)."""
+    with _states_lock:
+        state = _states.get(username)
+        if state is None:
+            state = _states[username] = InteractionState(username)
+        state.start()
+        return state
+
+
+def release(username: str):
+    """Hentikan sync user (dipanggil saat logout)."""
+    with _states_lock:
+        state = _states.pop(username, None)
+    if state:
+        state.stop()
+
+
+def _contains(kind: str, article_id: int, username: str) -> Optional[bool]:
+    state = _states.get(username)
+    result = state.contains(kind, article_id) if state else None
+    if result is None:
+        replica = local_replica.current()
+        if replica is not None and replica.username == username:
+            return replica.contains(kind, article_id)
+    return result
+
+
+def is_liked(article_id: int, username: str) -> bool:
+    result = _contains(LIKE, article_id, username)
+    return is_article_liked(article_id, username) if result is None else result
+
+
+def is_bookmarked(article_id: int, username: str) -> bool:
+    result = _contains(BOOKMARK, article_id, username)
+    return is_article_bookmarked(article_id, username) if result is None else result
+
+
+def record_like(article_id: int, username: str, liked: bool):
+    state = _states.get(username)
+    if state:
+        state.record(LIKE, article_id, liked)
+
+
+def record_bookmark(article_id: int, username: str, bookmarked: bool):
+    state = _states.get(username)
+    if state:
+        state.record(BOOKMARK, article_id, bookmarked)
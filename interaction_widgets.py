@@ -11,11 +11,10 @@ Version: 1.0 - Phase 1 Complete
 
 from PyQt5 import QtWidgets, QtCore, QtGui
 from typing import Optional
-from app_db_interactions import (
-    like_article, unlike_article, is_article_liked,
-    bookmark_article, unbookmark_article, is_article_bookmarked,
-    track_article_view, get_article_stats
-)
+from query_cache import get_article_stats
+from local_replica import like_article, unlike_article, bookmark_article, unbookmark_article
+import interaction_state
+from view_tracker import record_view
 
 
 class ArticleInteractionBar(QtWidgets.QWidget):
@@ -103,20 +102,20 @@ class ArticleInteractionBar(QtWidgets.QWidget):
         """)
     
     def _load_states(self):
-        """Load current states from database"""
+        """Load current states (liked/bookmarked dari interaction_state, tanpa query)"""
         # Check if liked
-        self.is_liked = is_article_liked(self.article_id, self.username)
+        self.is_liked = interaction_state.is_liked(self.article_id, self.username)
         self._update_like_button()
         
         # Check if bookmarked
-        self.is_bookmarked = is_article_bookmarked(self.article_id, self.username)
+        self.is_bookmarked = interaction_state.is_bookmarked(self.article_id, self.username)
         self._update_bookmark_button()
         
         # Get stats
         self._refresh_stats()
         
-        # Track view
-        track_article_view(self.article_id, self.username)
+        # Track view (dedupe + rate limit, insert di background)
+        record_view(self.article_id, self.username)
     
     def _toggle_like(self):
         """Toggle like status"""
@@ -132,6 +131,7 @@ class ArticleInteractionBar(QtWidgets.QWidget):
                 self.liked_changed.emit(True)
         
         if success:
+            interaction_state.record_like(self.article_id, self.username, self.is_liked)
             self._update_like_button()
             self._refresh_stats()
     
@@ -190,6 +190,7 @@ class ArticleInteractionBar(QtWidgets.QWidget):
                 self.bookmarked_changed.emit(True)
         
         if success:
+            interaction_state.record_bookmark(self.article_id, self.username, self.is_bookmarked)
             self._update_bookmark_button()
             self._refresh_stats()
     
@@ -0,0 +1,461 @@
+# local_replica.py — Offline-first replica SQLite untuk user dashboard
+"""
+Replica lokal dari data yang dibutuhkan user dashboard:
+- Artikel published (judul, author, konten, counter), disinkronkan
+  incremental lewat watermark news.updated_at
+  (migration_phase17_news_updated_at.sql). Artikel yang di-unpublish
+  ikut di stream itu (status berubah), yang dihapus lewat tombstone
+  news_deletions; counter hanya di-refresh untuk artikel di feed
+- Snapshot feed trending / popular / most liked (urutan dari server)
+- Liked / bookmarked article id milik user
+- Outbox: like/bookmark/view yang gagal dikirim (offline) disimpan lokal
+  dan di-replay per batch dalam satu transaksi saat koneksi kembali
+
+Dashboard merender feed langsung dari replica saat startup (tanpa
+menunggu network), lalu sync() berjalan di background thread dan
+dashboard merender ulang jika feed berubah.
+
+Satu koneksi SQLite (WAL) dipakai bersama UI thread dan sync thread,
+dilindungi lock (pola yang sama dengan monitoring_store.py).
+"""
+
+import datetime
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from app_db_fixed import connect
+from app_db_interactions import (
+    get_news_changes, get_article_counters, get_user_interaction_ids,
+    apply_interaction_batch
+)
+import query_cache
+
+# Naikkan jika schema berubah
+SCHEMA_VERSION = 1
+
+SYNC_INTERVAL = 60.0        # detik antar sync background (dashboard)
+PAGE_SIZE = 500             # baris news per halaman delta
+OUTBOX_BATCH = 200          # operasi outbox per transaksi replay
+FEED_LIMIT = 20
+# Transaksi yang commit setelah sync bisa punya updated_at < watermark
+SYNC_OVERLAP = datetime.timedelta(seconds=60)
+
+FEEDS = {
+    "trending": lambda: query_cache.get_trending_articles(limit=FEED_LIMIT, days=7),
+    "popular": lambda: query_cache.get_popular_articles(limit=FEED_LIMIT),
+    "most_liked": lambda: query_cache.get_most_liked_articles(limit=FEED_LIMIT),
+}
+
+# op outbox -> (kind, active); view tidak mengubah state interaksi
+_OPS = {
+    "like": ("L", True), "unlike": ("L", False),
+    "bookmark": ("B", True), "unbookmark": ("B", False),
+}
+_COUNTER_COLUMNS = {"L": "likes", "B": "bookmarks"}
+
+
+class LocalReplica:
+    """Replica SQLite untuk satu user; read lokal, sync di background."""
+
+    def __init__(self, username: str, path: str = "news_replica.db"):
+        self.username = username
+        self.path = path
+        self.online: Optional[bool] = None   # None = belum pernah sync
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._configure()
+        self._setup_schema()
+
+    # ---------- Setup ----------
+    def _configure(self):
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA busy_timeout=5000")
+
+    def _setup_schema(self):
+        with self._lock, self._conn:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                # Replica hanya cache: schema lama dibuang dan di-sync ulang,
+                # kecuali outbox (write user yang belum terkirim)
+                for table in ("articles", "feed_entries", "user_interactions", "replica_meta"):
+                    self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS articles (
+                    id INTEGER PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    author TEXT NOT NULL,
+                    content TEXT NOT NULL DEFAULT '',
+                    created_at TEXT,
+                    views INTEGER NOT NULL DEFAULT 0,
+                    likes INTEGER NOT NULL DEFAULT 0,
+                    bookmarks INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS feed_entries (
+                    feed TEXT NOT NULL,
+                    rank INTEGER NOT NULL,
+                    article_id INTEGER NOT NULL,
+                    PRIMARY KEY (feed, rank)
+                ) WITHOUT ROWID
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS user_interactions (
+                    username TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    article_id INTEGER NOT NULL,
+                    PRIMARY KEY (username, kind, article_id)
+                ) WITHOUT ROWID
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT NOT NULL,
+                    op TEXT NOT NULL,
+                    article_id INTEGER NOT NULL,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS replica_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM replica_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    # ---------- Reads (lokal, aman dari UI thread) ----------
+    def feed(self, name: str) -> List[Tuple]:
+        """Feed tersimpan: [(id, title, author, views, likes, bookmarks, created_at), ...]"""
+        with self._lock:
+            return self._conn.execute("""
+                SELECT a.id, a.title, a.author, a.views, a.likes, a.bookmarks, a.created_at
+                FROM feed_entries f
+                JOIN articles a ON a.id = f.article_id
+                WHERE f.feed = ?
+                ORDER BY f.rank
+            """, (name,)).fetchall()
+
+    def contains(self, kind: str, article_id: int) -> bool:
+        with self._lock:
+            return self._conn.execute("""
+                SELECT 1 FROM user_interactions
+                WHERE username = ? AND kind = ? AND article_id = ?
+            """, (self.username, kind, article_id)).fetchone() is not None
+
+    def interaction_counts(self) -> Dict[str, int]:
+        with self._lock:
+            counts = dict(self._conn.execute("""
+                SELECT kind, COUNT(*) FROM user_interactions
+                WHERE username = ? GROUP BY kind
+            """, (self.username,)).fetchall())
+        return {"liked": counts.get("L", 0), "bookmarked": counts.get("B", 0)}
+
+    def pending(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM outbox WHERE username = ?",
+                                      (self.username,)).fetchone()[0]
+
+    # ---------- Writes lokal ----------
+    def record_local(self, op: str, article_id: int):
+        """Terapkan like/bookmark ke replica (write ke server sudah sukses atau masuk outbox)."""
+        if op not in _OPS:
+            return
+        kind, active = _OPS[op]
+        column = _COUNTER_COLUMNS[kind]
+        with self._lock, self._conn:
+            if active:
+                changed = self._conn.execute(
+                    "INSERT OR IGNORE INTO user_interactions VALUES (?, ?, ?)",
+                    (self.username, kind, article_id)).rowcount
+            else:
+                changed = self._conn.execute(
+                    "DELETE FROM user_interactions WHERE username = ? AND kind = ? AND article_id = ?",
+                    (self.username, kind, article_id)).rowcount
+            if changed:
+                self._conn.execute(
+                    f"UPDATE articles SET {column} = MAX(0, {column} + ?) WHERE id = ?",
+                    (1 if active else -1, article_id))
+
+    def enqueue(self, op: str, article_id: int):
+        """Simpan write di outbox untuk di-replay saat online."""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO outbox (username, op, article_id) VALUES (?, ?, ?)",
+                               (self.username, op, article_id))
+        self.record_local(op, article_id)
+
+    # ---------- Sync (background thread) ----------
+    def check_online(self) -> bool:
+        conn, _ = connect()
+        self.online = conn is not None
+        if conn is not None:
+            conn.close()
+        return self.online
+
+    def sync(self) -> Dict[str, object]:
+        """
+        Replay outbox lalu tarik perubahan. Return {'online': bool,
+        'feeds_changed': bool, 'replayed': int}. Berhenti di langkah pertama
+        yang gagal (offline); data lokal tetap dipakai.
+        """
+        result = {"online": False, "feeds_changed": False, "replayed": 0}
+        with self._sync_lock:
+            replayed = self.flush_outbox()
+            if replayed is None:
+                self.online = False
+                return result
+            result["replayed"] = replayed
+            if not (self._pull_news() and self._pull_interactions()):
+                self.online = False
+                return result
+            feeds_changed = self._pull_feeds()
+            # Setelah feed: snapshot feed bisa berasal dari query_cache (stale)
+            if not self._pull_counters():
+                self.online = False
+                return result
+            self.online = True
+            result.update(online=True, feeds_changed=feeds_changed)
+        return result
+
+    def flush_outbox(self) -> Optional[int]:
+        """Replay outbox per batch; return jumlah operasi, None jika gagal."""
+        total = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute("""
+                    SELECT id, op, article_id FROM outbox
+                    WHERE username = ? ORDER BY id LIMIT ?
+                """, (self.username, OUTBOX_BATCH)).fetchall()
+            if not rows:
+                return total
+
+            # Hanya state akhir per (kind, artikel) yang perlu dikirim
+            states = {"L": {}, "B": {}}
+            views = []
+            for _, op, article_id in rows:
+                if op == "view":
+                    views.append(article_id)
+                elif op in _OPS:
+                    kind, active = _OPS[op]
+                    states[kind][article_id] = active
+            if not apply_interaction_batch(self.username, states["L"], states["B"], views):
+                return None
+
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM outbox WHERE username = ? AND id <= ?",
+                                   (self.username, rows[-1][0]))
+            for article_id in set(states["L"]) | set(states["B"]) | set(views):
+                query_cache.invalidate_article(article_id)
+            total += len(rows)
+            print(f"📤 Replayed {len(rows)} offline actions")
+
+    def _pull_news(self) -> bool:
+        """
+        Tarik artikel yang berubah sejak cursor news_watermark (updated_at baris
+        terakhir). news_synced_at (waktu server sync sukses terakhir) dipakai
+        server untuk memutuskan apakah delta masih lengkap; jika tidak (tombstone
+        sudah di-prune) atau belum pernah sync, semua artikel dimuat ulang.
+        """
+        watermark = self._meta("news_watermark")
+        synced_at = self._meta("news_synced_at")
+        after = None
+        since = None
+        if watermark and synced_at:
+            after = (datetime.datetime.fromisoformat(watermark) - SYNC_OVERLAP, 0)
+            since = datetime.datetime.fromisoformat(synced_at)
+
+        result = get_news_changes(after, PAGE_SIZE, since)
+        if result is None:
+            return False
+        as_of = result["as_of"]
+        if not result["complete"]:
+            after = None
+            result = get_news_changes(None, PAGE_SIZE)
+            if result is None:
+                return False
+        if after is None:
+            return self._reload_news(result["rows"], as_of)
+
+        while True:
+            rows = result["rows"]
+            if rows:
+                with self._lock, self._conn:
+                    self._apply_news(rows)
+            if len(rows) < PAGE_SIZE:
+                break
+            result = get_news_changes((rows[-1][9], rows[-1][0]), PAGE_SIZE, since)
+            if result is None:
+                return False
+        with self._lock, self._conn:
+            self._set_meta("news_synced_at", as_of.isoformat())
+        return True
+
+    def _reload_news(self, rows: List[Tuple], as_of) -> bool:
+        """Muat ulang penuh; data lama diganti dalam satu transaksi setelah semua halaman terambil."""
+        pages = [rows]
+        while len(rows) == PAGE_SIZE:
+            result = get_news_changes((rows[-1][9], rows[-1][0]), PAGE_SIZE)
+            if result is None:
+                return False  # replica lama tetap dipakai
+            rows = result["rows"]
+            pages.append(rows)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM articles")
+            for page in pages:
+                self._apply_news(page)
+            self._set_meta("news_synced_at", as_of.isoformat())
+        return True
+
+    def _apply_news(self, rows: List[Tuple]):
+        """Upsert baris published, hapus yang tidak published / dihapus, geser cursor. Caller pegang lock."""
+        if not rows:
+            return
+        published = [(r[0], r[1], r[2], r[3], r[5], r[6], r[7], r[8])
+                     for r in rows if r[4] == 'published']
+        removed = [(r[0],) for r in rows if r[4] != 'published']
+        self._conn.executemany("""
+            INSERT INTO articles (id, title, author, content, created_at, views, likes, bookmarks)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                title = excluded.title, author = excluded.author,
+                content = excluded.content, created_at = excluded.created_at,
+                views = excluded.views, likes = excluded.likes,
+                bookmarks = excluded.bookmarks
+        """, published)
+        self._conn.executemany("DELETE FROM articles WHERE id = ?", removed)
+        self._set_meta("news_watermark", rows[-1][9].isoformat())
+
+    def _set_meta(self, key: str, value: str):
+        self._conn.execute("""
+            INSERT INTO replica_meta (key, value) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value
+        """, (key, value))
+
+    def _pull_counters(self) -> bool:
+        """Counter terbaru untuk artikel yang tampil di feed (counter tidak menggeser updated_at)."""
+        with self._lock:
+            ids = [r[0] for r in self._conn.execute("SELECT DISTINCT article_id FROM feed_entries")]
+        rows = get_article_counters(ids)
+        if rows is None:
+            return False
+        with self._lock, self._conn:
+            self._conn.executemany("""
+                UPDATE articles SET views = ?, likes = ?, bookmarks = ? WHERE id = ?
+            """, [(views, likes, bookmarks, article_id) for article_id, views, likes, bookmarks in rows])
+        return True
+
+    def _pull_interactions(self) -> bool:
+        result = get_user_interaction_ids(self.username)
+        if result is None:
+            return False
+        rows = ([(self.username, "L", a) for a in result["liked"]] +
+                [(self.username, "B", a) for a in result["bookmarked"]])
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM user_interactions WHERE username = ?", (self.username,))
+            self._conn.executemany("INSERT OR IGNORE INTO user_interactions VALUES (?, ?, ?)", rows)
+            # Write yang masuk outbox setelah replay tetap terlihat
+            pending = self._conn.execute("""
+                SELECT op, article_id FROM outbox WHERE username = ? ORDER BY id
+            """, (self.username,)).fetchall()
+        for op, article_id in pending:
+            self.record_local(op, article_id)
+        return True
+
+    def _pull_feeds(self) -> bool:
+        """Snapshot feed dari server. Return True jika ada feed yang berubah."""
+        snapshots = {}
+        for name, fetch in FEEDS.items():
+            rows = fetch()
+            if rows:  # [] bisa berarti error; snapshot lama dipertahankan
+                snapshots[name] = rows
+
+        changed = False
+        with self._lock, self._conn:
+            for name, rows in snapshots.items():
+                old = [r[0] for r in self._conn.execute(
+                    "SELECT article_id FROM feed_entries WHERE feed = ? ORDER BY rank", (name,))]
+                self._conn.executemany("""
+                    INSERT INTO articles (id, title, author, created_at, views, likes, bookmarks)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        views = excluded.views, likes = excluded.likes, bookmarks = excluded.bookmarks
+                """, [(r[0], r[1], r[2], r[6], r[3], r[4], r[5]) for r in rows])
+                self._conn.execute("DELETE FROM feed_entries WHERE feed = ?", (name,))
+                self._conn.executemany("INSERT INTO feed_entries VALUES (?, ?, ?)",
+                                       [(name, rank, r[0]) for rank, r in enumerate(rows)])
+                changed = changed or old != [r[0] for r in rows]
+        return changed
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# ---------- Replica aktif (satu per proses) ----------
+_replica: Optional[LocalReplica] = None
+
+
+def open_replica(username: str, path: str = "news_replica.db") -> LocalReplica:
+    global _replica
+    if _replica is None or _replica.username != username:
+        close_replica()
+        _replica = LocalReplica(username, path)
+    return _replica
+
+
+def current() -> Optional[LocalReplica]:
+    return _replica
+
+
+def close_replica():
+    global _replica
+    if _replica is not None:
+        _replica.close()
+        _replica = None
+
+
+# ---------- Write offline-aware ----------
+def _offline_aware(fn, op: str):
+    """
+    Online: write langsung (via query_cache). Offline, atau write gagal karena
+    koneksi: simpan di outbox dan return True (UI langsung ter-update).
+    """
+    def wrapper(article_id: int, username: str) -> bool:
+        replica = _replica
+        if replica is None or replica.username != username:
+            return fn(article_id, username)
+        if replica.online is not False:
+            if fn(article_id, username):
+                replica.record_local(op, article_id)
+                return True
+            if replica.check_online():
+                return False  # online: memang tidak berubah (sudah like, dst.)
+        replica.enqueue(op, article_id)
+        return True
+    wrapper.__name__ = fn.__name__
+    wrapper.__doc__ = fn.__doc__
+    return wrapper
+
+
+like_article = _offline_aware(query_cache.like_article, "like")
+unlike_article = _offline_aware(query_cache.unlike_article, "unlike")
+bookmark_article = _offline_aware(query_cache.bookmark_article, "bookmark")
+unbookmark_article = _offline_aware(query_cache.unbookmark_article, "unbookmark")
+
+
+def enqueue_view(article_id: int, username: Optional[str]) -> bool:
+    """Simpan view di outbox replica user tsb. False jika tidak ada replica."""
+    replica = _replica
+    if replica is None or not username or replica.username != username:
+        return False
+    replica.enqueue("view", article_id)
+    return True
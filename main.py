@@ -1,7 +1,18 @@
 # main.py — Launcher untuk Crypto Insight dengan TikTok Style Auth UI
+import importlib
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from PyQt5 import QtCore, QtGui, QtWidgets
-from PyQt5.QtCore import QTimer
+from PyQt5.QtCore import QTimer, pyqtSignal
+
+# Modul UI yang di-import di background selama splash tampil
+UI_MODULES = ("auth_ui_tiktok_style", "dashboard_ui", "user_dashboard",
+              "penerbit_dashboard", "admin_dashboard")
+POOL_WARM_SIZE = 3          # satu koneksi per feed yang di-prefetch
+STARTUP_TIMEOUT_MS = 15000  # splash tidak menunggu lebih lama dari ini
 
 class SplashScreen(QtWidgets.QWidget):
     """Splash screen dengan animasi loading"""
@@ -49,6 +60,7 @@ class SplashScreen(QtWidgets.QWidget):
         
         # Dots animation
         self.dots = 0
+        self.status = "Loading"
         self.loading_timer = QTimer(self)
         self.loading_timer.timeout.connect(self._update_loading)
         self.loading_timer.start(400)
@@ -103,7 +115,107 @@ class SplashScreen(QtWidgets.QWidget):
         """Update loading animation"""
         self.dots = (self.dots + 1) % 4
         dots_text = "." * self.dots
-        self.loading_label.setText(f"Loading{dots_text}")
+        self.loading_label.setText(f"{self.status}{dots_text}")
+
+    def set_status(self, text: str):
+        self.status = text
+        self.loading_label.setText(text)
+
+
+class StartupPipeline(QtCore.QObject):
+    """
+    Startup berbasis readiness: import modul UI, load config + warm pool
+    koneksi, cek schema, lalu prefetch feed publik, paralel di background.
+    finished(db_ready) dikirim saat semua selesai; splash ditutup saat itu.
+    """
+    phase_started = pyqtSignal(str)
+    phase_finished = pyqtSignal(str, float)   # nama phase, durasi ms
+    finished = pyqtSignal(bool)
+
+    def __init__(self):
+        super().__init__()
+        self.started_at = time.perf_counter()
+        self.db_ready = False
+        self.import_error = None
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True, name="Startup").start()
+
+    def _timed(self, name: str, fn):
+        self.phase_started.emit(name)
+        t0 = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            self.phase_finished.emit(name, (time.perf_counter() - t0) * 1000)
+
+    def _run(self):
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="Startup") as executor:
+            imports = executor.submit(self._timed, "imports", self._import_modules)
+            database = executor.submit(self._prepare_database)
+            for future in (imports, database):
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"⚠️ Startup step failed: {e}")
+        self.finished.emit(self.db_ready)
+
+    def _import_modules(self):
+        for name in UI_MODULES:
+            try:
+                importlib.import_module(name)
+            except ImportError as e:
+                if name == "auth_ui_tiktok_style":
+                    self.import_error = e
+                print(f"⚠️ Failed to import {name}: {e}")
+
+    def _prepare_database(self):
+        app_db = self._timed("config", lambda: importlib.import_module("app_db_fixed"))
+        opened = self._timed("pool", lambda: app_db.warm_pool(POOL_WARM_SIZE))
+        if not opened:
+            return
+        if not self._timed("schema", app_db.ensure_schema):
+            return
+        self.db_ready = True
+        self._timed("feed", self._prefetch_feeds)
+
+    def _prefetch_feeds(self):
+        """Isi query_cache dengan feed yang sama yang dibaca dashboard user."""
+        from local_replica import FEEDS
+        with ThreadPoolExecutor(max_workers=len(FEEDS), thread_name_prefix="Prefetch") as executor:
+            for future in [executor.submit(fetch) for fetch in FEEDS.values()]:
+                future.result()
+
+
+PHASE_LABELS = {
+    "imports": "Loading modules",
+    "config": "Loading config",
+    "pool": "Connecting",
+    "schema": "Checking database",
+    "feed": "Fetching news",
+}
+
+def _show_import_error(e):
+    msg = QtWidgets.QMessageBox()
+    msg.setIcon(QtWidgets.QMessageBox.Critical)
+    msg.setWindowTitle("Import Error")
+    msg.setText(f"Failed to import required modules:\n\n{str(e)}\n\n"
+               "Required files:\n"
+               "- auth_ui_tiktok_style.py\n"
+               "- app_db_fixed.py\n"
+               "- modern_notification.py\n"
+               "- dashboard_ui.py\n"
+               "- user_dashboard.py")
+    msg.exec_()
+
+
+def _show_error(e):
+    msg = QtWidgets.QMessageBox()
+    msg.setIcon(QtWidgets.QMessageBox.Critical)
+    msg.setWindowTitle("Error")
+    msg.setText(f"An error occurred:\n\n{str(e)}")
+    msg.exec_()
+
 
 def main():
     """Launch TikTok Style Auth UI"""
@@ -114,9 +226,6 @@ def main():
     app.setFont(QtGui.QFont("Segoe UI", 10))
     
     try:
-        # Import TikTok Style Auth Window
-        from auth_ui_tiktok_style import TikTokAuthWindow
-        
         # Create splash screen
         splash = SplashScreen()
         
@@ -128,12 +237,48 @@ def main():
         # Show splash
         splash.show()
         
-        # Create main window
-        main_window = TikTokAuthWindow()
+        pipeline = StartupPipeline()
+        state = {"window": None, "scheduler": None}
+        
+        def on_phase_started(name):
+            splash.set_status(PHASE_LABELS.get(name, "Loading"))
+        
+        def on_phase_finished(name, ms):
+            print(f"⏱️ Startup {name}: {ms:.0f} ms")
         
-        # Function to switch windows
-        def show_main_window():
+        def start_scheduler():
+            # Background DB maintenance (refresh ranking materialized views)
+            if state["scheduler"] is None:
+                from db_maintenance import MaintenanceScheduler
+                scheduler = MaintenanceScheduler()
+                scheduler.start()
+                state["scheduler"] = scheduler
+        
+        # Function to switch windows (slot: errors are shown here, not raised)
+        def show_main_window(db_ready, db_pending=False):
+            if state["window"] is not None:
+                # Pipeline selesai setelah timeout: window sudah tampil
+                state["window"].set_db_ready(db_ready)
+                if db_ready:
+                    start_scheduler()
+                return
             splash.loading_timer.stop()
+            try:
+                if pipeline.import_error is not None:
+                    raise pipeline.import_error
+                from auth_ui_tiktok_style import TikTokAuthWindow
+                main_window = TikTokAuthWindow(db_ready=db_ready, db_pending=db_pending)
+            except ImportError as e:
+                splash.close()
+                _show_import_error(e)
+                app.exit(1)
+                return
+            except Exception as e:
+                splash.close()
+                _show_error(e)
+                app.exit(1)
+                return
+            state["window"] = main_window
             splash.close()
             
             # Center main window
@@ -142,32 +287,40 @@ def main():
             main_window.move(center_pos)
             
             main_window.show()
-
-        # Switch after 2.5 seconds
-        QTimer.singleShot(2500, show_main_window)
+            total = (time.perf_counter() - pipeline.started_at) * 1000
+            print(f"🚀 Startup ready in {total:.0f} ms")
+            
+            if db_ready:
+                start_scheduler()
+        
+        def on_timeout():
+            if state["window"] is None:
+                print(f"⚠️ Startup not ready after {STARTUP_TIMEOUT_MS} ms, continuing")
+                show_main_window(False, db_pending=True)
+        
+        def on_quit():
+            if state["scheduler"] is not None:
+                state["scheduler"].stop()
+            if "app_db_fixed" in sys.modules:
+                sys.modules["app_db_fixed"].close_pool()
+        
+        pipeline.phase_started.connect(on_phase_started)
+        pipeline.phase_finished.connect(on_phase_finished)
+        pipeline.finished.connect(show_main_window)
+        app.aboutToQuit.connect(on_quit)
+        
+        # Switch as soon as startup is ready (with a safety timeout)
+        QTimer.singleShot(STARTUP_TIMEOUT_MS, on_timeout)
+        pipeline.start()
         
         sys.exit(app.exec_())
         
     except ImportError as e:
-        msg = QtWidgets.QMessageBox()
-        msg.setIcon(QtWidgets.QMessageBox.Critical)
-        msg.setWindowTitle("Import Error")
-        msg.setText(f"Failed to import required modules:\n\n{str(e)}\n\n"
-                   "Required files:\n"
-                   "- auth_ui_tiktok_style.py\n"
-                   "- app_db_fixed.py\n"
-                   "- modern_notification.py\n"
-                   "- dashboard_ui.py\n"
-                   "- user_dashboard.py")
-        msg.exec_()
+        _show_import_error(e)
         sys.exit(1)
         
     except Exception as e:
-        msg = QtWidgets.QMessageBox()
-        msg.setIcon(QtWidgets.QMessageBox.Critical)
-        msg.setWindowTitle("Error")
-        msg.setText(f"An error occurred:\n\n{str(e)}")
-        msg.exec_()
+        _show_error(e)
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -0,0 +1,176 @@
+-- ============================================
+-- CRYPTO INSIGHT - PHASE 10 MIGRATION
+-- Compact storage layout for interaction tables
+-- ============================================
+--
+-- Run this script in your Railway PostgreSQL console
+-- Or using psql: psql $DATABASE_URL -f migration_phase10_compact_storage.sql
+-- Or: python run_migration_auto.py migration_phase10_compact_storage.sql
+--
+-- Requires migration_phase9_views_partitioning.sql.
+--
+-- - article_likes / article_bookmarks: kolom id (SERIAL) dihapus,
+--   PRIMARY KEY = (article_id, username) menggantikan UNIQUE(article_id, username)
+-- - article_views: kolom id dihapus, ip_address VARCHAR(50) -> inet
+--   (NULL jika tidak diketahui, bukan '0.0.0.0')
+-- - Index waktu b-tree pada tabel append-only diganti BRIN
+--
+-- Ukur efeknya dengan: python benchmark_storage.py
+-- (jalankan sebelum dan sesudah migrasi untuk ukuran tabel di database ini)
+--
+-- user_sessions tidak diubah: id dipakai aplikasi (touch/close session)
+-- dan last_seen di-UPDATE terus, jadi tidak append-ordered.
+--
+-- ============================================
+
+BEGIN;
+
+-- ============================================
+-- 1. ARTICLE LIKES
+-- ============================================
+
+ALTER TABLE article_likes DROP COLUMN IF EXISTS id;
+-- Index milik constraint UNIQUE tidak bisa di-promote (USING INDEX):
+-- ganti constraint-nya dengan PRIMARY KEY pada kolom yang sama
+ALTER TABLE article_likes DROP CONSTRAINT IF EXISTS article_likes_article_id_username_key;
+ALTER TABLE article_likes ADD CONSTRAINT article_likes_pkey PRIMARY KEY (article_id, username);
+
+-- liked_at hanya bertambah (insert), cukup BRIN
+DROP INDEX IF EXISTS idx_article_likes_time;
+CREATE INDEX IF NOT EXISTS idx_article_likes_time_brin
+    ON article_likes USING BRIN (liked_at);
+
+-- ============================================
+-- 2. ARTICLE BOOKMARKS
+-- ============================================
+
+ALTER TABLE article_bookmarks DROP COLUMN IF EXISTS id;
+-- Index milik constraint UNIQUE tidak bisa di-promote (USING INDEX):
+-- ganti constraint-nya dengan PRIMARY KEY pada kolom yang sama
+ALTER TABLE article_bookmarks DROP CONSTRAINT IF EXISTS article_bookmarks_article_id_username_key;
+ALTER TABLE article_bookmarks ADD CONSTRAINT article_bookmarks_pkey PRIMARY KEY (article_id, username);
+
+DROP INDEX IF EXISTS idx_bookmarks_time;
+CREATE INDEX IF NOT EXISTS idx_bookmarks_time_brin
+    ON article_bookmarks USING BRIN (bookmarked_at);
+
+-- ============================================
+-- 3. ARTICLE VIEWS
+-- ============================================
+
+-- IP tidak valid / '0.0.0.0' (default lama) -> NULL
+CREATE OR REPLACE FUNCTION try_inet(p_value TEXT)
+RETURNS inet AS $$
+BEGIN
+    IF p_value IS NULL OR p_value IN ('', '0.0.0.0') THEN
+        RETURN NULL;
+    END IF;
+    RETURN p_value::inet;
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+-- View bergantung pada ip_address: drop dulu, dibuat ulang di bawah
+DROP VIEW IF EXISTS article_views_by_day;
+
+ALTER TABLE article_views DROP COLUMN IF EXISTS id;
+ALTER TABLE article_views ALTER COLUMN ip_address DROP DEFAULT;
+ALTER TABLE article_views ALTER COLUMN ip_address TYPE inet USING try_inet(ip_address);
+
+CREATE INDEX IF NOT EXISTS idx_article_views_time_brin
+    ON article_views USING BRIN (viewed_at);
+
+-- Unique viewer = username, atau IP untuk anonymous
+CREATE OR REPLACE FUNCTION maintain_article_views(p_retention_months INTEGER DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    v_retention INTEGER := COALESCE(p_retention_months, app_setting('views.retention_months', 6)::INTEGER);
+    v_cutoff DATE := (date_trunc('month', NOW() AT TIME ZONE 'UTC') - make_interval(months => v_retention))::date;
+    v_month DATE;
+    v_dropped INTEGER := 0;
+    r RECORD;
+BEGIN
+    FOR r IN
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'article_views'::regclass
+        AND c.relname ~ '^article_views_p[0-9]{4}_[0-9]{2}$'
+        ORDER BY c.relname
+    LOOP
+        v_month := to_date(substr(r.relname, 16), 'YYYY_MM');
+        EXIT WHEN v_month >= v_cutoff;
+
+        EXECUTE format($sql$
+            INSERT INTO article_views_daily (article_id, day, views, unique_viewers)
+            SELECT article_id,
+                   (viewed_at AT TIME ZONE 'UTC')::date,
+                   COUNT(*),
+                   COUNT(DISTINCT COALESCE(username, host(ip_address)))
+            FROM %I
+            GROUP BY 1, 2
+            ON CONFLICT (article_id, day) DO UPDATE
+            SET views = EXCLUDED.views, unique_viewers = EXCLUDED.unique_viewers
+        $sql$, r.relname);
+
+        UPDATE article_views_rollup_state
+        SET rolled_up_until = GREATEST(rolled_up_until,
+                                       (v_month + INTERVAL '1 month')::timestamp AT TIME ZONE 'UTC');
+
+        EXECUTE format('ALTER TABLE article_views DETACH PARTITION %I', r.relname);
+        EXECUTE format('DROP TABLE %I', r.relname);
+        v_dropped := v_dropped + 1;
+    END LOOP;
+    RETURN v_dropped;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE VIEW article_views_by_day AS
+SELECT article_id, day, views, unique_viewers
+FROM article_views_daily
+UNION ALL
+SELECT v.article_id,
+       (v.viewed_at AT TIME ZONE 'UTC')::date AS day,
+       COUNT(*)::INTEGER AS views,
+       COUNT(DISTINCT COALESCE(v.username, host(v.ip_address)))::INTEGER AS unique_viewers
+FROM article_views v
+WHERE v.viewed_at >= (SELECT rolled_up_until FROM article_views_rollup_state)
+GROUP BY 1, 2;
+
+COMMIT;
+
+-- Statistik baru untuk planner setelah perubahan layout
+ANALYZE article_likes;
+ANALYZE article_bookmarks;
+ANALYZE article_views;
+
+-- ============================================
+-- ROLLBACK SCRIPT
+-- ============================================
+/*
+-- Nilai id lama tidak dikembalikan (dibuat ulang berurutan).
+BEGIN;
+DROP INDEX IF EXISTS idx_article_likes_time_brin;
+DROP INDEX IF EXISTS idx_bookmarks_time_brin;
+DROP INDEX IF EXISTS idx_article_views_time_brin;
+CREATE INDEX IF NOT EXISTS idx_article_likes_time ON article_likes(liked_at DESC);
+CREATE INDEX IF NOT EXISTS idx_bookmarks_time ON article_bookmarks(bookmarked_at DESC);
+
+ALTER TABLE article_likes DROP CONSTRAINT article_likes_pkey;
+ALTER TABLE article_likes ADD COLUMN id SERIAL PRIMARY KEY;
+ALTER TABLE article_likes ADD CONSTRAINT article_likes_article_id_username_key UNIQUE (article_id, username);
+
+ALTER TABLE article_bookmarks DROP CONSTRAINT article_bookmarks_pkey;
+ALTER TABLE article_bookmarks ADD COLUMN id SERIAL PRIMARY KEY;
+ALTER TABLE article_bookmarks ADD CONSTRAINT article_bookmarks_article_id_username_key UNIQUE (article_id, username);
+
+DROP VIEW IF EXISTS article_views_by_day;
+ALTER TABLE article_views ALTER COLUMN ip_address TYPE VARCHAR(50)
+    USING COALESCE(host(ip_address), '0.0.0.0');
+ALTER TABLE article_views ALTER COLUMN ip_address SET DEFAULT '0.0.0.0';
+ALTER TABLE article_views ADD COLUMN id BIGSERIAL;
+-- lalu jalankan ulang bagian 6 (view) + maintain_article_views dari
+-- migration_phase9_views_partitioning.sql
+COMMIT;
+*/
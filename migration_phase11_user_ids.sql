@@ -0,0 +1,245 @@
+-- ============================================
+-- CRYPTO INSIGHT - PHASE 11 MIGRATION
+-- Integer user ids in interaction tables (expand step, dual-write)
+-- ============================================
+--
+-- Run this script in your Railway PostgreSQL console
+-- Or using psql: psql $DATABASE_URL -f migration_phase11_user_ids.sql
+-- Or: python run_migration_auto.py migration_phase11_user_ids.sql
+--
+-- Requires PostgreSQL 13+ and migration_phase10_compact_storage.sql.
+--
+-- Rollout:
+--   1. Jalankan migrasi ini (kolom user_id / author_id + backfill + trigger)
+--   2. Update semua client ke versi yang membaca/menulis user_id
+--   3. Jalankan migration_phase12_drop_username_refs.sql (hapus kolom
+--      username + index string)
+--
+-- Selama langkah 2, trigger sync_user_ref() mengisi kolom yang tidak
+-- ditulis: client lama menulis username -> user_id terisi, client baru
+-- menulis user_id -> username terisi. Keduanya bisa jalan bersamaan.
+--
+-- news.author tetap ada (nama yang ditampilkan); author_id untuk filter/join.
+--
+-- ============================================
+
+BEGIN;
+
+-- ============================================
+-- 1. NEW COLUMNS
+-- ============================================
+
+ALTER TABLE article_likes
+    ADD COLUMN IF NOT EXISTS user_id INTEGER REFERENCES users(id) ON DELETE CASCADE;
+ALTER TABLE article_bookmarks
+    ADD COLUMN IF NOT EXISTS user_id INTEGER REFERENCES users(id) ON DELETE CASCADE;
+ALTER TABLE article_views
+    ADD COLUMN IF NOT EXISTS user_id INTEGER REFERENCES users(id) ON DELETE SET NULL;
+ALTER TABLE user_sessions
+    ADD COLUMN IF NOT EXISTS user_id INTEGER REFERENCES users(id) ON DELETE CASCADE;
+ALTER TABLE news
+    ADD COLUMN IF NOT EXISTS author_id INTEGER REFERENCES users(id) ON DELETE SET NULL;
+
+-- ============================================
+-- 2. BACKFILL
+-- ============================================
+
+UPDATE article_likes t SET user_id = u.id
+FROM users u WHERE u.username = t.username AND t.user_id IS NULL;
+
+UPDATE article_bookmarks t SET user_id = u.id
+FROM users u WHERE u.username = t.username AND t.user_id IS NULL;
+
+UPDATE article_views t SET user_id = u.id
+FROM users u WHERE u.username = t.username AND t.user_id IS NULL;
+
+UPDATE user_sessions t SET user_id = u.id
+FROM users u WHERE u.username = t.username AND t.user_id IS NULL;
+
+-- author bebas teks: hanya yang cocok dengan user terisi
+UPDATE news n SET author_id = u.id
+FROM users u WHERE u.username = n.author AND n.author_id IS NULL;
+
+-- ============================================
+-- 3. DUAL-WRITE TRIGGERS
+-- ============================================
+
+CREATE OR REPLACE FUNCTION sync_user_ref()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.user_id IS NULL AND NEW.username IS NOT NULL THEN
+        SELECT id INTO NEW.user_id FROM users WHERE username = NEW.username;
+    ELSIF NEW.username IS NULL AND NEW.user_id IS NOT NULL THEN
+        SELECT username INTO NEW.username FROM users WHERE id = NEW.user_id;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_article_likes_sync_user ON article_likes;
+CREATE TRIGGER trg_article_likes_sync_user
+    BEFORE INSERT ON article_likes
+    FOR EACH ROW EXECUTE FUNCTION sync_user_ref();
+
+DROP TRIGGER IF EXISTS trg_article_bookmarks_sync_user ON article_bookmarks;
+CREATE TRIGGER trg_article_bookmarks_sync_user
+    BEFORE INSERT ON article_bookmarks
+    FOR EACH ROW EXECUTE FUNCTION sync_user_ref();
+
+DROP TRIGGER IF EXISTS trg_article_views_sync_user ON article_views;
+CREATE TRIGGER trg_article_views_sync_user
+    BEFORE INSERT ON article_views
+    FOR EACH ROW EXECUTE FUNCTION sync_user_ref();
+
+DROP TRIGGER IF EXISTS trg_user_sessions_sync_user ON user_sessions;
+CREATE TRIGGER trg_user_sessions_sync_user
+    BEFORE INSERT ON user_sessions
+    FOR EACH ROW EXECUTE FUNCTION sync_user_ref();
+
+-- news: author_id dari author (client lama hanya menulis author)
+CREATE OR REPLACE FUNCTION sync_news_author()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.author_id IS NULL THEN
+        SELECT id INTO NEW.author_id FROM users WHERE username = NEW.author;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_news_sync_author ON news;
+CREATE TRIGGER trg_news_sync_author
+    BEFORE INSERT ON news
+    FOR EACH ROW EXECUTE FUNCTION sync_news_author();
+
+-- ============================================
+-- 4. INTEGER INDEXES
+-- ============================================
+
+-- like_article(): ON CONFLICT (article_id, user_id); jadi PRIMARY KEY di phase 12
+CREATE UNIQUE INDEX IF NOT EXISTS idx_article_likes_article_user_id
+    ON article_likes(article_id, user_id);
+
+-- get_user_liked_articles(): WHERE user_id = ? ORDER BY liked_at DESC
+CREATE INDEX IF NOT EXISTS idx_article_likes_user_id_time
+    ON article_likes(user_id, liked_at DESC)
+    INCLUDE (article_id);
+
+-- get_article_likers(): WHERE article_id = ? ORDER BY liked_at DESC (+ JOIN users)
+CREATE INDEX IF NOT EXISTS idx_article_likes_article_time_uid
+    ON article_likes(article_id, liked_at DESC)
+    INCLUDE (user_id);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_bookmarks_article_user_id
+    ON article_bookmarks(article_id, user_id);
+
+-- get_user_bookmarked_articles(): WHERE user_id = ? ORDER BY bookmarked_at DESC
+CREATE INDEX IF NOT EXISTS idx_bookmarks_user_id_time
+    ON article_bookmarks(user_id, bookmarked_at DESC)
+    INCLUDE (article_id);
+
+-- latest_presence_per_user(): MAX(last_seen) per user_id + status check
+CREATE INDEX IF NOT EXISTS idx_user_sessions_user_id_last_seen
+    ON user_sessions(user_id, last_seen DESC)
+    INCLUDE (status);
+
+-- list_my_news(): WHERE author_id = ? ORDER BY created_at DESC
+CREATE INDEX IF NOT EXISTS idx_news_author_id_created
+    ON news(author_id, created_at DESC)
+    INCLUDE (id, title, status);
+
+-- get_author_summary() / get_penerbit_stats(): WHERE author_id = ? GROUP BY status
+CREATE INDEX IF NOT EXISTS idx_news_author_id_status
+    ON news(author_id, status)
+    INCLUDE (id, views, like_count, bookmark_count);
+
+-- ============================================
+-- 5. VIEW ROLLUPS: unique viewer = user_id, atau IP untuk anonymous
+-- ============================================
+
+CREATE OR REPLACE FUNCTION maintain_article_views(p_retention_months INTEGER DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    v_retention INTEGER := COALESCE(p_retention_months, app_setting('views.retention_months', 6)::INTEGER);
+    v_cutoff DATE := (date_trunc('month', NOW() AT TIME ZONE 'UTC') - make_interval(months => v_retention))::date;
+    v_month DATE;
+    v_dropped INTEGER := 0;
+    r RECORD;
+BEGIN
+    FOR r IN
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'article_views'::regclass
+        AND c.relname ~ '^article_views_p[0-9]{4}_[0-9]{2}$'
+        ORDER BY c.relname
+    LOOP
+        v_month := to_date(substr(r.relname, 16), 'YYYY_MM');
+        EXIT WHEN v_month >= v_cutoff;
+
+        EXECUTE format($sql$
+            INSERT INTO article_views_daily (article_id, day, views, unique_viewers)
+            SELECT article_id,
+                   (viewed_at AT TIME ZONE 'UTC')::date,
+                   COUNT(*),
+                   COUNT(DISTINCT COALESCE(user_id::text, host(ip_address)))
+            FROM %I
+            GROUP BY 1, 2
+            ON CONFLICT (article_id, day) DO UPDATE
+            SET views = EXCLUDED.views, unique_viewers = EXCLUDED.unique_viewers
+        $sql$, r.relname);
+
+        UPDATE article_views_rollup_state
+        SET rolled_up_until = GREATEST(rolled_up_until,
+                                       (v_month + INTERVAL '1 month')::timestamp AT TIME ZONE 'UTC');
+
+        EXECUTE format('ALTER TABLE article_views DETACH PARTITION %I', r.relname);
+        EXECUTE format('DROP TABLE %I', r.relname);
+        v_dropped := v_dropped + 1;
+    END LOOP;
+    RETURN v_dropped;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE VIEW article_views_by_day AS
+SELECT article_id, day, views, unique_viewers
+FROM article_views_daily
+UNION ALL
+SELECT v.article_id,
+       (v.viewed_at AT TIME ZONE 'UTC')::date AS day,
+       COUNT(*)::INTEGER AS views,
+       COUNT(DISTINCT COALESCE(v.user_id::text, host(v.ip_address)))::INTEGER AS unique_viewers
+FROM article_views v
+WHERE v.viewed_at >= (SELECT rolled_up_until FROM article_views_rollup_state)
+GROUP BY 1, 2;
+
+COMMIT;
+
+ANALYZE article_likes;
+ANALYZE article_bookmarks;
+ANALYZE user_sessions;
+ANALYZE news;
+
+-- ============================================
+-- ROLLBACK SCRIPT
+-- ============================================
+/*
+-- Hanya sebelum migration_phase12_drop_username_refs.sql.
+-- Jalankan ulang bagian 5 dari migration_phase10_compact_storage.sql
+-- (maintain_article_views + article_views_by_day versi username).
+BEGIN;
+DROP VIEW IF EXISTS article_views_by_day;
+DROP TRIGGER IF EXISTS trg_article_likes_sync_user ON article_likes;
+DROP TRIGGER IF EXISTS trg_article_bookmarks_sync_user ON article_bookmarks;
+DROP TRIGGER IF EXISTS trg_article_views_sync_user ON article_views;
+DROP TRIGGER IF EXISTS trg_user_sessions_sync_user ON user_sessions;
+DROP TRIGGER IF EXISTS trg_news_sync_author ON news;
+DROP FUNCTION IF EXISTS sync_user_ref();
+DROP FUNCTION IF EXISTS sync_news_author();
+ALTER TABLE article_likes DROP COLUMN IF EXISTS user_id;
+ALTER TABLE article_bookmarks DROP COLUMN IF EXISTS user_id;
+ALTER TABLE article_views DROP COLUMN IF EXISTS user_id;
+ALTER TABLE user_sessions DROP COLUMN IF EXISTS user_id;
+ALTER TABLE news DROP COLUMN IF EXISTS author_id;
+COMMIT;
+*/
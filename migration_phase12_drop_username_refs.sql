@@ -0,0 +1,123 @@
+-- ============================================
+-- CRYPTO INSIGHT - PHASE 12 MIGRATION
+-- Drop username references from interaction tables (contract step)
+-- ============================================
+--
+-- Run this script in your Railway PostgreSQL console
+-- Or using psql: psql $DATABASE_URL -f migration_phase12_drop_username_refs.sql
+-- Or: python run_migration_auto.py migration_phase12_drop_username_refs.sql
+--
+-- Jalankan SETELAH semua client memakai versi yang menulis user_id
+-- (lihat migration_phase11_user_ids.sql). Client lama yang masih menulis
+-- username akan gagal setelah migrasi ini.
+--
+-- - article_likes / article_bookmarks: PRIMARY KEY (article_id, user_id),
+--   kolom username + index string dihapus
+-- - article_views: kolom username dihapus
+-- - user_sessions: user_id NOT NULL, index username dihapus
+--   (kolom username tetap sebagai label, ditulis oleh start_session)
+-- - news: index author (string) dihapus; author tetap sebagai nama tampilan
+--
+-- ============================================
+
+BEGIN;
+
+-- Semua baris harus sudah punya user_id (lihat backfill phase 11)
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM article_likes WHERE user_id IS NULL)
+       OR EXISTS (SELECT 1 FROM article_bookmarks WHERE user_id IS NULL)
+       OR EXISTS (SELECT 1 FROM user_sessions WHERE user_id IS NULL) THEN
+        RAISE EXCEPTION '❌ Rows without user_id found; re-run the backfill from phase 11 first';
+    END IF;
+END $$;
+
+-- ============================================
+-- 1. ARTICLE LIKES
+-- ============================================
+
+DROP TRIGGER IF EXISTS trg_article_likes_sync_user ON article_likes;
+ALTER TABLE article_likes ALTER COLUMN user_id SET NOT NULL;
+ALTER TABLE article_likes DROP CONSTRAINT article_likes_pkey;
+ALTER TABLE article_likes
+    ADD CONSTRAINT article_likes_pkey PRIMARY KEY
+    USING INDEX idx_article_likes_article_user_id;
+DROP INDEX IF EXISTS idx_article_likes_user_time;
+DROP INDEX IF EXISTS idx_article_likes_article_time;
+ALTER TABLE article_likes DROP COLUMN username;
+
+-- ============================================
+-- 2. ARTICLE BOOKMARKS
+-- ============================================
+
+DROP TRIGGER IF EXISTS trg_article_bookmarks_sync_user ON article_bookmarks;
+ALTER TABLE article_bookmarks ALTER COLUMN user_id SET NOT NULL;
+ALTER TABLE article_bookmarks DROP CONSTRAINT article_bookmarks_pkey;
+ALTER TABLE article_bookmarks
+    ADD CONSTRAINT article_bookmarks_pkey PRIMARY KEY
+    USING INDEX idx_bookmarks_article_user_id;
+DROP INDEX IF EXISTS idx_bookmarks_user_time;
+ALTER TABLE article_bookmarks DROP COLUMN username;
+
+-- ============================================
+-- 3. ARTICLE VIEWS
+-- ============================================
+
+DROP TRIGGER IF EXISTS trg_article_views_sync_user ON article_views;
+ALTER TABLE article_views DROP COLUMN username;
+
+-- ============================================
+-- 4. USER SESSIONS
+-- ============================================
+
+ALTER TABLE user_sessions ALTER COLUMN user_id SET NOT NULL;
+DROP INDEX IF EXISTS idx_user_sessions_user_last_seen;
+
+-- ============================================
+-- 5. NEWS
+-- ============================================
+
+DROP INDEX IF EXISTS idx_news_author_created;
+DROP INDEX IF EXISTS idx_news_author_status;
+
+-- trg_user_sessions_sync_user (phase 11) tetap: user_sessions masih punya username
+
+COMMIT;
+
+VACUUM ANALYZE article_likes;
+VACUUM ANALYZE article_bookmarks;
+ANALYZE user_sessions;
+ANALYZE news;
+
+-- ============================================
+-- ROLLBACK SCRIPT
+-- ============================================
+/*
+-- Kolom username diisi ulang dari users.
+BEGIN;
+ALTER TABLE article_likes ADD COLUMN username VARCHAR(100) REFERENCES users(username) ON DELETE CASCADE;
+UPDATE article_likes t SET username = u.username FROM users u WHERE u.id = t.user_id;
+ALTER TABLE article_likes ALTER COLUMN username SET NOT NULL;
+CREATE INDEX idx_article_likes_user_time ON article_likes(username, liked_at DESC) INCLUDE (article_id);
+CREATE INDEX idx_article_likes_article_time ON article_likes(article_id, liked_at DESC) INCLUDE (username);
+
+ALTER TABLE article_bookmarks ADD COLUMN username VARCHAR(100) REFERENCES users(username) ON DELETE CASCADE;
+UPDATE article_bookmarks t SET username = u.username FROM users u WHERE u.id = t.user_id;
+ALTER TABLE article_bookmarks ALTER COLUMN username SET NOT NULL;
+CREATE INDEX idx_bookmarks_user_time ON article_bookmarks(username, bookmarked_at DESC) INCLUDE (article_id);
+
+ALTER TABLE article_views ADD COLUMN username VARCHAR(100) REFERENCES users(username) ON DELETE SET NULL;
+UPDATE article_views t SET username = u.username FROM users u WHERE u.id = t.user_id;
+
+CREATE INDEX idx_user_sessions_user_last_seen ON user_sessions(username, last_seen DESC) INCLUDE (status);
+CREATE INDEX idx_news_author_created ON news(author, created_at DESC) INCLUDE (id, title, status);
+CREATE INDEX idx_news_author_status ON news(author, status) INCLUDE (id, views, like_count, bookmark_count);
+
+CREATE TRIGGER trg_article_likes_sync_user BEFORE INSERT ON article_likes
+    FOR EACH ROW EXECUTE FUNCTION sync_user_ref();
+CREATE TRIGGER trg_article_bookmarks_sync_user BEFORE INSERT ON article_bookmarks
+    FOR EACH ROW EXECUTE FUNCTION sync_user_ref();
+CREATE TRIGGER trg_article_views_sync_user BEFORE INSERT ON article_views
+    FOR EACH ROW EXECUTE FUNCTION sync_user_ref();
+COMMIT;
+*/
@@ -0,0 +1,219 @@
+-- ============================================
+-- CRYPTO INSIGHT - PHASE 13 MIGRATION
+-- Incremental daily analytics rollups (per article + per author)
+-- ============================================
+--
+-- Run this script in your Railway PostgreSQL console
+-- Or using psql: psql $DATABASE_URL -f migration_phase13_analytics_rollups.sql
+-- Or: python run_migration_auto.py migration_phase13_analytics_rollups.sql
+--
+-- Requires migration_phase11_user_ids.sql.
+--
+-- - article_daily_stats / author_daily_stats: views, unique viewers,
+--   likes, bookmarks per hari (UTC)
+-- - analytics_rollup(): proses event baru (views, likes, bookmarks) dalam
+--   window (watermark, batas] lalu geser watermark — dalam satu transaksi,
+--   jadi aman di-restart dan tidak pernah menghitung dua kali
+-- - batas = NOW() - analytics.rollup_lag_seconds, supaya transaksi yang
+--   belum commit (viewed_at = waktu mulai transaksi) tidak terlewat
+--
+-- Dijalankan berkala oleh db_maintenance.MaintenanceScheduler.
+-- Likes/bookmarks dihitung saat dibuat; unlike/unbookmark tidak mengurangi
+-- angka harian (total saat ini tetap di news.like_count / bookmark_count).
+--
+-- ============================================
+
+BEGIN;
+
+-- ============================================
+-- 1. TABLES
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS article_daily_stats (
+    article_id INTEGER NOT NULL REFERENCES news(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    views INTEGER NOT NULL DEFAULT 0,
+    unique_viewers INTEGER NOT NULL DEFAULT 0,
+    likes INTEGER NOT NULL DEFAULT 0,
+    bookmarks INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (article_id, day)
+);
+
+CREATE TABLE IF NOT EXISTS author_daily_stats (
+    author_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    views INTEGER NOT NULL DEFAULT 0,
+    unique_viewers INTEGER NOT NULL DEFAULT 0,
+    likes INTEGER NOT NULL DEFAULT 0,
+    bookmarks INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (author_id, day)
+);
+
+COMMENT ON TABLE article_daily_stats IS 'Daily per-article counters maintained by analytics_rollup()';
+COMMENT ON TABLE author_daily_stats IS 'Daily per-author counters maintained by analytics_rollup()';
+
+-- Semua event dengan timestamp <= watermark sudah masuk rollup
+CREATE TABLE IF NOT EXISTS rollup_watermarks (
+    name VARCHAR(100) PRIMARY KEY,
+    watermark TIMESTAMPTZ NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+INSERT INTO app_settings (key, value) VALUES
+    ('analytics.rollup_interval_seconds', 300),
+    ('analytics.rollup_lag_seconds', 120),
+    ('analytics.rollup_window_hours', 24)
+ON CONFLICT (key) DO NOTHING;
+
+-- ============================================
+-- 2. ROLLUP FUNCTION
+-- ============================================
+
+-- Proses satu window. Return (events, caught_up); panggil ulang sampai
+-- caught_up (setiap panggilan = satu transaksi pendek).
+CREATE OR REPLACE FUNCTION analytics_rollup(OUT events INTEGER, OUT caught_up BOOLEAN) AS $$
+DECLARE
+    v_limit TIMESTAMPTZ := NOW() - make_interval(secs => app_setting('analytics.rollup_lag_seconds', 120));
+    v_window INTERVAL := make_interval(hours => app_setting('analytics.rollup_window_hours', 24)::INTEGER);
+    v_from TIMESTAMPTZ;
+    v_to TIMESTAMPTZ;
+    v_day_start TIMESTAMPTZ;
+BEGIN
+    -- FOR UPDATE: dua rollup bersamaan tidak bisa memproses window yang sama
+    SELECT watermark INTO v_from
+    FROM rollup_watermarks WHERE name = 'analytics_daily'
+    FOR UPDATE;
+
+    v_to := LEAST(v_limit, v_from + v_window);
+    events := 0;
+    caught_up := v_to >= v_limit;
+    IF v_to <= v_from THEN
+        caught_up := TRUE;
+        RETURN;
+    END IF;
+
+    CREATE TEMP TABLE IF NOT EXISTS _rollup_events (
+        article_id INTEGER, author_id INTEGER, day DATE,
+        views INTEGER, likes INTEGER, bookmarks INTEGER
+    ) ON COMMIT DROP;
+    TRUNCATE _rollup_events;
+
+    INSERT INTO _rollup_events (article_id, author_id, day, views, likes, bookmarks)
+    SELECT e.article_id, n.author_id, e.day, SUM(e.views), SUM(e.likes), SUM(e.bookmarks)
+    FROM (
+        SELECT article_id, (viewed_at AT TIME ZONE 'UTC')::date AS day,
+               COUNT(*) AS views, 0 AS likes, 0 AS bookmarks
+        FROM article_views
+        WHERE viewed_at > v_from AND viewed_at <= v_to
+        GROUP BY 1, 2
+        UNION ALL
+        SELECT article_id, (liked_at AT TIME ZONE 'UTC')::date, 0, COUNT(*), 0
+        FROM article_likes
+        WHERE liked_at > v_from AND liked_at <= v_to
+        GROUP BY 1, 2
+        UNION ALL
+        SELECT article_id, (bookmarked_at AT TIME ZONE 'UTC')::date, 0, 0, COUNT(*)
+        FROM article_bookmarks
+        WHERE bookmarked_at > v_from AND bookmarked_at <= v_to
+        GROUP BY 1, 2
+    ) e
+    JOIN news n ON n.id = e.article_id
+    GROUP BY e.article_id, n.author_id, e.day;
+
+    SELECT COALESCE(SUM(views + likes + bookmarks), 0) INTO events FROM _rollup_events;
+
+    -- Counter: tambah delta window ini
+    INSERT INTO article_daily_stats AS s (article_id, day, views, likes, bookmarks)
+    SELECT article_id, day, views, likes, bookmarks FROM _rollup_events
+    ON CONFLICT (article_id, day) DO UPDATE
+    SET views = s.views + EXCLUDED.views,
+        likes = s.likes + EXCLUDED.likes,
+        bookmarks = s.bookmarks + EXCLUDED.bookmarks;
+
+    INSERT INTO author_daily_stats AS s (author_id, day, views, likes, bookmarks)
+    SELECT author_id, day, SUM(views), SUM(likes), SUM(bookmarks)
+    FROM _rollup_events
+    WHERE author_id IS NOT NULL
+    GROUP BY author_id, day
+    ON CONFLICT (author_id, day) DO UPDATE
+    SET views = s.views + EXCLUDED.views,
+        likes = s.likes + EXCLUDED.likes,
+        bookmarks = s.bookmarks + EXCLUDED.bookmarks;
+
+    -- Unique viewers tidak bisa dijumlah: hitung ulang hari yang tersentuh,
+    -- hanya untuk artikel yang punya view baru (idx_article_views_article_time)
+    v_day_start := (v_from AT TIME ZONE 'UTC')::date::timestamp AT TIME ZONE 'UTC';
+
+    UPDATE article_daily_stats s
+    SET unique_viewers = u.viewers
+    FROM (
+        SELECT v.article_id, (v.viewed_at AT TIME ZONE 'UTC')::date AS day,
+               COUNT(DISTINCT COALESCE(v.user_id::text, host(v.ip_address))) AS viewers
+        FROM article_views v
+        WHERE v.article_id IN (SELECT article_id FROM _rollup_events WHERE views > 0)
+        AND v.viewed_at >= v_day_start AND v.viewed_at <= v_to
+        GROUP BY 1, 2
+    ) u
+    WHERE s.article_id = u.article_id AND s.day = u.day;
+
+    UPDATE author_daily_stats s
+    SET unique_viewers = u.viewers
+    FROM (
+        SELECT n.author_id, (v.viewed_at AT TIME ZONE 'UTC')::date AS day,
+               COUNT(DISTINCT COALESCE(v.user_id::text, host(v.ip_address))) AS viewers
+        FROM article_views v
+        JOIN news n ON n.id = v.article_id
+        WHERE n.author_id IN (SELECT author_id FROM _rollup_events WHERE views > 0)
+        AND v.viewed_at >= v_day_start AND v.viewed_at <= v_to
+        GROUP BY 1, 2
+    ) u
+    WHERE s.author_id = u.author_id AND s.day = u.day;
+
+    UPDATE rollup_watermarks
+    SET watermark = v_to, updated_at = NOW()
+    WHERE name = 'analytics_daily';
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================
+-- 3. BACKFILL
+-- ============================================
+
+-- Hari yang raw view-nya sudah di-drop (phase 9): ambil dari article_views_daily
+INSERT INTO article_daily_stats (article_id, day, views, unique_viewers)
+SELECT article_id, day, views, unique_viewers
+FROM article_views_daily
+ON CONFLICT (article_id, day) DO NOTHING;
+
+INSERT INTO author_daily_stats (author_id, day, views)
+SELECT n.author_id, d.day, SUM(d.views)
+FROM article_views_daily d
+JOIN news n ON n.id = d.article_id
+WHERE n.author_id IS NOT NULL
+GROUP BY n.author_id, d.day
+ON CONFLICT (author_id, day) DO NOTHING;
+
+-- Watermark mulai tepat sebelum event raw paling awal; sisa history
+-- diproses oleh scheduler (window per window)
+INSERT INTO rollup_watermarks (name, watermark)
+SELECT 'analytics_daily',
+       COALESCE(LEAST((SELECT MIN(viewed_at) FROM article_views),
+                      (SELECT MIN(liked_at) FROM article_likes),
+                      (SELECT MIN(bookmarked_at) FROM article_bookmarks)),
+                NOW()) - INTERVAL '1 microsecond'
+ON CONFLICT (name) DO NOTHING;
+
+COMMIT;
+
+-- ============================================
+-- ROLLBACK SCRIPT
+-- ============================================
+/*
+BEGIN;
+DROP FUNCTION IF EXISTS analytics_rollup();
+DROP TABLE IF EXISTS article_daily_stats;
+DROP TABLE IF EXISTS author_daily_stats;
+DELETE FROM rollup_watermarks WHERE name = 'analytics_daily';
+DELETE FROM app_settings WHERE key LIKE 'analytics.%';
+COMMIT;
+*/
@@ -0,0 +1,118 @@
+-- ============================================
+-- CRYPTO INSIGHT - PHASE 14 MIGRATION
+-- HyperLogLog unique-viewer sketches in the daily rollups
+-- ============================================
+--
+-- Run this script in your Railway PostgreSQL console
+-- Or using psql: psql $DATABASE_URL -f migration_phase14_viewer_sketches.sql
+-- Or: python run_migration_auto.py migration_phase14_viewer_sketches.sql
+--
+-- Requires migration_phase13_analytics_rollups.sql.
+--
+-- - article_daily_stats / author_daily_stats: kolom viewers_hll (BYTEA,
+--   format hyperloglog.py). unique_viewers = estimasi dari sketch
+-- - analytics_rollup() tidak lagi menghitung COUNT(DISTINCT) ulang;
+--   sketch di-update oleh db_maintenance untuk window yang sama, di
+--   transaksi yang sama (watermark tetap satu)
+--
+-- Setelah migrasi, bangun sketch untuk hari-hari terakhir dari raw views:
+--     python db_maintenance.py backfill_sketches 35
+--
+-- ============================================
+
+BEGIN;
+
+ALTER TABLE article_daily_stats ADD COLUMN IF NOT EXISTS viewers_hll BYTEA;
+ALTER TABLE author_daily_stats ADD COLUMN IF NOT EXISTS viewers_hll BYTEA;
+
+-- Return type berubah (window_from / window_to): drop dulu
+DROP FUNCTION IF EXISTS analytics_rollup();
+
+-- Proses satu window. Return (events, caught_up, window_from, window_to);
+-- caller meng-update sketch untuk view di (window_from, window_to] lalu commit.
+CREATE FUNCTION analytics_rollup(OUT events INTEGER, OUT caught_up BOOLEAN,
+                                 OUT window_from TIMESTAMPTZ, OUT window_to TIMESTAMPTZ) AS $$
+DECLARE
+    v_limit TIMESTAMPTZ := NOW() - make_interval(secs => app_setting('analytics.rollup_lag_seconds', 120));
+    v_window INTERVAL := make_interval(hours => app_setting('analytics.rollup_window_hours', 24)::INTEGER);
+BEGIN
+    -- FOR UPDATE: dua rollup bersamaan tidak bisa memproses window yang sama
+    SELECT watermark INTO window_from
+    FROM rollup_watermarks WHERE name = 'analytics_daily'
+    FOR UPDATE;
+
+    window_to := LEAST(v_limit, window_from + v_window);
+    events := 0;
+    caught_up := window_to >= v_limit;
+    IF window_to <= window_from THEN
+        window_to := window_from;
+        caught_up := TRUE;
+        RETURN;
+    END IF;
+
+    CREATE TEMP TABLE IF NOT EXISTS _rollup_events (
+        article_id INTEGER, author_id INTEGER, day DATE,
+        views INTEGER, likes INTEGER, bookmarks INTEGER
+    ) ON COMMIT DROP;
+    TRUNCATE _rollup_events;
+
+    INSERT INTO _rollup_events (article_id, author_id, day, views, likes, bookmarks)
+    SELECT e.article_id, n.author_id, e.day, SUM(e.views), SUM(e.likes), SUM(e.bookmarks)
+    FROM (
+        SELECT article_id, (viewed_at AT TIME ZONE 'UTC')::date AS day,
+               COUNT(*) AS views, 0 AS likes, 0 AS bookmarks
+        FROM article_views
+        WHERE viewed_at > window_from AND viewed_at <= window_to
+        GROUP BY 1, 2
+        UNION ALL
+        SELECT article_id, (liked_at AT TIME ZONE 'UTC')::date, 0, COUNT(*), 0
+        FROM article_likes
+        WHERE liked_at > window_from AND liked_at <= window_to
+        GROUP BY 1, 2
+        UNION ALL
+        SELECT article_id, (bookmarked_at AT TIME ZONE 'UTC')::date, 0, 0, COUNT(*)
+        FROM article_bookmarks
+        WHERE bookmarked_at > window_from AND bookmarked_at <= window_to
+        GROUP BY 1, 2
+    ) e
+    JOIN news n ON n.id = e.article_id
+    GROUP BY e.article_id, n.author_id, e.day;
+
+    SELECT COALESCE(SUM(views + likes + bookmarks), 0) INTO events FROM _rollup_events;
+
+    INSERT INTO article_daily_stats AS s (article_id, day, views, likes, bookmarks)
+    SELECT article_id, day, views, likes, bookmarks FROM _rollup_events
+    ON CONFLICT (article_id, day) DO UPDATE
+    SET views = s.views + EXCLUDED.views,
+        likes = s.likes + EXCLUDED.likes,
+        bookmarks = s.bookmarks + EXCLUDED.bookmarks;
+
+    INSERT INTO author_daily_stats AS s (author_id, day, views, likes, bookmarks)
+    SELECT author_id, day, SUM(views), SUM(likes), SUM(bookmarks)
+    FROM _rollup_events
+    WHERE author_id IS NOT NULL
+    GROUP BY author_id, day
+    ON CONFLICT (author_id, day) DO UPDATE
+    SET views = s.views + EXCLUDED.views,
+        likes = s.likes + EXCLUDED.likes,
+        bookmarks = s.bookmarks + EXCLUDED.bookmarks;
+
+    UPDATE rollup_watermarks
+    SET watermark = window_to, updated_at = NOW()
+    WHERE name = 'analytics_daily';
+END;
+$$ LANGUAGE plpgsql;
+
+COMMIT;
+
+-- ============================================
+-- ROLLBACK SCRIPT
+-- ============================================
+/*
+-- Lalu jalankan ulang bagian 2 dari migration_phase13_analytics_rollups.sql
+BEGIN;
+DROP FUNCTION IF EXISTS analytics_rollup();
+ALTER TABLE article_daily_stats DROP COLUMN IF EXISTS viewers_hll;
+ALTER TABLE author_daily_stats DROP COLUMN IF EXISTS viewers_hll;
+COMMIT;
+*/
@@ -0,0 +1,81 @@
+-- ============================================
+-- CRYPTO INSIGHT - PHASE 15 MIGRATION
+-- Server-side dedupe guard for article views
+-- ============================================
+--
+-- Run this script in your Railway PostgreSQL console
+-- Or using psql: psql $DATABASE_URL -f migration_phase15_view_guard.sql
+-- Or: python run_migration_auto.py migration_phase15_view_guard.sql
+--
+-- Requires migration_phase12_drop_username_refs.sql.
+--
+-- Client (view_tracker.py) sudah membuang view duplikat dan membatasi
+-- rate per user. Guard ini menangkap client yang tidak melakukannya:
+-- - BEFORE INSERT trigger di article_views: view dari viewer yang sama
+--   (user_id, atau ip_address untuk anonymous) untuk artikel yang sama
+--   dalam views.dedupe_window_seconds dibuang (RETURN NULL), jadi counter
+--   dan trending trigger (AFTER INSERT) juga tidak jalan
+-- - Lookup memakai idx_article_views_article_time (article_id, viewed_at DESC)
+--   dan hanya partisi yang mencakup window
+-- - Advisory lock per (artikel, viewer) sampai commit, supaya dua insert
+--   bersamaan tidak sama-sama lolos
+-- - Anonymous tanpa IP tidak bisa dibedakan: selalu diterima
+--
+-- ============================================
+
+BEGIN;
+
+INSERT INTO app_settings (key, value) VALUES
+    ('views.dedupe_window_seconds', 1800),
+    ('views.rate_per_minute', 30)
+ON CONFLICT (key) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION article_views_window_guard()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_window INTERVAL := make_interval(secs => app_setting('views.dedupe_window_seconds', 1800));
+BEGIN
+    IF NEW.user_id IS NULL AND NEW.ip_address IS NULL THEN
+        RETURN NEW;
+    END IF;
+
+    PERFORM pg_advisory_xact_lock(
+        NEW.article_id,
+        hashtext(COALESCE(NEW.user_id::text, host(NEW.ip_address)))
+    );
+
+    IF EXISTS (
+        SELECT 1 FROM article_views
+        WHERE article_id = NEW.article_id
+        AND viewed_at > NEW.viewed_at - v_window
+        AND viewed_at <= NEW.viewed_at
+        AND CASE WHEN NEW.user_id IS NOT NULL
+                 THEN user_id = NEW.user_id
+                 ELSE user_id IS NULL AND ip_address = NEW.ip_address
+            END
+    ) THEN
+        RETURN NULL;
+    END IF;
+
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_article_views_window_guard ON article_views;
+CREATE TRIGGER trg_article_views_window_guard
+    BEFORE INSERT ON article_views
+    FOR EACH ROW
+    EXECUTE FUNCTION article_views_window_guard();
+
+COMMIT;
+
+-- ============================================
+-- ROLLBACK SCRIPT
+-- ============================================
+/*
+BEGIN;
+DROP TRIGGER IF EXISTS trg_article_views_window_guard ON article_views;
+DROP FUNCTION IF EXISTS article_views_window_guard();
+DELETE FROM app_settings WHERE key IN ('views.dedupe_window_seconds', 'views.rate_per_minute');
+COMMIT;
+*/
@@ -0,0 +1,107 @@
+-- ============================================
+-- CRYPTO INSIGHT - PHASE 16 MIGRATION
+-- Change log for likes/bookmarks (client delta sync)
+-- ============================================
+--
+-- Run this script in your Railway PostgreSQL console
+-- Or using psql: psql $DATABASE_URL -f migration_phase16_interaction_changes.sql
+-- Or: python run_migration_auto.py migration_phase16_interaction_changes.sql
+--
+-- Requires migration_phase12_drop_username_refs.sql.
+--
+-- Client memuat semua liked/bookmarked article id sekali saat login
+-- (interaction_state.py), lalu hanya mengambil perubahan sejak sync
+-- terakhir. Unlike/unbookmark menghapus baris, jadi perlu log terpisah:
+-- - user_interaction_changes: state terakhir per (user, kind, artikel)
+--   dengan changed_at; delete tercatat sebagai active = FALSE (tombstone)
+-- - Satu baris per pasangan (upsert), jadi ukuran dibatasi jumlah like +
+--   bookmark, bukan jumlah toggle
+-- - Tanpa foreign key: baris ditulis juga saat like ikut terhapus karena
+--   news/users dihapus (cascade)
+-- - prune_interaction_changes(): hapus baris lebih tua dari
+--   interactions.change_retention_days (dijalankan db_maintenance).
+--   Client yang sync terakhirnya lebih tua dari itu memuat ulang penuh
+--
+-- ============================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS user_interaction_changes (
+    user_id INTEGER NOT NULL,
+    kind CHAR(1) NOT NULL CHECK (kind IN ('L', 'B')),  -- L = like, B = bookmark
+    article_id INTEGER NOT NULL,
+    active BOOLEAN NOT NULL,
+    changed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (user_id, kind, article_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_user_interaction_changes_user_time
+    ON user_interaction_changes(user_id, changed_at);
+
+COMMENT ON TABLE user_interaction_changes IS 'Latest like/bookmark state per user and article, for incremental client sync';
+
+INSERT INTO app_settings (key, value) VALUES
+    ('interactions.change_retention_days', 30),
+    ('interactions.prune_interval_seconds', 86400),
+    ('interactions.sync_interval_seconds', 60)
+ON CONFLICT (key) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION record_interaction_change()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_row RECORD;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        v_row := OLD;
+    ELSE
+        v_row := NEW;
+    END IF;
+
+    INSERT INTO user_interaction_changes (user_id, kind, article_id, active, changed_at)
+    VALUES (v_row.user_id, TG_ARGV[0], v_row.article_id, TG_OP = 'INSERT', NOW())
+    ON CONFLICT (user_id, kind, article_id) DO UPDATE
+    SET active = EXCLUDED.active, changed_at = EXCLUDED.changed_at;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_article_likes_change_log ON article_likes;
+CREATE TRIGGER trg_article_likes_change_log
+    AFTER INSERT OR DELETE ON article_likes
+    FOR EACH ROW
+    EXECUTE FUNCTION record_interaction_change('L');
+
+DROP TRIGGER IF EXISTS trg_article_bookmarks_change_log ON article_bookmarks;
+CREATE TRIGGER trg_article_bookmarks_change_log
+    AFTER INSERT OR DELETE ON article_bookmarks
+    FOR EACH ROW
+    EXECUTE FUNCTION record_interaction_change('B');
+
+CREATE OR REPLACE FUNCTION prune_interaction_changes()
+RETURNS INTEGER AS $$
+DECLARE
+    v_deleted INTEGER;
+BEGIN
+    DELETE FROM user_interaction_changes
+    WHERE changed_at < NOW() - make_interval(days => app_setting('interactions.change_retention_days', 30)::INTEGER);
+    GET DIAGNOSTICS v_deleted = ROW_COUNT;
+    RETURN v_deleted;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMIT;
+
+-- ============================================
+-- ROLLBACK SCRIPT
+-- ============================================
+/*
+BEGIN;
+DROP TRIGGER IF EXISTS trg_article_likes_change_log ON article_likes;
+DROP TRIGGER IF EXISTS trg_article_bookmarks_change_log ON article_bookmarks;
+DROP FUNCTION IF EXISTS record_interaction_change();
+DROP FUNCTION IF EXISTS prune_interaction_changes();
+DROP TABLE IF EXISTS user_interaction_changes;
+DELETE FROM app_settings WHERE key LIKE 'interactions.%';
+COMMIT;
+*/
@@ -0,0 +1,113 @@
+-- ============================================
+-- CRYPTO INSIGHT - PHASE 17 MIGRATION
+-- news.updated_at watermark for the client-side replica
+-- ============================================
+--
+-- Run this script in your Railway PostgreSQL console
+-- Or using psql: psql $DATABASE_URL -f migration_phase17_news_updated_at.sql
+-- Or: python run_migration_auto.py migration_phase17_news_updated_at.sql
+--
+-- local_replica.py menyimpan artikel published di SQLite lokal dan hanya
+-- mengambil baris dengan updated_at > watermark terakhir.
+-- - updated_at di-set saat insert dan saat title / content / status /
+--   author berubah (trigger BEFORE UPDATE OF ...). Counter (views,
+--   like_count, bookmark_count) TIDAK menggeser updated_at: counter
+--   di-update per view/like, dan kolom ber-index yang berubah membuat
+--   update tersebut tidak bisa HOT. Replica mengambil counter terpisah
+-- - Index (updated_at, id) untuk query delta
+-- - news_deletions: tombstone (id, deleted_at) diisi trigger AFTER DELETE,
+--   supaya artikel yang dihapus ikut terbaca di stream delta yang sama
+--   (get_news_changes) tanpa mengambil daftar semua id
+-- - prune_news_deletions(): hapus tombstone lebih tua dari
+--   news.deletion_retention_days (dijalankan db_maintenance). Replica yang
+--   sync terakhirnya lebih tua dari itu memuat ulang penuh
+--
+-- ============================================
+
+BEGIN;
+
+ALTER TABLE news ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ;
+UPDATE news SET updated_at = created_at WHERE updated_at IS NULL;
+ALTER TABLE news ALTER COLUMN updated_at SET DEFAULT NOW();
+ALTER TABLE news ALTER COLUMN updated_at SET NOT NULL;
+
+CREATE OR REPLACE FUNCTION touch_news_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF ROW(NEW.title, NEW.content, NEW.status, NEW.author)
+       IS DISTINCT FROM ROW(OLD.title, OLD.content, OLD.status, OLD.author) THEN
+        NEW.updated_at := NOW();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_news_touch_updated_at ON news;
+CREATE TRIGGER trg_news_touch_updated_at
+    BEFORE UPDATE OF title, content, status, author ON news
+    FOR EACH ROW
+    EXECUTE FUNCTION touch_news_updated_at();
+
+CREATE INDEX IF NOT EXISTS idx_news_updated_at ON news(updated_at, id);
+
+CREATE TABLE IF NOT EXISTS news_deletions (
+    id INTEGER PRIMARY KEY,
+    deleted_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_news_deletions_deleted_at ON news_deletions(deleted_at, id);
+
+COMMENT ON TABLE news_deletions IS 'Tombstones of deleted news rows, for incremental replica sync';
+
+INSERT INTO app_settings (key, value) VALUES
+    ('news.deletion_retention_days', 90),
+    ('news.deletion_prune_interval_seconds', 86400)
+ON CONFLICT (key) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION record_news_deletion()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO news_deletions (id, deleted_at)
+    SELECT id, NOW() FROM deleted_rows
+    ON CONFLICT (id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_news_record_deletion ON news;
+CREATE TRIGGER trg_news_record_deletion
+    AFTER DELETE ON news
+    REFERENCING OLD TABLE AS deleted_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_news_deletion();
+
+CREATE OR REPLACE FUNCTION prune_news_deletions()
+RETURNS INTEGER AS $$
+DECLARE
+    v_deleted INTEGER;
+BEGIN
+    DELETE FROM news_deletions
+    WHERE deleted_at < NOW() - make_interval(days => app_setting('news.deletion_retention_days', 90)::INTEGER);
+    GET DIAGNOSTICS v_deleted = ROW_COUNT;
+    RETURN v_deleted;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMIT;
+
+-- ============================================
+-- ROLLBACK SCRIPT
+-- ============================================
+/*
+BEGIN;
+DROP TRIGGER IF EXISTS trg_news_record_deletion ON news;
+DROP FUNCTION IF EXISTS record_news_deletion();
+DROP FUNCTION IF EXISTS prune_news_deletions();
+DROP TABLE IF EXISTS news_deletions;
+DELETE FROM app_settings WHERE key LIKE 'news.deletion_%';
+DROP TRIGGER IF EXISTS trg_news_touch_updated_at ON news;
+DROP FUNCTION IF EXISTS touch_news_updated_at();
+DROP INDEX IF EXISTS idx_news_updated_at;
+ALTER TABLE news DROP COLUMN IF EXISTS updated_at;
+COMMIT;
+*/
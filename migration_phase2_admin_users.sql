@@ -0,0 +1,51 @@
+-- ============================================
+-- CRYPTO INSIGHT - PHASE 2 MIGRATION
+-- Admin User Management: search & sort indexes
+-- ============================================
+--
+-- Run this script in your Railway PostgreSQL console
+-- Or using psql: psql $DATABASE_URL -f migration_phase2_admin_users.sql
+-- Or: python run_migration_auto.py migration_phase2_admin_users.sql
+--
+-- ============================================
+
+BEGIN;
+
+-- ============================================
+-- 1. TRIGRAM SEARCH ON USERNAME
+-- ============================================
+
+-- pg_trgm membuat ILIKE '%abc%' dan ILIKE 'abc%' bisa pakai index
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_users_username_trgm
+    ON users USING gin (username gin_trgm_ops);
+
+-- ============================================
+-- 2. SORT / FILTER BY ROLE
+-- ============================================
+
+-- Keyset (role, id) < (%s, %s) bernilai NULL untuk role NULL dan paging
+-- berhenti di situ; role NULL sudah diperlakukan sebagai 'user' di aplikasi
+UPDATE users SET role = 'user' WHERE role IS NULL;
+ALTER TABLE users ALTER COLUMN role SET DEFAULT 'user';
+ALTER TABLE users ALTER COLUMN role SET NOT NULL;
+
+-- Role filter + keyset pagination (role, id) tanpa sort node
+CREATE INDEX IF NOT EXISTS idx_users_role_id ON users(role, id);
+
+-- Sorting by username memakai UNIQUE(username) yang sudah ada,
+-- sorting by id memakai primary key.
+
+COMMIT;
+
+-- ============================================
+-- ROLLBACK SCRIPT
+-- ============================================
+/*
+BEGIN;
+DROP INDEX IF EXISTS idx_users_username_trgm;
+DROP INDEX IF EXISTS idx_users_role_id;
+ALTER TABLE users ALTER COLUMN role DROP NOT NULL;
+COMMIT;
+*/
@@ -0,0 +1,35 @@
+-- ============================================
+-- CRYPTO INSIGHT - PHASE 3 MIGRATION
+-- Penerbit Dashboard: author summary index
+-- ============================================
+--
+-- Run this script in your Railway PostgreSQL console
+-- Or using psql: psql $DATABASE_URL -f migration_phase3_author_summary.sql
+-- Or: python run_migration_auto.py migration_phase3_author_summary.sql
+--
+-- Requires migration_phase1.sql (views, like_count, bookmark_count).
+--
+-- ============================================
+
+BEGIN;
+
+-- ============================================
+-- 1. AUTHOR / STATUS SUMMARY
+-- ============================================
+
+-- get_author_summary(): GROUP BY status WHERE author = ?
+-- INCLUDE kolom counter -> index-only scan, tidak perlu baca tabel news
+CREATE INDEX IF NOT EXISTS idx_news_author_status
+    ON news(author, status)
+    INCLUDE (id, views, like_count, bookmark_count);
+
+COMMIT;
+
+-- ============================================
+-- ROLLBACK SCRIPT
+-- ============================================
+/*
+BEGIN;
+DROP INDEX IF EXISTS idx_news_author_status;
+COMMIT;
+*/
@@ -0,0 +1,47 @@
+-- ============================================
+-- CRYPTO INSIGHT - PHASE 4 MIGRATION
+-- Full-text search over news (title + content)
+-- ============================================
+--
+-- Run this script in your Railway PostgreSQL console
+-- Or using psql: psql $DATABASE_URL -f migration_phase4_news_search.sql
+-- Or: python run_migration_auto.py migration_phase4_news_search.sql
+--
+-- Requires PostgreSQL 12+ (generated columns, websearch_to_tsquery).
+--
+-- ============================================
+
+BEGIN;
+
+-- ============================================
+-- 1. STORED TSVECTOR COLUMN
+-- ============================================
+
+-- Generated column: otomatis ter-update setiap INSERT / UPDATE title/content.
+-- Config 'simple' (tanpa stemming) karena artikel campuran Indonesia/English.
+-- Weight: title = A, content = B -> judul lebih tinggi di ranking.
+ALTER TABLE news
+    ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(content, '')), 'B')
+    ) STORED;
+
+-- ============================================
+-- 2. GIN INDEX
+-- ============================================
+
+CREATE INDEX IF NOT EXISTS idx_news_search_vector
+    ON news USING gin (search_vector);
+
+COMMIT;
+
+-- ============================================
+-- ROLLBACK SCRIPT
+-- ============================================
+/*
+BEGIN;
+DROP INDEX IF EXISTS idx_news_search_vector;
+ALTER TABLE news DROP COLUMN IF EXISTS search_vector;
+COMMIT;
+*/
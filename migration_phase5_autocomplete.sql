@@ -0,0 +1,49 @@
+-- ============================================
+-- CRYPTO INSIGHT - PHASE 5 MIGRATION
+-- Typo-tolerant autocomplete (title & author)
+-- ============================================
+--
+-- Run this script in your Railway PostgreSQL console
+-- Or using psql: psql $DATABASE_URL -f migration_phase5_autocomplete.sql
+-- Or: python run_migration_auto.py migration_phase5_autocomplete.sql
+--
+-- ============================================
+
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- ============================================
+-- 1. TRIGRAM INDEXES (published articles only)
+-- ============================================
+
+-- autocomplete_news(): word_similarity (<%) dan ILIKE 'abc%' memakai index ini
+CREATE INDEX IF NOT EXISTS idx_news_title_trgm
+    ON news USING gin (title gin_trgm_ops)
+    WHERE status = 'published';
+
+CREATE INDEX IF NOT EXISTS idx_news_author_trgm
+    ON news USING gin (author gin_trgm_ops)
+    WHERE status = 'published';
+
+-- ============================================
+-- 2. INCREMENTAL REFRESH
+-- ============================================
+
+-- get_autocomplete_entries(since_id): range scan id > x pada artikel published
+CREATE INDEX IF NOT EXISTS idx_news_published_id
+    ON news(id)
+    WHERE status = 'published';
+
+COMMIT;
+
+-- ============================================
+-- ROLLBACK SCRIPT
+-- ============================================
+/*
+BEGIN;
+DROP INDEX IF EXISTS idx_news_title_trgm;
+DROP INDEX IF EXISTS idx_news_author_trgm;
+DROP INDEX IF EXISTS idx_news_published_id;
+COMMIT;
+*/
@@ -0,0 +1,268 @@
+-- ============================================
+-- CRYPTO INSIGHT - PHASE 6 MIGRATION
+-- Time-decayed trending scores
+-- ============================================
+--
+-- Run this script in your Railway PostgreSQL console
+-- Or using psql: psql $DATABASE_URL -f migration_phase6_trending.sql
+-- Or: python run_migration_auto.py migration_phase6_trending.sql
+--
+-- Requires migration_phase1.sql (article_views, article_likes, article_bookmarks).
+--
+-- Score sebuah artikel = SUM(weight * 0.5 ^ (umur event / half-life))
+-- atas semua view, like, bookmark dan event publish.
+--
+-- Score disimpan dalam log-domain relatif terhadap epoch tetap:
+--     log_score = ln( SUM(weight * exp((t_event - epoch) / tau)) )
+--     tau       = half_life / ln(2)
+-- Faktor decay exp(-(now - epoch) / tau) sama untuk semua artikel, jadi
+-- urutan trending = urutan log_score dan tidak perlu dihitung ulang
+-- seiring waktu. Setiap event cukup satu logaddexp (O(1)) di trigger, dan
+-- get_trending_articles() adalah top-K read dari idx_trending_log_score.
+--
+-- ============================================
+
+BEGIN;
+
+-- ============================================
+-- 1. SETTINGS (tunable weights)
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS app_settings (
+    key VARCHAR(100) PRIMARY KEY,
+    value DOUBLE PRECISION NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+COMMENT ON TABLE app_settings IS 'Numeric application settings (trending weights, etc.)';
+
+INSERT INTO app_settings (key, value) VALUES
+    ('trending.weight_view', 1),
+    ('trending.weight_like', 4),
+    ('trending.weight_bookmark', 6),
+    ('trending.weight_publish', 8),
+    ('trending.half_life_hours', 24),
+    ('trending.rebuild_window_days', 30)
+ON CONFLICT (key) DO NOTHING;
+
+-- ============================================
+-- 2. SCORE TABLE
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS article_trending_scores (
+    article_id INTEGER PRIMARY KEY REFERENCES news(id) ON DELETE CASCADE,
+    log_score DOUBLE PRECISION NOT NULL,
+    last_event_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_trending_log_score
+    ON article_trending_scores(log_score DESC);
+
+COMMENT ON TABLE article_trending_scores IS 'Time-decayed trending score per article (log-domain)';
+
+-- ============================================
+-- 3. SCORE FUNCTIONS
+-- ============================================
+
+CREATE OR REPLACE FUNCTION app_setting(p_key TEXT, p_default DOUBLE PRECISION)
+RETURNS DOUBLE PRECISION AS $$
+    SELECT COALESCE((SELECT value FROM app_settings WHERE key = p_key), p_default);
+$$ LANGUAGE sql STABLE;
+
+-- ln(a + b) dari ln(a), ln(b); exp() dibatasi supaya tidak underflow
+CREATE OR REPLACE FUNCTION log_add_exp(a DOUBLE PRECISION, b DOUBLE PRECISION)
+RETURNS DOUBLE PRECISION AS $$
+    SELECT GREATEST(a, b) + CASE WHEN abs(a - b) > 50 THEN 0
+                                 ELSE ln(1 + exp(-abs(a - b))) END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- ln(a - b) dari ln(a), ln(b); hasil "nol" = -1e9
+CREATE OR REPLACE FUNCTION log_sub_exp(a DOUBLE PRECISION, b DOUBLE PRECISION)
+RETURNS DOUBLE PRECISION AS $$
+    SELECT CASE WHEN a - b < 1e-9 THEN -1e9
+                WHEN a - b > 50 THEN a
+                ELSE a + ln(1 - exp(b - a)) END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- ln(weight) + (t - epoch) / tau
+CREATE OR REPLACE FUNCTION trending_log_weight(p_weight DOUBLE PRECISION, p_at TIMESTAMPTZ)
+RETURNS DOUBLE PRECISION AS $$
+    SELECT ln(p_weight)
+         + EXTRACT(EPOCH FROM (p_at - TIMESTAMPTZ '2024-01-01 00:00:00+00')) * ln(2)
+           / (app_setting('trending.half_life_hours', 24) * 3600);
+$$ LANGUAGE sql STABLE;
+
+-- Tambah (p_weight > 0) atau hapus (p_weight < 0) kontribusi satu event
+CREATE OR REPLACE FUNCTION trending_add_event(p_article_id INTEGER,
+                                              p_weight DOUBLE PRECISION,
+                                              p_at TIMESTAMPTZ)
+RETURNS VOID AS $$
+DECLARE
+    v_log DOUBLE PRECISION;
+BEGIN
+    IF p_weight = 0 OR p_at IS NULL THEN
+        RETURN;
+    END IF;
+    v_log := trending_log_weight(abs(p_weight), p_at);
+
+    IF p_weight > 0 THEN
+        INSERT INTO article_trending_scores AS s (article_id, log_score, last_event_at)
+        VALUES (p_article_id, v_log, p_at)
+        ON CONFLICT (article_id) DO UPDATE
+        SET log_score = log_add_exp(s.log_score, EXCLUDED.log_score),
+            last_event_at = GREATEST(s.last_event_at, EXCLUDED.last_event_at);
+    ELSE
+        UPDATE article_trending_scores
+        SET log_score = log_sub_exp(log_score, v_log)
+        WHERE article_id = p_article_id;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Hitung ulang semua score dari event di window terakhir
+-- (dipakai setelah weight / half-life diubah)
+CREATE OR REPLACE FUNCTION trending_rebuild()
+RETURNS INTEGER AS $$
+DECLARE
+    v_since TIMESTAMPTZ := NOW() - make_interval(days => app_setting('trending.rebuild_window_days', 30)::INTEGER);
+    v_count INTEGER;
+BEGIN
+    DELETE FROM article_trending_scores;
+
+    WITH events AS (
+        SELECT article_id, viewed_at AS at,
+               trending_log_weight(app_setting('trending.weight_view', 1), viewed_at) AS lw
+        FROM article_views WHERE viewed_at >= v_since
+        UNION ALL
+        SELECT article_id, liked_at,
+               trending_log_weight(app_setting('trending.weight_like', 4), liked_at)
+        FROM article_likes WHERE liked_at >= v_since
+        UNION ALL
+        SELECT article_id, bookmarked_at,
+               trending_log_weight(app_setting('trending.weight_bookmark', 6), bookmarked_at)
+        FROM article_bookmarks WHERE bookmarked_at >= v_since
+        UNION ALL
+        SELECT id, created_at,
+               trending_log_weight(app_setting('trending.weight_publish', 8), created_at)
+        FROM news WHERE status = 'published' AND created_at >= v_since
+    ),
+    maxed AS (
+        SELECT article_id, at, lw, MAX(lw) OVER (PARTITION BY article_id) AS m
+        FROM events
+    )
+    INSERT INTO article_trending_scores (article_id, log_score, last_event_at)
+    SELECT article_id, MAX(m) + ln(SUM(exp(GREATEST(lw - m, -700)))), MAX(at)
+    FROM maxed
+    GROUP BY article_id;
+
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================
+-- 4. TRIGGERS (incremental maintenance)
+-- ============================================
+
+CREATE OR REPLACE FUNCTION trg_trending_view()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM trending_add_event(NEW.article_id, app_setting('trending.weight_view', 1),
+                               COALESCE(NEW.viewed_at, NOW()));
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION trg_trending_like()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM trending_add_event(NEW.article_id, app_setting('trending.weight_like', 4),
+                                   COALESCE(NEW.liked_at, NOW()));
+        RETURN NEW;
+    END IF;
+    PERFORM trending_add_event(OLD.article_id, -app_setting('trending.weight_like', 4), OLD.liked_at);
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION trg_trending_bookmark()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM trending_add_event(NEW.article_id, app_setting('trending.weight_bookmark', 6),
+                                   COALESCE(NEW.bookmarked_at, NOW()));
+        RETURN NEW;
+    END IF;
+    PERFORM trending_add_event(OLD.article_id, -app_setting('trending.weight_bookmark', 6), OLD.bookmarked_at);
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Artikel baru dipublish mendapat score awal supaya bisa muncul di trending
+CREATE OR REPLACE FUNCTION trg_trending_publish()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.status = 'published'
+       AND (TG_OP = 'INSERT' OR OLD.status IS DISTINCT FROM 'published') THEN
+        PERFORM trending_add_event(NEW.id, app_setting('trending.weight_publish', 8), NOW());
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_article_views_trending ON article_views;
+DROP TRIGGER IF EXISTS trg_article_likes_trending ON article_likes;
+DROP TRIGGER IF EXISTS trg_article_bookmarks_trending ON article_bookmarks;
+DROP TRIGGER IF EXISTS trg_news_publish_trending ON news;
+
+CREATE TRIGGER trg_article_views_trending
+    AFTER INSERT ON article_views
+    FOR EACH ROW
+    EXECUTE FUNCTION trg_trending_view();
+
+CREATE TRIGGER trg_article_likes_trending
+    AFTER INSERT OR DELETE ON article_likes
+    FOR EACH ROW
+    EXECUTE FUNCTION trg_trending_like();
+
+CREATE TRIGGER trg_article_bookmarks_trending
+    AFTER INSERT OR DELETE ON article_bookmarks
+    FOR EACH ROW
+    EXECUTE FUNCTION trg_trending_bookmark();
+
+CREATE TRIGGER trg_news_publish_trending
+    AFTER INSERT OR UPDATE OF status ON news
+    FOR EACH ROW
+    EXECUTE FUNCTION trg_trending_publish();
+
+-- ============================================
+-- 5. INITIAL SCORES
+-- ============================================
+
+SELECT trending_rebuild();
+
+COMMIT;
+
+-- ============================================
+-- ROLLBACK SCRIPT
+-- ============================================
+/*
+BEGIN;
+DROP TRIGGER IF EXISTS trg_article_views_trending ON article_views;
+DROP TRIGGER IF EXISTS trg_article_likes_trending ON article_likes;
+DROP TRIGGER IF EXISTS trg_article_bookmarks_trending ON article_bookmarks;
+DROP TRIGGER IF EXISTS trg_news_publish_trending ON news;
+DROP FUNCTION IF EXISTS trg_trending_view();
+DROP FUNCTION IF EXISTS trg_trending_like();
+DROP FUNCTION IF EXISTS trg_trending_bookmark();
+DROP FUNCTION IF EXISTS trg_trending_publish();
+DROP FUNCTION IF EXISTS trending_rebuild();
+DROP FUNCTION IF EXISTS trending_add_event(INTEGER, DOUBLE PRECISION, TIMESTAMPTZ);
+DROP FUNCTION IF EXISTS trending_log_weight(DOUBLE PRECISION, TIMESTAMPTZ);
+DROP FUNCTION IF EXISTS log_sub_exp(DOUBLE PRECISION, DOUBLE PRECISION);
+DROP FUNCTION IF EXISTS log_add_exp(DOUBLE PRECISION, DOUBLE PRECISION);
+DROP TABLE IF EXISTS article_trending_scores;
+-- app_settings dibiarkan (dipakai fitur lain)
+COMMIT;
+*/
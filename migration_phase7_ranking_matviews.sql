@@ -0,0 +1,131 @@
+-- ============================================
+-- CRYPTO INSIGHT - PHASE 7 MIGRATION
+-- Materialized ranking views (popular / trending / most liked)
+-- ============================================
+--
+-- Run this script in your Railway PostgreSQL console
+-- Or using psql: psql $DATABASE_URL -f migration_phase7_ranking_matviews.sql
+-- Or: python run_migration_auto.py migration_phase7_ranking_matviews.sql
+--
+-- Requires migration_phase1.sql and migration_phase6_trending.sql.
+--
+-- View v_popular_articles, v_trending_articles, v_most_liked_articles
+-- (plain view di phase 1) diganti materialized view dengan kolom rank.
+-- Refresh dilakukan oleh db_maintenance.MaintenanceScheduler dengan
+-- REFRESH MATERIALIZED VIEW CONCURRENTLY (butuh unique index) dan
+-- dicatat di matview_refresh_log untuk cek staleness.
+--
+-- ============================================
+
+BEGIN;
+
+-- ============================================
+-- 1. DROP PLAIN VIEWS FROM PHASE 1
+-- ============================================
+
+DO $$
+DECLARE
+    v_name TEXT;
+BEGIN
+    FOREACH v_name IN ARRAY ARRAY['v_popular_articles', 'v_trending_articles', 'v_most_liked_articles']
+    LOOP
+        -- Hanya drop jika masih plain view (relkind 'v'); aman di-run ulang
+        IF EXISTS (SELECT 1 FROM pg_class WHERE relname = v_name AND relkind = 'v') THEN
+            EXECUTE format('DROP VIEW %I', v_name);
+        END IF;
+    END LOOP;
+END $$;
+
+-- ============================================
+-- 2. MATERIALIZED VIEWS
+-- ============================================
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS v_popular_articles AS
+SELECT 
+    n.id,
+    n.title,
+    n.author,
+    n.views,
+    n.like_count,
+    n.bookmark_count,
+    n.created_at,
+    to_char(n.created_at AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI UTC') as created_at_formatted,
+    row_number() OVER (ORDER BY n.views DESC, n.like_count DESC, n.id DESC) as rank
+FROM news n
+WHERE n.status = 'published';
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS v_most_liked_articles AS
+SELECT 
+    n.id,
+    n.title,
+    n.author,
+    n.views,
+    n.like_count,
+    n.bookmark_count,
+    n.created_at,
+    to_char(n.created_at AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI UTC') as created_at_formatted,
+    row_number() OVER (ORDER BY n.like_count DESC, n.views DESC, n.id DESC) as rank
+FROM news n
+WHERE n.status = 'published';
+
+-- Trending: dari article_trending_scores (phase 6), aktivitas 7 hari terakhir
+CREATE MATERIALIZED VIEW IF NOT EXISTS v_trending_articles AS
+SELECT 
+    n.id,
+    n.title,
+    n.author,
+    n.views,
+    n.like_count,
+    n.bookmark_count,
+    n.created_at,
+    to_char(n.created_at AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI UTC') as created_at_formatted,
+    row_number() OVER (ORDER BY s.log_score DESC, n.id DESC) as rank
+FROM article_trending_scores s
+JOIN news n ON n.id = s.article_id
+WHERE n.status = 'published'
+AND s.last_event_at > NOW() - INTERVAL '7 days';
+
+-- Unique index wajib untuk REFRESH ... CONCURRENTLY; index rank untuk top-K
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_popular_id ON v_popular_articles(id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_popular_rank ON v_popular_articles(rank);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_most_liked_id ON v_most_liked_articles(id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_most_liked_rank ON v_most_liked_articles(rank);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_trending_id ON v_trending_articles(id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_trending_rank ON v_trending_articles(rank);
+
+-- ============================================
+-- 3. REFRESH LOG + SETTINGS
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS matview_refresh_log (
+    view_name VARCHAR(100) PRIMARY KEY,
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    duration_ms INTEGER
+);
+
+INSERT INTO matview_refresh_log (view_name) VALUES
+    ('v_popular_articles'),
+    ('v_trending_articles'),
+    ('v_most_liked_articles')
+ON CONFLICT (view_name) DO UPDATE SET refreshed_at = NOW();
+
+INSERT INTO app_settings (key, value) VALUES
+    ('matview.refresh_interval_seconds', 60),
+    ('matview.max_staleness_seconds', 300)
+ON CONFLICT (key) DO NOTHING;
+
+COMMIT;
+
+-- ============================================
+-- ROLLBACK SCRIPT
+-- ============================================
+/*
+BEGIN;
+DROP MATERIALIZED VIEW IF EXISTS v_popular_articles;
+DROP MATERIALIZED VIEW IF EXISTS v_trending_articles;
+DROP MATERIALIZED VIEW IF EXISTS v_most_liked_articles;
+DROP TABLE IF EXISTS matview_refresh_log;
+DELETE FROM app_settings WHERE key LIKE 'matview.%';
+-- Lalu jalankan ulang bagian "8. CREATE USEFUL VIEWS" dari migration_phase1.sql
+COMMIT;
+*/
@@ -0,0 +1,123 @@
+-- ============================================
+-- CRYPTO INSIGHT - PHASE 8 MIGRATION
+-- Composite / partial covering indexes for the hot queries
+-- ============================================
+--
+-- Run this script in your Railway PostgreSQL console
+-- Or using psql: psql $DATABASE_URL -f migration_phase8_query_indexes.sql
+-- Or: python run_migration_auto.py migration_phase8_query_indexes.sql
+--
+-- Requires migration_phase1.sql and migration_phase3_author_summary.sql.
+-- Verify afterwards with: python check_query_plans.py
+--
+-- Setiap index di bawah mengikuti satu query (filter + urutan), dengan
+-- INCLUDE untuk kolom yang di-SELECT supaya bisa index-only scan.
+--
+-- ============================================
+
+BEGIN;
+
+-- ============================================
+-- 1. NEWS
+-- ============================================
+
+-- list_my_news(): WHERE author = ? ORDER BY created_at DESC
+CREATE INDEX IF NOT EXISTS idx_news_author_created
+    ON news(author, created_at DESC)
+    INCLUDE (id, title, status);
+
+-- list_published_news(): WHERE status = 'published' ORDER BY created_at DESC
+CREATE INDEX IF NOT EXISTS idx_news_published_created
+    ON news(created_at DESC)
+    INCLUDE (id, title, author)
+    WHERE status = 'published';
+
+-- get_popular_articles() (live fallback): ORDER BY views DESC, like_count DESC
+CREATE INDEX IF NOT EXISTS idx_news_published_views
+    ON news(views DESC, like_count DESC)
+    INCLUDE (id, title, author, bookmark_count, created_at)
+    WHERE status = 'published';
+
+-- get_most_liked_articles() (live fallback): ORDER BY like_count DESC, views DESC
+CREATE INDEX IF NOT EXISTS idx_news_published_likes
+    ON news(like_count DESC, views DESC)
+    INCLUDE (id, title, author, bookmark_count, created_at)
+    WHERE status = 'published';
+
+-- Redundant:
+--   idx_news_author     -> prefix dari idx_news_author_created / idx_news_author_status
+--   idx_news_created_at -> tidak ada query yang sort created_at tanpa filter
+DROP INDEX IF EXISTS idx_news_author;
+DROP INDEX IF EXISTS idx_news_created_at;
+
+-- ============================================
+-- 2. LIKES
+-- ============================================
+
+-- get_user_liked_articles(): WHERE username = ? ORDER BY liked_at DESC
+CREATE INDEX IF NOT EXISTS idx_article_likes_user_time
+    ON article_likes(username, liked_at DESC)
+    INCLUDE (article_id);
+
+-- get_article_likers(): WHERE article_id = ? ORDER BY liked_at DESC
+CREATE INDEX IF NOT EXISTS idx_article_likes_article_time
+    ON article_likes(article_id, liked_at DESC)
+    INCLUDE (username);
+
+-- Redundant:
+--   idx_article_likes_user    -> prefix dari idx_article_likes_user_time
+--   idx_article_likes_article -> UNIQUE(article_id, username) sudah meng-cover
+DROP INDEX IF EXISTS idx_article_likes_user;
+DROP INDEX IF EXISTS idx_article_likes_article;
+
+-- ============================================
+-- 3. BOOKMARKS
+-- ============================================
+
+-- get_user_bookmarked_articles(): WHERE username = ? ORDER BY bookmarked_at DESC
+CREATE INDEX IF NOT EXISTS idx_bookmarks_user_time
+    ON article_bookmarks(username, bookmarked_at DESC)
+    INCLUDE (article_id);
+
+-- Redundant:
+--   idx_bookmarks_user    -> prefix dari idx_bookmarks_user_time
+--   idx_bookmarks_article -> UNIQUE(article_id, username) sudah meng-cover
+DROP INDEX IF EXISTS idx_bookmarks_user;
+DROP INDEX IF EXISTS idx_bookmarks_article;
+
+-- ============================================
+-- 4. PRESENCE
+-- ============================================
+
+-- latest_presence_per_user(): MAX(last_seen) per username + status check
+CREATE INDEX IF NOT EXISTS idx_user_sessions_user_last_seen
+    ON user_sessions(username, last_seen DESC)
+    INCLUDE (status);
+
+-- Redundant: idx_user_sessions_username -> prefix dari index di atas
+DROP INDEX IF EXISTS idx_user_sessions_username;
+
+COMMIT;
+
+-- ============================================
+-- ROLLBACK SCRIPT
+-- ============================================
+/*
+BEGIN;
+DROP INDEX IF EXISTS idx_news_author_created;
+DROP INDEX IF EXISTS idx_news_published_created;
+DROP INDEX IF EXISTS idx_news_published_views;
+DROP INDEX IF EXISTS idx_news_published_likes;
+DROP INDEX IF EXISTS idx_article_likes_user_time;
+DROP INDEX IF EXISTS idx_article_likes_article_time;
+DROP INDEX IF EXISTS idx_bookmarks_user_time;
+DROP INDEX IF EXISTS idx_user_sessions_user_last_seen;
+CREATE INDEX IF NOT EXISTS idx_news_author ON news(author);
+CREATE INDEX IF NOT EXISTS idx_news_created_at ON news(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_article_likes_user ON article_likes(username);
+CREATE INDEX IF NOT EXISTS idx_article_likes_article ON article_likes(article_id);
+CREATE INDEX IF NOT EXISTS idx_bookmarks_user ON article_bookmarks(username);
+CREATE INDEX IF NOT EXISTS idx_bookmarks_article ON article_bookmarks(article_id);
+CREATE INDEX IF NOT EXISTS idx_user_sessions_username ON user_sessions(username);
+COMMIT;
+*/
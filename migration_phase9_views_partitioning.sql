@@ -0,0 +1,286 @@
+-- ============================================
+-- CRYPTO INSIGHT - PHASE 9 MIGRATION
+-- Monthly partitioned article_views + daily rollups + retention
+-- ============================================
+--
+-- Run this script in your Railway PostgreSQL console
+-- Or using psql: psql $DATABASE_URL -f migration_phase9_views_partitioning.sql
+-- Or: python run_migration_auto.py migration_phase9_views_partitioning.sql
+--
+-- Requires PostgreSQL 12+, migration_phase1.sql and migration_phase6_trending.sql.
+--
+-- - article_views menjadi tabel partisi RANGE (viewed_at) per bulan (UTC)
+-- - ensure_article_views_partitions(): buat partisi bulan berjalan + N bulan ke depan
+-- - article_views_default (DEFAULT partition): insert tetap berhasil walau
+--   maintenance lama tidak jalan dan partisi ke depan habis. Saat partisi
+--   bulan tsb dibuat, baris dari default dipindah ke partisi baru
+-- - maintain_article_views(): partisi yang lebih tua dari retention di-rollup
+--   ke article_views_daily, lalu DETACH + DROP
+-- - article_views_by_day: view gabungan (daily rollup + raw yang belum di-rollup)
+--
+-- Kedua fungsi dijalankan harian oleh db_maintenance.MaintenanceScheduler.
+-- Catatan: migrasi menyalin seluruh isi article_views lama; jalankan saat sepi.
+--
+-- ============================================
+
+BEGIN;
+
+-- ============================================
+-- 1. ROLLUP TABLES + SETTINGS
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS article_views_daily (
+    article_id INTEGER NOT NULL REFERENCES news(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    views INTEGER NOT NULL,
+    unique_viewers INTEGER NOT NULL,
+    PRIMARY KEY (article_id, day)
+);
+
+COMMENT ON TABLE article_views_daily IS 'Daily per-article view counts rolled up from dropped article_views partitions';
+
+-- Semua raw view dengan viewed_at < rolled_up_until sudah ada di article_views_daily
+CREATE TABLE IF NOT EXISTS article_views_rollup_state (
+    singleton BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (singleton),
+    rolled_up_until TIMESTAMPTZ NOT NULL DEFAULT '-infinity'
+);
+INSERT INTO article_views_rollup_state DEFAULT VALUES ON CONFLICT DO NOTHING;
+
+-- Waktu run terakhir per maintenance task (db_maintenance.py)
+CREATE TABLE IF NOT EXISTS maintenance_log (
+    task_name VARCHAR(100) PRIMARY KEY,
+    ran_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    duration_ms INTEGER
+);
+
+INSERT INTO app_settings (key, value) VALUES
+    ('views.retention_months', 6),
+    ('views.partitions_ahead_months', 3),
+    ('views.maintenance_interval_seconds', 86400)
+ON CONFLICT (key) DO NOTHING;
+
+-- ============================================
+-- 2. PARTITIONED TABLE
+-- ============================================
+
+ALTER TABLE article_views RENAME TO article_views_legacy;
+
+CREATE TABLE article_views (
+    id BIGSERIAL,
+    article_id INTEGER NOT NULL REFERENCES news(id) ON DELETE CASCADE,
+    username VARCHAR(100) REFERENCES users(username) ON DELETE SET NULL,
+    viewed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    ip_address VARCHAR(50) DEFAULT '0.0.0.0'
+) PARTITION BY RANGE (viewed_at);
+
+COMMENT ON TABLE article_views IS 'Tracks individual article views (partitioned by month)';
+
+CREATE TABLE article_views_default PARTITION OF article_views DEFAULT;
+
+-- Satu index per partisi (menggantikan 3 index lama)
+CREATE INDEX IF NOT EXISTS idx_article_views_article_time
+    ON article_views(article_id, viewed_at DESC);
+
+-- ============================================
+-- 3. PARTITION MANAGEMENT FUNCTIONS
+-- ============================================
+
+CREATE OR REPLACE FUNCTION article_views_partition_name(p_month DATE)
+RETURNS TEXT AS $$
+    SELECT 'article_views_p' || to_char(p_month, 'YYYY_MM');
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Buat partisi dari bulan p_from (default: bulan ini, atau bulan tertua yang
+-- tertampung di article_views_default) s/d N bulan ke depan
+CREATE OR REPLACE FUNCTION ensure_article_views_partitions(p_months_ahead INTEGER DEFAULT NULL,
+                                                           p_from DATE DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    v_ahead INTEGER := COALESCE(p_months_ahead, app_setting('views.partitions_ahead_months', 3)::INTEGER);
+    v_month DATE := date_trunc('month', COALESCE(
+        p_from,
+        LEAST((NOW() AT TIME ZONE 'UTC')::date,
+              (SELECT (MIN(viewed_at) AT TIME ZONE 'UTC')::date FROM article_views_default))
+    ))::date;
+    v_last DATE := (date_trunc('month', NOW() AT TIME ZONE 'UTC') + make_interval(months => v_ahead))::date;
+    v_name TEXT;
+    v_start TIMESTAMPTZ;
+    v_end TIMESTAMPTZ;
+    v_created INTEGER := 0;
+BEGIN
+    WHILE v_month <= v_last LOOP
+        v_name := article_views_partition_name(v_month);
+        v_start := v_month::timestamp AT TIME ZONE 'UTC';
+        v_end := (v_month + INTERVAL '1 month')::timestamp AT TIME ZONE 'UTC';
+        IF to_regclass(v_name) IS NULL THEN
+            IF EXISTS (SELECT 1 FROM article_views_default
+                       WHERE viewed_at >= v_start AND viewed_at < v_end) THEN
+                -- Partisi baru tidak bisa dibuat selama default berisi baris di
+                -- range-nya: pindahkan ke tabel biasa (tanpa trigger, counter
+                -- tidak dobel), lalu ATTACH sebagai partisi
+                LOCK TABLE article_views_default IN ACCESS EXCLUSIVE MODE;
+                EXECUTE format('CREATE TABLE %I (LIKE article_views INCLUDING DEFAULTS)', v_name);
+                EXECUTE format($sql$
+                    WITH moved AS (
+                        DELETE FROM article_views_default
+                        WHERE viewed_at >= %L AND viewed_at < %L
+                        RETURNING *
+                    )
+                    INSERT INTO %I SELECT * FROM moved
+                $sql$, v_start, v_end, v_name);
+                EXECUTE format('ALTER TABLE article_views ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                               v_name, v_start, v_end);
+            ELSE
+                EXECUTE format('CREATE TABLE %I PARTITION OF article_views FOR VALUES FROM (%L) TO (%L)',
+                               v_name, v_start, v_end);
+            END IF;
+            v_created := v_created + 1;
+        END IF;
+        v_month := (v_month + INTERVAL '1 month')::date;
+    END LOOP;
+    RETURN v_created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Rollup + detach + drop partisi yang lebih tua dari retention window
+CREATE OR REPLACE FUNCTION maintain_article_views(p_retention_months INTEGER DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    v_retention INTEGER := COALESCE(p_retention_months, app_setting('views.retention_months', 6)::INTEGER);
+    v_cutoff DATE := (date_trunc('month', NOW() AT TIME ZONE 'UTC') - make_interval(months => v_retention))::date;
+    v_month DATE;
+    v_dropped INTEGER := 0;
+    r RECORD;
+BEGIN
+    FOR r IN
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'article_views'::regclass
+        AND c.relname ~ '^article_views_p[0-9]{4}_[0-9]{2}$'
+        ORDER BY c.relname
+    LOOP
+        v_month := to_date(substr(r.relname, 16), 'YYYY_MM');
+        EXIT WHEN v_month >= v_cutoff;
+
+        -- 1. Rollup (idempotent: hitung ulang hari-hari di partisi ini)
+        EXECUTE format($sql$
+            INSERT INTO article_views_daily (article_id, day, views, unique_viewers)
+            SELECT article_id,
+                   (viewed_at AT TIME ZONE 'UTC')::date,
+                   COUNT(*),
+                   COUNT(DISTINCT COALESCE(username, ip_address))
+            FROM %I
+            GROUP BY 1, 2
+            ON CONFLICT (article_id, day) DO UPDATE
+            SET views = EXCLUDED.views, unique_viewers = EXCLUDED.unique_viewers
+        $sql$, r.relname);
+
+        -- 2. Geser watermark (raw < watermark dibaca dari daily)
+        UPDATE article_views_rollup_state
+        SET rolled_up_until = GREATEST(rolled_up_until,
+                                       (v_month + INTERVAL '1 month')::timestamp AT TIME ZONE 'UTC');
+
+        -- 3. Detach + drop
+        EXECUTE format('ALTER TABLE article_views DETACH PARTITION %I', r.relname);
+        EXECUTE format('DROP TABLE %I', r.relname);
+        v_dropped := v_dropped + 1;
+    END LOOP;
+    RETURN v_dropped;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================
+-- 4. COPY EXISTING VIEWS
+-- ============================================
+
+DO $$
+DECLARE
+    v_from DATE;
+    v_legacy BIGINT;
+    v_copied BIGINT;
+BEGIN
+    SELECT (MIN(viewed_at) AT TIME ZONE 'UTC')::date INTO v_from FROM article_views_legacy;
+    PERFORM ensure_article_views_partitions(NULL, v_from);
+
+    -- Trigger belum dibuat di tabel baru: counter news.views / trending tidak dobel
+    INSERT INTO article_views (article_id, username, viewed_at, ip_address)
+    SELECT article_id, username, COALESCE(viewed_at, NOW()), ip_address
+    FROM article_views_legacy;
+
+    SELECT COUNT(*) INTO v_legacy FROM article_views_legacy;
+    SELECT COUNT(*) INTO v_copied FROM article_views;
+    IF v_legacy <> v_copied THEN
+        RAISE EXCEPTION '❌ article_views copy mismatch: % vs %', v_legacy, v_copied;
+    END IF;
+    RAISE NOTICE '✅ Copied % article views into monthly partitions', v_copied;
+END $$;
+
+DROP TABLE article_views_legacy;
+
+-- ============================================
+-- 5. TRIGGERS (same as before, on the partitioned table)
+-- ============================================
+
+CREATE TRIGGER trg_article_views_update
+    AFTER INSERT ON article_views
+    FOR EACH ROW
+    EXECUTE FUNCTION update_article_view_count();
+
+CREATE TRIGGER trg_article_views_trending
+    AFTER INSERT ON article_views
+    FOR EACH ROW
+    EXECUTE FUNCTION trg_trending_view();
+
+-- ============================================
+-- 6. TRANSPARENT DAILY VIEW
+-- ============================================
+
+-- Views per article per hari (UTC): daily rollup + raw yang belum di-rollup
+CREATE OR REPLACE VIEW article_views_by_day AS
+SELECT article_id, day, views, unique_viewers
+FROM article_views_daily
+UNION ALL
+SELECT v.article_id,
+       (v.viewed_at AT TIME ZONE 'UTC')::date AS day,
+       COUNT(*)::INTEGER AS views,
+       COUNT(DISTINCT COALESCE(v.username, v.ip_address))::INTEGER AS unique_viewers
+FROM article_views v
+WHERE v.viewed_at >= (SELECT rolled_up_until FROM article_views_rollup_state)
+GROUP BY 1, 2;
+
+-- Roll up partisi lama yang ikut tersalin (jika ada)
+SELECT maintain_article_views();
+
+COMMIT;
+
+-- ============================================
+-- ROLLBACK SCRIPT
+-- ============================================
+/*
+-- Raw view yang sudah di-rollup + di-drop tidak bisa dikembalikan.
+BEGIN;
+DROP VIEW IF EXISTS article_views_by_day;
+CREATE TABLE article_views_legacy (
+    id SERIAL PRIMARY KEY,
+    article_id INTEGER NOT NULL REFERENCES news(id) ON DELETE CASCADE,
+    username VARCHAR(100) REFERENCES users(username) ON DELETE SET NULL,
+    viewed_at TIMESTAMPTZ DEFAULT NOW(),
+    ip_address VARCHAR(50) DEFAULT '0.0.0.0'
+);
+INSERT INTO article_views_legacy (article_id, username, viewed_at, ip_address)
+SELECT article_id, username, viewed_at, ip_address FROM article_views;
+DROP TABLE article_views;
+ALTER TABLE article_views_legacy RENAME TO article_views;
+CREATE INDEX idx_article_views_article ON article_views(article_id);
+CREATE INDEX idx_article_views_user ON article_views(username);
+CREATE INDEX idx_article_views_time ON article_views(viewed_at DESC);
+CREATE TRIGGER trg_article_views_update AFTER INSERT ON article_views
+    FOR EACH ROW EXECUTE FUNCTION update_article_view_count();
+CREATE TRIGGER trg_article_views_trending AFTER INSERT ON article_views
+    FOR EACH ROW EXECUTE FUNCTION trg_trending_view();
+DROP FUNCTION IF EXISTS maintain_article_views(INTEGER);
+DROP FUNCTION IF EXISTS ensure_article_views_partitions(INTEGER, DATE);
+DROP FUNCTION IF EXISTS article_views_partition_name(DATE);
+COMMIT;
+*/
@@ -0,0 +1,535 @@
+# monitoring_store.py — Persistent SQLite store untuk admin monitoring
+"""
+Monitoring store untuk EnhancedAdminDashboard:
+- Satu koneksi SQLite yang hidup selama dashboard terbuka (WAL mode)
+- Background writer thread: event masuk antrian, di-commit per batch
+- Index pada timestamp, username dan action
+- Action disimpan juga sebagai kode integer (tabel action_codes)
+- Rollup per jam / per hari + counter global yang di-update incremental
+  oleh writer thread, jadi statistik tidak perlu scan user_activities
+
+Export data berjalan streaming (lihat export_monitoring_data): cursor dibaca
+per chunk dan ditulis incremental, jadi memory tidak tergantung ukuran tabel.
+
+Event di-timestamp saat log dipanggil (UTC, format sama dengan
+CURRENT_TIMESTAMP SQLite), jadi batching tidak menggeser waktu event.
+"""
+
+import csv
+import datetime
+import gzip
+import json
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+_STOP = object()
+
+# Naikkan jika schema berubah; migrasi dijalankan di _migrate()
+SCHEMA_VERSION = 2
+
+# Counter global di tabel monitoring_counters
+COUNTER_LOGINS = "total_logins"
+COUNTER_FAILED_LOGINS = "failed_logins"
+COUNTER_ADMIN_ACTIONS = "admin_actions"
+
+
+def is_login_action(action: Optional[str]) -> bool:
+    """Sama dengan filter lama `action LIKE '%LOGIN%'` (case-insensitive)."""
+    return "LOGIN" in (action or "").upper()
+
+
+def utc_timestamp() -> str:
+    """Timestamp UTC dengan format yang sama seperti CURRENT_TIMESTAMP SQLite."""
+    return datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+
+
+class MonitoringStore:
+    """
+    SQLite store dengan satu koneksi long-lived dan writer thread.
+
+    log_user_activity / log_admin_action hanya memasukkan event ke antrian
+    (tidak pernah menyentuh disk di UI thread). Writer thread mengambil
+    event dari antrian dan meng-commit per batch (maks batch_size event
+    atau setiap flush_interval detik).
+    """
+
+    def __init__(self, path: str = "admin_monitoring.db",
+                 batch_size: int = 200, flush_interval: float = 0.5):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # Naik setiap batch yang di-commit; dipakai untuk invalidasi cache report
+        self.generation = {"user": 0, "admin": 0}
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._configure()
+        self._setup_schema()
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop,
+                                        name="MonitoringStoreWriter", daemon=True)
+        self._writer.start()
+
+    # ---------- Setup ----------
+    def _configure(self):
+        """PRAGMA untuk workload append-heavy dengan reader di UI thread."""
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA temp_store=MEMORY")
+            self._conn.execute("PRAGMA cache_size=-8000")   # ~8 MB
+            self._conn.execute("PRAGMA busy_timeout=5000")
+
+    def _setup_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS user_activities (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    username TEXT,
+                    action TEXT,
+                    details TEXT,
+                    ip_address TEXT DEFAULT 'localhost',
+                    success BOOLEAN DEFAULT 1
+                )
+            """)
+
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS login_sessions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT,
+                    login_time DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    logout_time DATETIME,
+                    session_duration INTEGER,
+                    role TEXT,
+                    ip_address TEXT DEFAULT 'localhost'
+                )
+            """)
+
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS admin_actions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    admin_username TEXT,
+                    action TEXT,
+                    target_user TEXT,
+                    details TEXT
+                )
+            """)
+
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_user_activities_timestamp ON user_activities(timestamp)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_user_activities_username ON user_activities(username)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_user_activities_action ON user_activities(action)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_admin_actions_timestamp ON admin_actions(timestamp)")
+
+            # Kode action (enum) + rollup tables
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS action_codes (
+                    code INTEGER PRIMARY KEY,
+                    action TEXT UNIQUE NOT NULL,
+                    is_login INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            for table, key in (("activity_rollup_hourly", "hour"), ("activity_rollup_daily", "day")):
+                self._conn.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        {key} TEXT NOT NULL,
+                        username TEXT NOT NULL,
+                        action_code INTEGER NOT NULL,
+                        events INTEGER NOT NULL DEFAULT 0,
+                        failures INTEGER NOT NULL DEFAULT 0,
+                        PRIMARY KEY ({key}, username, action_code)
+                    ) WITHOUT ROWID
+                """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS monitoring_counters (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+
+        self._migrate()
+        self._action_codes = {action: (code, bool(is_login)) for code, action, is_login
+                              in self.query("SELECT code, action, is_login FROM action_codes")}
+
+    def _migrate(self):
+        """Upgrade schema lama (PRAGMA user_version) ke SCHEMA_VERSION."""
+        version = self.query_one("PRAGMA user_version")[0]
+        if version >= SCHEMA_VERSION:
+            return
+
+        with self._lock, self._conn:
+            columns = [r[1] for r in self._conn.execute("PRAGMA table_info(user_activities)")]
+            if "action_code" not in columns:
+                self._conn.execute("ALTER TABLE user_activities ADD COLUMN action_code INTEGER")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_user_activities_action_code ON user_activities(action_code, timestamp)")
+
+            # Backfill kode action untuk data lama
+            for (action,) in self._conn.execute("SELECT DISTINCT action FROM user_activities WHERE action IS NOT NULL").fetchall():
+                self._conn.execute("INSERT OR IGNORE INTO action_codes (action, is_login) VALUES (?, ?)",
+                                   (action, int(is_login_action(action))))
+            self._conn.execute("""
+                UPDATE user_activities
+                SET action_code = (SELECT code FROM action_codes c WHERE c.action = user_activities.action)
+                WHERE action_code IS NULL AND action IS NOT NULL
+            """)
+
+            # Bangun ulang rollup & counter dari histori (sekali saja)
+            self._conn.execute("DELETE FROM activity_rollup_hourly")
+            self._conn.execute("DELETE FROM activity_rollup_daily")
+            self._conn.execute("DELETE FROM monitoring_counters")
+            for table, key_expr in (("activity_rollup_hourly", "strftime('%Y-%m-%d %H:00:00', timestamp)"),
+                                    ("activity_rollup_daily", "date(timestamp)")):
+                self._conn.execute(f"""
+                    INSERT INTO {table}
+                    SELECT {key_expr}, COALESCE(username, ''), action_code,
+                           COUNT(*), SUM(CASE WHEN success THEN 0 ELSE 1 END)
+                    FROM user_activities
+                    WHERE action_code IS NOT NULL AND timestamp IS NOT NULL
+                    GROUP BY 1, 2, 3
+                """)
+            self._conn.execute("""
+                INSERT INTO monitoring_counters (name, value)
+                SELECT ?, COUNT(*) FROM user_activities a
+                JOIN action_codes c ON c.code = a.action_code WHERE c.is_login = 1
+            """, (COUNTER_LOGINS,))
+            self._conn.execute("""
+                INSERT INTO monitoring_counters (name, value)
+                SELECT ?, COUNT(*) FROM user_activities a
+                JOIN action_codes c ON c.code = a.action_code WHERE c.is_login = 1 AND NOT a.success
+            """, (COUNTER_FAILED_LOGINS,))
+            self._conn.execute("""
+                INSERT INTO monitoring_counters (name, value)
+                SELECT ?, COUNT(*) FROM admin_actions
+            """, (COUNTER_ADMIN_ACTIONS,))
+
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    # ---------- Writes (non-blocking) ----------
+    def log_user_activity(self, username: str, action: str, details: str = "",
+                          success: bool = True):
+        """Queue user activity event."""
+        self._queue.put(("user", (utc_timestamp(), username, action, details, int(bool(success)))))
+
+    def log_admin_action(self, admin_username: str, action: str,
+                         target_user: str = "", details: str = ""):
+        """Queue admin action event."""
+        self._queue.put(("admin", (utc_timestamp(), admin_username, action, target_user, details)))
+
+    def _writer_loop(self):
+        stop = False
+        while not stop:
+            batch = []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch.append(item)
+
+            # Kumpulkan event lain yang sudah menunggu, maksimal batch_size
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if _STOP in batch:
+                stop = True
+            events = [e for e in batch if e is not _STOP]
+            try:
+                if events:
+                    self._write_batch(events)
+            except Exception as e:
+                print(f"❌ Monitoring store write failed: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _action_code(self, action: str, new_codes: Dict[str, Tuple[int, bool]]) -> Tuple[int, bool]:
+        """
+        Kode integer untuk action (dibuat saat pertama kali muncul). Writer thread only.
+        Kode baru dicatat di new_codes dan baru masuk cache setelah batch di-commit:
+        jika batch di-rollback, rowid-nya bisa dipakai ulang untuk action lain.
+        """
+        known = self._action_codes.get(action) or new_codes.get(action)
+        if known:
+            return known
+        is_login = is_login_action(action)
+        self._conn.execute("INSERT OR IGNORE INTO action_codes (action, is_login) VALUES (?, ?)",
+                           (action, int(is_login)))
+        code = self._conn.execute("SELECT code FROM action_codes WHERE action = ?", (action,)).fetchone()[0]
+        new_codes[action] = (code, is_login)
+        return code, is_login
+
+    def _write_batch(self, events: List[tuple]):
+        user_rows = [row for kind, row in events if kind == "user"]
+        admin_rows = [row for kind, row in events if kind == "admin"]
+        new_codes: Dict[str, Tuple[int, bool]] = {}
+        with self._lock, self._conn:
+            if user_rows:
+                hourly, daily = {}, {}
+                logins = failed_logins = 0
+                coded_rows = []
+                for ts, username, action, details, success in user_rows:
+                    code, is_login = self._action_code(action or "", new_codes)
+                    coded_rows.append((ts, username, action, code, details, success))
+                    failure = 0 if success else 1
+                    for bucket, key in ((hourly, ts[:13] + ":00:00"), (daily, ts[:10])):
+                        events_, failures_ = bucket.get((key, username or "", code), (0, 0))
+                        bucket[(key, username or "", code)] = (events_ + 1, failures_ + failure)
+                    if is_login:
+                        logins += 1
+                        failed_logins += failure
+
+                self._conn.executemany("""
+                    INSERT INTO user_activities (timestamp, username, action, action_code, details, success)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, coded_rows)
+                for table, key, bucket in (("activity_rollup_hourly", "hour", hourly),
+                                           ("activity_rollup_daily", "day", daily)):
+                    self._conn.executemany(f"""
+                        INSERT INTO {table} ({key}, username, action_code, events, failures)
+                        VALUES (?, ?, ?, ?, ?)
+                        ON CONFLICT ({key}, username, action_code) DO UPDATE SET
+                            events = events + excluded.events,
+                            failures = failures + excluded.failures
+                    """, [k + v for k, v in bucket.items()])
+                self._bump_counter(COUNTER_LOGINS, logins)
+                self._bump_counter(COUNTER_FAILED_LOGINS, failed_logins)
+            if admin_rows:
+                self._conn.executemany("""
+                    INSERT INTO admin_actions (timestamp, admin_username, action, target_user, details)
+                    VALUES (?, ?, ?, ?, ?)
+                """, admin_rows)
+                self._bump_counter(COUNTER_ADMIN_ACTIONS, len(admin_rows))
+        # Sampai di sini hanya jika commit berhasil
+        self._action_codes.update(new_codes)
+        if user_rows:
+            self.generation["user"] += 1
+        if admin_rows:
+            self.generation["admin"] += 1
+
+    def _bump_counter(self, name: str, delta: int):
+        if delta:
+            self._conn.execute("""
+                INSERT INTO monitoring_counters (name, value) VALUES (?, ?)
+                ON CONFLICT (name) DO UPDATE SET value = value + excluded.value
+            """, (name, delta))
+
+    def flush(self):
+        """Tunggu sampai semua event di antrian sudah di-commit."""
+        self._queue.join()
+
+    # ---------- Reads ----------
+    @contextmanager
+    def cursor(self):
+        """Cursor pada koneksi long-lived (dipakai bergantian dengan writer)."""
+        with self._lock:
+            cur = self._conn.cursor()
+            try:
+                yield cur
+            finally:
+                cur.close()
+
+    def query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self.cursor() as cur:
+            cur.execute(sql, params)
+            return cur.fetchall()
+
+    def query_one(self, sql: str, params: tuple = ()) -> Optional[tuple]:
+        with self.cursor() as cur:
+            cur.execute(sql, params)
+            return cur.fetchone()
+
+    # ---------- Statistics (dari rollup, bukan scan user_activities) ----------
+    def counter(self, name: str) -> int:
+        row = self.query_one("SELECT value FROM monitoring_counters WHERE name = ?", (name,))
+        return row[0] if row else 0
+
+    def active_users_on(self, day: Optional[str] = None) -> int:
+        """Jumlah user unik yang login pada tanggal (UTC) tertentu, default hari ini."""
+        day = day or utc_timestamp()[:10]
+        row = self.query_one("""
+            SELECT COUNT(DISTINCT r.username) FROM activity_rollup_daily r
+            JOIN action_codes c ON c.code = r.action_code
+            WHERE r.day = ? AND c.is_login = 1
+        """, (day,))
+        return row[0] if row else 0
+
+    def _period_source(self, days: int) -> Tuple[str, str, str]:
+        """(tabel rollup, kolom key, cutoff) untuk periode N hari terakhir."""
+        now = datetime.datetime.utcnow()
+        if days <= 1:
+            cutoff = (now - datetime.timedelta(hours=23)).strftime("%Y-%m-%d %H:00:00")
+            return "activity_rollup_hourly", "hour", cutoff
+        cutoff = (now - datetime.timedelta(days=days - 1)).strftime("%Y-%m-%d")
+        return "activity_rollup_daily", "day", cutoff
+
+    def activity_summary(self, days: int, top: int = 10) -> Dict:
+        """
+        Ringkasan aktivitas N hari terakhir.
+        Returns: {'total_activities': int, 'unique_users': int, 'top_users': [(username, count), ...]}
+        """
+        table, key, cutoff = self._period_source(days)
+        total = self.query_one(f"SELECT COALESCE(SUM(events), 0) FROM {table} WHERE {key} >= ?", (cutoff,))[0]
+        unique = self.query_one(f"""
+            SELECT COUNT(DISTINCT r.username) FROM {table} r
+            JOIN action_codes c ON c.code = r.action_code
+            WHERE r.{key} >= ? AND c.is_login = 1
+        """, (cutoff,))[0]
+        top_users = self.query(f"""
+            SELECT NULLIF(username, ''), SUM(events) AS count FROM {table}
+            WHERE {key} >= ?
+            GROUP BY username ORDER BY count DESC LIMIT ?
+        """, (cutoff, top))
+        return {'total_activities': total, 'unique_users': unique, 'top_users': top_users}
+
+    def recent_user_activities(self, limit: int = 100) -> List[tuple]:
+        """[(timestamp, username, action, details, success), ...] terbaru dulu."""
+        return self.query("""
+            SELECT timestamp, username, action, details, success
+            FROM user_activities ORDER BY timestamp DESC LIMIT ?
+        """, (limit,))
+
+    def recent_admin_actions(self, limit: int = 100) -> List[tuple]:
+        """[(timestamp, admin_username, action, target_user, details), ...] terbaru dulu."""
+        return self.query("""
+            SELECT timestamp, admin_username, action, target_user, details
+            FROM admin_actions ORDER BY timestamp DESC LIMIT ?
+        """, (limit,))
+
+    def total_user_activities(self) -> int:
+        row = self.query_one("SELECT COALESCE(SUM(events), 0) FROM activity_rollup_daily")
+        return row[0] if row else 0
+
+    # ---------- Shutdown ----------
+    def close(self):
+        """Flush antrian, hentikan writer thread dan tutup koneksi."""
+        if not self._writer.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._writer.join()
+        with self._lock:
+            try:
+                self._conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+            self._conn.close()
+
+
+# ============================================
+# STREAMING EXPORT
+# ============================================
+
+EXPORT_TABLES = ("user_activities", "admin_actions")
+
+
+class ExportCancelled(Exception):
+    """Raised when an export is cancelled; partial files are removed."""
+
+
+def _open_text(path: str, compress: bool):
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def export_monitoring_data(db_path: str, filename: str, admin_user: str = "",
+                           chunk_size: int = 1000,
+                           progress: Optional[Callable[[int, int], None]] = None,
+                           cancelled: Optional[Callable[[], bool]] = None) -> Dict[str, int]:
+    """
+    Export user_activities & admin_actions secara streaming.
+
+    Format ditentukan dari nama file:
+    - *.ndjson / *.jsonl  -> satu objek JSON per baris (baris pertama = export_info)
+    - *.csv               -> satu file CSV per tabel (<nama>_<tabel>.csv)
+    - tambahan *.gz       -> gzip-compressed
+
+    Memakai koneksi read-only sendiri (WAL: tidak mengganggu writer) dan satu
+    read transaction, jadi snapshot konsisten antar tabel.
+    progress(done, total) dipanggil setiap chunk; cancelled() dicek setiap chunk.
+    Returns: {'user_activities': n, 'admin_actions': n}
+    """
+    compress = filename.endswith(".gz")
+    base = filename[:-3] if compress else filename
+    fmt = "csv" if base.lower().endswith(".csv") else "ndjson"
+
+    conn = sqlite3.connect(Path(db_path).resolve().as_uri() + "?mode=ro", uri=True)
+    written_files: List[str] = []
+    counts = {table: 0 for table in EXPORT_TABLES}
+    try:
+        conn.execute("BEGIN")
+        totals = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                  for table in EXPORT_TABLES}
+        grand_total = sum(totals.values())
+        done = 0
+
+        def tables():
+            for table in EXPORT_TABLES:
+                cur = conn.execute(f"SELECT * FROM {table} ORDER BY timestamp DESC")
+                columns = [d[0] for d in cur.description]
+                yield table, columns, cur
+
+        def chunks(cur):
+            nonlocal done
+            while True:
+                if cancelled and cancelled():
+                    raise ExportCancelled()
+                rows = cur.fetchmany(chunk_size)
+                if not rows:
+                    return
+                yield rows
+                done += len(rows)
+                if progress:
+                    progress(done, grand_total)
+
+        if fmt == "ndjson":
+            written_files.append(filename)
+            with _open_text(filename, compress) as f:
+                f.write(json.dumps({
+                    "export_info": {
+                        "generated_at": datetime.datetime.now().isoformat(),
+                        "admin_user": admin_user,
+                        "total_activities": totals["user_activities"],
+                        "total_admin_actions": totals["admin_actions"],
+                    }
+                }) + "\n")
+                for table, columns, cur in tables():
+                    for rows in chunks(cur):
+                        f.writelines(
+                            json.dumps({"table": table, **dict(zip(columns, row))}, default=str) + "\n"
+                            for row in rows
+                        )
+                        counts[table] += len(rows)
+        else:
+            stem = base[:-4]
+            for table, columns, cur in tables():
+                path = f"{stem}_{table}.csv" + (".gz" if compress else "")
+                written_files.append(path)
+                with _open_text(path, compress) as f:
+                    writer = csv.writer(f)
+                    writer.writerow(columns)
+                    for rows in chunks(cur):
+                        writer.writerows(rows)
+                        counts[table] += len(rows)
+
+        if progress:
+            progress(grand_total, grand_total)
+        return counts
+
+    except ExportCancelled:
+        for path in written_files:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        raise
+    finally:
+        conn.close()
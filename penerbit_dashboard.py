@@ -8,11 +8,21 @@ Enhanced Penerbit (Publisher) Dashboard dengan:
 - Beautiful dark theme
 """
 
+import csv
+import math
+import os
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
 from PyQt5 import QtCore, QtGui, QtWidgets
 from typing import Optional
-from app_db_fixed import (
-    heartbeat, end_session, 
-    create_news, list_my_news, list_published_news
+from app_db_fixed import heartbeat, end_session, list_my_news, list_published_news
+from query_cache import (
+    create_news, update_news,
+    bulk_create_news, bulk_set_news_status, bulk_delete_news
+)
+from draft_journal import DraftJournal, DraftState, content_hash, recover_draft
+from app_db_interactions import (
+    get_author_summary, get_article_daily_stats, get_author_daily_stats, get_penerbit_stats
 )
 
 class StatCard(QtWidgets.QFrame):
@@ -54,6 +64,75 @@ class StatCard(QtWidgets.QFrame):
         self.value_label.setText(str(value))
 
 
+class _BlockStats(QtGui.QTextBlockUserData):
+    """Hitungan kata/karakter yang di-cache per QTextBlock (paragraf)."""
+
+    def __init__(self, words: int, chars: int):
+        super().__init__()
+        self.words = words
+        self.chars = chars
+
+
+class DocumentStats(QtCore.QObject):
+    """
+    Statistik dokumen (kata, karakter, waktu baca) yang inkremental.
+
+    contentsChange hanya menandai blok yang terkena perubahan; hitungan
+    dihitung ulang untuk blok itu saja, dan label di-update setelah debounce.
+    Teks dokumen tidak pernah di-materialize utuh (toPlainText).
+    """
+
+    stats_changed = QtCore.pyqtSignal(int, int, int)  # words, chars, minutes
+    WORDS_PER_MINUTE = 200
+    DEBOUNCE_MS = 250
+
+    def __init__(self, document: QtGui.QTextDocument, parent=None):
+        super().__init__(parent)
+        self.document = document
+        self.words = 0
+        self.chars = 0
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.DEBOUNCE_MS)
+        self._timer.timeout.connect(self.recount)
+
+        document.contentsChange.connect(self._on_contents_change)
+
+    @property
+    def reading_minutes(self) -> int:
+        return math.ceil(self.words / self.WORDS_PER_MINUTE) if self.words else 0
+
+    def _on_contents_change(self, position: int, removed: int, added: int):
+        # Buang cache untuk blok yang terkena; blok lain tetap valid
+        block = self.document.findBlock(position)
+        end = self.document.findBlock(position + added)
+        while block.isValid():
+            block.setUserData(None)
+            if block == end:
+                break
+            block = block.next()
+        self._timer.start()
+
+    def recount(self):
+        """Jumlahkan cache per blok; hanya blok tanpa cache yang di-split."""
+        words = chars = 0
+        block = self.document.begin()
+        while block.isValid():
+            data = block.userData()
+            if data is None:
+                text = block.text()
+                data = _BlockStats(len(text.split()), len(text))
+                block.setUserData(data)
+            words += data.words
+            chars += data.chars
+            block = block.next()
+
+        if (words, chars) != (self.words, self.chars):
+            self.words, self.chars = words, chars
+            self.stats_changed.emit(words, chars, self.reading_minutes)
+
+
 class ModernTextEditor(QtWidgets.QWidget):
     """Modern text editor with formatting toolbar"""
     
@@ -122,7 +201,9 @@ class ModernTextEditor(QtWidgets.QWidget):
         self.btn_bullet.clicked.connect(self._insert_bullet_list)
         self.btn_number.clicked.connect(self._insert_numbered_list)
         
-        self.editor.textChanged.connect(self._update_word_count)
+        # Statistik inkremental (per blok, debounced)
+        self.stats = DocumentStats(self.editor.document(), self)
+        self.stats.stats_changed.connect(self._update_word_count)
         
     def _create_tool_button(self, text, tooltip):
         """Create toolbar button"""
@@ -190,10 +271,8 @@ class ModernTextEditor(QtWidgets.QWidget):
         cursor.createList(list_fmt)
         self.editor.setFocus()
     
-    def _update_word_count(self):
-        text = self.editor.toPlainText()
-        words = len([w for w in text.split() if w])
-        self.word_count.setText(f"{words} words")
+    def _update_word_count(self, words, chars, minutes):
+        self.word_count.setText(f"{words} words • {chars} chars • {minutes} min read")
     
     def get_html(self):
         """Get HTML content"""
@@ -212,13 +291,466 @@ class ModernTextEditor(QtWidgets.QWidget):
         self.editor.clear()
 
 
+class ArticleTableModel(QtCore.QAbstractTableModel):
+    """
+    Model tabel artikel milik penerbit.
+
+    Row = (id, title, status, created) seperti list_my_news()/create_news().
+    Artikel baru/diubah di-patch langsung lewat upsert(), tanpa reload.
+    """
+
+    HEADERS = ["ID", "Title", "Status", "Created", "Actions"]
+    COL_STATUS = 2
+    COL_ACTIONS = 4
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._row_by_id = {}
+
+    # ---------- Qt model API ----------
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        aid, title, status, created = self._rows[index.row()]
+        col = index.column()
+
+        if role == QtCore.Qt.DisplayRole:
+            if col == 0:
+                return str(aid)
+            if col == 1:
+                return title
+            if col == self.COL_STATUS:
+                return status
+            if col == 3:
+                return created or "N/A"
+        elif role == QtCore.Qt.UserRole:
+            return aid
+        return None
+
+    # ---------- Data ----------
+    def set_rows(self, rows):
+        """Ganti semua data (load awal / tombol Refresh)."""
+        self.beginResetModel()
+        self._rows = [tuple(r) for r in rows]
+        self._reindex()
+        self.endResetModel()
+
+    def upsert(self, row):
+        """Patch artikel yang sudah ada, atau sisipkan di paling atas."""
+        row = tuple(row)
+        pos = self._row_by_id.get(row[0])
+        if pos is not None:
+            self._rows[pos] = row
+            self.dataChanged.emit(self.index(pos, 0), self.index(pos, len(self.HEADERS) - 1))
+            return
+        self.beginInsertRows(QtCore.QModelIndex(), 0, 0)
+        self._rows.insert(0, row)
+        self._reindex()
+        self.endInsertRows()
+
+    def upsert_many(self, rows):
+        """Seperti upsert() berulang, tapi baris baru disisipkan sekaligus."""
+        new_rows = {}
+        for row in rows:
+            row = tuple(row)
+            pos = self._row_by_id.get(row[0])
+            if pos is not None:
+                self._rows[pos] = row
+                self.dataChanged.emit(self.index(pos, 0), self.index(pos, len(self.HEADERS) - 1))
+            else:
+                new_rows.pop(row[0], None)
+                new_rows[row[0]] = row
+        if not new_rows:
+            return
+        # Urutan sama dengan upsert() satu per satu: yang terakhir di paling atas
+        self.beginInsertRows(QtCore.QModelIndex(), 0, len(new_rows) - 1)
+        self._rows[:0] = reversed(list(new_rows.values()))
+        self._reindex()
+        self.endInsertRows()
+
+    def remove_ids(self, ids):
+        """Hapus baris untuk id yang sudah dihapus di server."""
+        ids = set(ids)
+        for pos in sorted((self._row_by_id[i] for i in ids if i in self._row_by_id), reverse=True):
+            self.beginRemoveRows(QtCore.QModelIndex(), pos, pos)
+            del self._rows[pos]
+            self.endRemoveRows()
+        self._reindex()
+
+    def row_values(self, row: int):
+        return self._rows[row]
+
+    def row_for_id(self, article_id: int):
+        pos = self._row_by_id.get(article_id)
+        return self._rows[pos] if pos is not None else None
+
+    def _reindex(self):
+        self._row_by_id = {r[0]: i for i, r in enumerate(self._rows)}
+
+
+class StatusBadgeDelegate(QtWidgets.QStyledItemDelegate):
+    """Gambar status sebagai badge (tanpa cell widget per baris)."""
+
+    COLORS = {"published": "#10b981"}
+    DEFAULT_COLOR = "#6b7280"
+
+    def paint(self, painter, option, index):
+        status = index.data() or ""
+        if option.state & QtWidgets.QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+
+        font = QtGui.QFont(option.font)
+        font.setPointSize(8)
+        font.setWeight(QtGui.QFont.DemiBold)
+        text = status.upper()
+        metrics = QtGui.QFontMetrics(font)
+        width = metrics.horizontalAdvance(text) + 24
+        height = metrics.height() + 8
+        rect = QtCore.QRect(option.rect.left() + 8,
+                            option.rect.center().y() - height // 2,
+                            width, height)
+
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setPen(QtCore.Qt.NoPen)
+        painter.setBrush(QtGui.QColor(self.COLORS.get(status, self.DEFAULT_COLOR)))
+        painter.drawRoundedRect(rect, height / 2, height / 2)
+        painter.setFont(font)
+        painter.setPen(QtCore.Qt.white)
+        painter.drawText(rect, QtCore.Qt.AlignCenter, text)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        return QtCore.QSize(110, 40)
+
+
+class ArticleActionsDelegate(QtWidgets.QStyledItemDelegate):
+    """
+    Tombol View / Edit / Delete digambar oleh delegate.
+    Klik dikirim lewat sinyal action_clicked(action, article_id).
+    """
+
+    action_clicked = QtCore.pyqtSignal(str, int)
+
+    # (action, icon, tooltip, border color)
+    BUTTONS = [
+        ("view", "👁️", "View article", "#25262f"),
+        ("edit", "✏️", "Edit article", "#25262f"),
+        ("delete", "🗑️", "Delete article", "#ef4444"),
+    ]
+    BUTTON_SIZE = 32
+    SPACING = 4
+    MARGIN = 4
+
+    def _button_rects(self, rect):
+        top = rect.center().y() - self.BUTTON_SIZE // 2
+        left = rect.left() + self.MARGIN
+        rects = []
+        for _ in self.BUTTONS:
+            rects.append(QtCore.QRect(left, top, self.BUTTON_SIZE, self.BUTTON_SIZE))
+            left += self.BUTTON_SIZE + self.SPACING
+        return rects
+
+    def _button_at(self, rect, pos):
+        for (action, _, tooltip, _), button_rect in zip(self.BUTTONS, self._button_rects(rect)):
+            if button_rect.contains(pos):
+                return action, tooltip
+        return None, None
+
+    def paint(self, painter, option, index):
+        if option.state & QtWidgets.QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        for (_, icon, _, color), rect in zip(self.BUTTONS, self._button_rects(option.rect)):
+            painter.setPen(QtGui.QColor(color))
+            painter.setBrush(QtCore.Qt.NoBrush)
+            painter.drawRoundedRect(rect.adjusted(0, 0, -1, -1), 6, 6)
+            painter.setPen(option.palette.text().color())
+            painter.drawText(rect, QtCore.Qt.AlignCenter, icon)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        count = len(self.BUTTONS)
+        width = 2 * self.MARGIN + count * self.BUTTON_SIZE + (count - 1) * self.SPACING
+        return QtCore.QSize(width, self.BUTTON_SIZE + 2 * self.MARGIN)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QtCore.QEvent.MouseButtonRelease \
+                and event.button() == QtCore.Qt.LeftButton:
+            action, _ = self._button_at(option.rect, event.pos())
+            if action:
+                self.action_clicked.emit(action, int(index.data(QtCore.Qt.UserRole)))
+                return True
+        return super().editorEvent(event, model, option, index)
+
+    def helpEvent(self, event, view, option, index):
+        if event.type() == QtCore.QEvent.ToolTip:
+            _, tooltip = self._button_at(option.rect, event.pos())
+            if tooltip:
+                QtWidgets.QToolTip.showText(event.globalPos(), tooltip, view)
+                return True
+        return super().helpEvent(event, view, option, index)
+
+
+class DraftAutosave(QtCore.QObject):
+    """
+    Autosave untuk form artikel.
+
+    - Setiap jeda mengetik (debounce) perubahan dijurnal ke DraftJournal
+      (delta, append-only, fsync di background)
+    - Setiap PUSH_INTERVAL_MS draft dikirim ke DB di worker thread, hanya
+      jika hash isinya berbeda dengan yang terakhir tersimpan
+    - Push pertama membuat draft (create_news), berikutnya update_news
+    """
+
+    saved = QtCore.pyqtSignal(object)  # row (id, title, status, created)
+    _finished = QtCore.pyqtSignal(object, object)  # future, row (worker -> UI thread)
+
+    JOURNAL_DEBOUNCE_MS = 1000
+    PUSH_INTERVAL_MS = 15000
+
+    def __init__(self, username: str, title_input: QtWidgets.QLineEdit,
+                 editor: "ModernTextEditor", journal: DraftJournal, parent=None):
+        super().__init__(parent)
+        self.username = username
+        self.title_input = title_input
+        self.editor = editor
+        self.journal = journal
+        self.draft_id: Optional[int] = None
+        self.saved_hash: Optional[str] = None
+        self._dirty = False  # ada ketikan sejak push terakhir
+        self._inflight: Optional[Future] = None
+        self._inflight_hash: Optional[str] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="DraftAutosave")
+        self._finished.connect(self._apply_result)
+
+        self._journal_timer = QtCore.QTimer(self)
+        self._journal_timer.setSingleShot(True)
+        self._journal_timer.setInterval(self.JOURNAL_DEBOUNCE_MS)
+        self._journal_timer.timeout.connect(self._write_journal)
+
+        self._push_timer = QtCore.QTimer(self)
+        self._push_timer.timeout.connect(self._push)
+        self._push_timer.start(self.PUSH_INTERVAL_MS)
+
+        title_input.textChanged.connect(self._on_edit)
+        editor.editor.textChanged.connect(self._on_edit)
+
+    def _current(self):
+        return self.title_input.text().strip(), self.editor.get_plain_text().strip()
+
+    def _on_edit(self, *_):
+        self._dirty = True
+        self._journal_timer.start()
+
+    def _write_journal(self):
+        self.journal.record(self.title_input.text(), self.editor.get_plain_text())
+
+    def _push(self):
+        """Kirim draft ke DB jika isinya berubah (tidak pernah blok UI)."""
+        if not self._dirty or self._inflight is not None:
+            return
+        self._dirty = False
+        title, content = self._current()
+        if not title or not content:
+            return
+        digest = content_hash(title, content)
+        if digest == self.saved_hash:
+            return
+
+        self._write_journal()
+        draft_id = self.draft_id
+        self._inflight = self._executor.submit(self._save, draft_id, title, content)
+        self._inflight_hash = digest
+        self._inflight.add_done_callback(self._on_done)
+
+    def _save(self, draft_id, title, content):
+        if draft_id:
+            return update_news(self.username, draft_id, title, content)
+        return create_news(self.username, title, content, publish=False)
+
+    @staticmethod
+    def _result(future: Future):
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"⚠️ Autosave failed: {e}")
+            return None
+
+    def _on_done(self, future: Future):
+        """Dipanggil di worker thread; hasil diteruskan ke UI thread."""
+        self._finished.emit(future, self._result(future))
+
+    def _apply_result(self, future: Future, row):
+        """UI thread: catat hasil push (sekali per future)."""
+        if future is not self._inflight:
+            return
+        self._inflight = None
+        if not row:
+            self._dirty = True  # coba lagi di tick berikutnya
+            return
+        self.draft_id = row[0]
+        self.saved_hash = self._inflight_hash
+        self.journal.mark_saved(row[0], self.saved_hash)
+        self.saved.emit(row)
+
+    def wait_idle(self):
+        """Tunggu push yang sedang berjalan (dipakai sebelum save manual)."""
+        future = self._inflight
+        if future is not None:
+            self._apply_result(future, self._result(future))
+
+    def mark_saved(self, row):
+        """Catat hasil save manual agar autosave tidak menulis ulang."""
+        title, content = self._current()
+        self.draft_id = row[0]
+        self.saved_hash = content_hash(title, content)
+        self._dirty = False
+        self._write_journal()
+        self.journal.mark_saved(row[0], self.saved_hash)
+
+    def restore(self, state: DraftState):
+        self.draft_id = state.draft_id
+        self.saved_hash = state.saved_hash
+        self.journal.start(state)
+        self.title_input.setText(state.title)
+        self.editor.set_text(state.content)
+        self._journal_timer.stop()
+
+    def reset(self):
+        """Form dikosongkan: mulai draft baru dengan journal kosong."""
+        self._journal_timer.stop()
+        self.wait_idle()
+        self.draft_id = None
+        self.saved_hash = None
+        self._dirty = False
+        self.journal.start()
+
+    def close(self):
+        self._push_timer.stop()
+        if self._journal_timer.isActive():
+            self._journal_timer.stop()
+            self._write_journal()
+        self._executor.shutdown(wait=True)
+        self.journal.close()
+
+
+class DailyBarChart(QtWidgets.QWidget):
+    """
+    Bar chart harian sederhana (views) + garis unique viewers.
+    Digambar langsung di paintEvent; hover menampilkan angka per hari.
+    """
+
+    BAR_COLOR = "#7c5cff"
+    LINE_COLOR = "#10b981"
+    AXIS_COLOR = "#2d3748"
+    TEXT_COLOR = "#9ca3af"
+    MARGIN = 32
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(220)
+        self.setMouseTracking(True)
+        # [(day, views, unique_viewers, likes, bookmarks), ...]
+        self._rows = []
+
+    def set_rows(self, rows):
+        self._rows = list(rows)
+        self.update()
+
+    def _plot_rect(self) -> QtCore.QRectF:
+        return QtCore.QRectF(self.MARGIN, 12, self.width() - self.MARGIN - 12,
+                             self.height() - self.MARGIN - 12)
+
+    def _day_at(self, x: float) -> Optional[int]:
+        plot = self._plot_rect()
+        if not self._rows or not plot.left() <= x <= plot.right():
+            return None
+        return min(int((x - plot.left()) / (plot.width() / len(self._rows))), len(self._rows) - 1)
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        plot = self._plot_rect()
+
+        painter.setPen(QtGui.QColor(self.AXIS_COLOR))
+        painter.drawLine(plot.bottomLeft(), plot.bottomRight())
+        if not self._rows:
+            painter.setPen(QtGui.QColor(self.TEXT_COLOR))
+            painter.drawText(self.rect(), QtCore.Qt.AlignCenter, "No data yet")
+            return
+
+        peak = max(max(r[1] for r in self._rows), 1)
+        slot = plot.width() / len(self._rows)
+        bar_width = max(slot * 0.7, 1.0)
+
+        painter.setPen(QtGui.QColor(self.TEXT_COLOR))
+        painter.drawText(QtCore.QRectF(0, plot.top() - 6, self.MARGIN - 4, 14),
+                         QtCore.Qt.AlignRight, str(peak))
+
+        painter.setPen(QtCore.Qt.NoPen)
+        painter.setBrush(QtGui.QColor(self.BAR_COLOR))
+        for i, row in enumerate(self._rows):
+            height = plot.height() * row[1] / peak
+            painter.drawRect(QtCore.QRectF(plot.left() + i * slot + (slot - bar_width) / 2,
+                                           plot.bottom() - height, bar_width, height))
+
+        line = QtGui.QPolygonF([
+            QtCore.QPointF(plot.left() + (i + 0.5) * slot, plot.bottom() - plot.height() * row[2] / peak)
+            for i, row in enumerate(self._rows)
+        ])
+        painter.setPen(QtGui.QPen(QtGui.QColor(self.LINE_COLOR), 2))
+        painter.drawPolyline(line)
+
+        # Label hari pertama & terakhir
+        painter.setPen(QtGui.QColor(self.TEXT_COLOR))
+        painter.drawText(QtCore.QRectF(plot.left(), plot.bottom() + 4, 100, 16),
+                         QtCore.Qt.AlignLeft, self._rows[0][0])
+        painter.drawText(QtCore.QRectF(plot.right() - 100, plot.bottom() + 4, 100, 16),
+                         QtCore.Qt.AlignRight, self._rows[-1][0])
+
+    def mouseMoveEvent(self, event):
+        i = self._day_at(event.pos().x())
+        if i is None:
+            QtWidgets.QToolTip.hideText()
+            return
+        day, views, unique, likes, bookmarks = self._rows[i]
+        QtWidgets.QToolTip.showText(
+            event.globalPos(),
+            f"{day}\n👁️ {views:,} views ({unique:,} unique)\n❤️ {likes:,}  🔖 {bookmarks:,}",
+            self,
+        )
+
+
 class PenerbitDashboard(QtWidgets.QMainWindow):
     """Modern Penerbit Dashboard"""
     
+    ANALYTICS_PERIODS = {"Last 7 days": 7, "Last 30 days": 30, "Last 90 days": 90}
+    
+    _analytics_loaded = QtCore.pyqtSignal(int, list, int)  # request seq, rows, unique readers
+    
     def __init__(self, username: str, session_id: Optional[int] = None):
         super().__init__()
         self.username = username
         self.session_id = session_id
+        self._stats_token = None  # change token dari get_author_summary
+        self._analytics_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="Analytics")
+        self._analytics_seq = 0
+        self._analytics_loaded.connect(self._on_analytics_loaded)
         
         self.setWindowTitle(f"Crypto Insight • Penerbit Dashboard")
         self.resize(1400, 900)
@@ -227,6 +759,7 @@ class PenerbitDashboard(QtWidgets.QMainWindow):
         self._apply_style()
         self._load_statistics()
         self._load_my_articles()
+        self._setup_autosave()
         
         # Heartbeat timer
         if self.session_id:
@@ -274,6 +807,11 @@ class PenerbitDashboard(QtWidgets.QMainWindow):
         self.tab_feed = self._create_feed_tab()
         self.tabs.addTab(self.tab_feed, "🌐  Published Feed")
         
+        # Tab 4: Analytics (dimuat saat tab dibuka)
+        self.tab_analytics = self._create_analytics_tab()
+        self.tabs.addTab(self.tab_analytics, "📈  Analytics")
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+        
         main_layout.addWidget(self.tabs)
         
     def _create_header(self):
@@ -318,7 +856,7 @@ class PenerbitDashboard(QtWidgets.QMainWindow):
         self.card_total = StatCard("Total Articles", "0", "📝", "#7c5cff")
         self.card_published = StatCard("Published", "0", "✅", "#10b981")
         self.card_draft = StatCard("Drafts", "0", "📄", "#f59e0b")
-        self.card_views = StatCard("Total Views", "N/A", "👁️", "#3b82f6")
+        self.card_views = StatCard("Total Views", "0", "👁️", "#3b82f6")
         
         row.addWidget(self.card_total)
         row.addWidget(self.card_published)
@@ -406,6 +944,23 @@ class PenerbitDashboard(QtWidgets.QMainWindow):
         refresh_btn.clicked.connect(self._load_my_articles)
         
         toolbar.addWidget(refresh_btn)
+        
+        # Bulk actions (berlaku untuk semua baris yang dipilih)
+        self.btn_bulk_publish = QtWidgets.QPushButton("✅ Publish")
+        self.btn_bulk_publish.clicked.connect(lambda: self._bulk_set_status(True))
+        self.btn_bulk_unpublish = QtWidgets.QPushButton("📄 Unpublish")
+        self.btn_bulk_unpublish.clicked.connect(lambda: self._bulk_set_status(False))
+        self.btn_bulk_delete = QtWidgets.QPushButton("🗑️ Delete")
+        self.btn_bulk_delete.clicked.connect(self._bulk_delete)
+        import_btn = QtWidgets.QPushButton("📥 Import CSV")
+        import_btn.setObjectName("toolbarBtn")
+        import_btn.clicked.connect(self._import_csv)
+        
+        for btn in (self.btn_bulk_publish, self.btn_bulk_unpublish, self.btn_bulk_delete):
+            btn.setObjectName("toolbarBtn")
+            btn.setEnabled(False)
+            toolbar.addWidget(btn)
+        toolbar.addWidget(import_btn)
         toolbar.addStretch()
         
         search_input = QtWidgets.QLineEdit()
@@ -417,25 +972,35 @@ class PenerbitDashboard(QtWidgets.QMainWindow):
         
         layout.addLayout(toolbar)
         
-        # Articles table
-        self.table_articles = QtWidgets.QTableWidget(0, 5)
+        # Articles table (model/view + delegate, tanpa cell widget per baris)
+        self.articles_model = ArticleTableModel(self)
+        self.table_articles = QtWidgets.QTableView()
         self.table_articles.setObjectName("articlesTable")
-        self.table_articles.setHorizontalHeaderLabels([
-            "ID", "Title", "Status", "Created", "Actions"
-        ])
+        self.table_articles.setModel(self.articles_model)
+        self.table_articles.verticalHeader().setVisible(False)
+        self.table_articles.verticalHeader().setDefaultSectionSize(44)
+        
+        self.status_delegate = StatusBadgeDelegate(self.table_articles)
+        self.actions_delegate = ArticleActionsDelegate(self.table_articles)
+        self.actions_delegate.action_clicked.connect(self._on_article_action)
+        self.table_articles.setItemDelegateForColumn(ArticleTableModel.COL_STATUS, self.status_delegate)
+        self.table_articles.setItemDelegateForColumn(ArticleTableModel.COL_ACTIONS, self.actions_delegate)
         
         header = self.table_articles.horizontalHeader()
         header.setStretchLastSection(False)
         header.setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeToContents)
         header.setSectionResizeMode(1, QtWidgets.QHeaderView.Stretch)
-        header.setSectionResizeMode(2, QtWidgets.QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(2, QtWidgets.QHeaderView.Fixed)
         header.setSectionResizeMode(3, QtWidgets.QHeaderView.ResizeToContents)
         header.setSectionResizeMode(4, QtWidgets.QHeaderView.Fixed)
+        self.table_articles.setColumnWidth(2, 120)
         self.table_articles.setColumnWidth(4, 150)
         
         self.table_articles.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table_articles.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
         self.table_articles.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
         self.table_articles.setAlternatingRowColors(True)
+        self.table_articles.selectionModel().selectionChanged.connect(self._update_bulk_buttons)
         
         layout.addWidget(self.table_articles)
         
@@ -480,6 +1045,144 @@ class PenerbitDashboard(QtWidgets.QMainWindow):
         
         return widget
     
+    def _create_analytics_tab(self):
+        """Create analytics tab (views per hari dari rollup harian)"""
+        widget = QtWidgets.QWidget()
+        layout = QtWidgets.QVBoxLayout(widget)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(16)
+        
+        # Toolbar: scope (semua artikel / satu artikel) + periode
+        toolbar = QtWidgets.QHBoxLayout()
+        
+        self.analytics_scope = QtWidgets.QComboBox()
+        self.analytics_scope.setObjectName("analyticsCombo")
+        self.analytics_scope.setMinimumWidth(320)
+        self.analytics_scope.addItem("All my articles", None)
+        
+        self.analytics_period = QtWidgets.QComboBox()
+        self.analytics_period.setObjectName("analyticsCombo")
+        self.analytics_period.addItems(list(self.ANALYTICS_PERIODS))
+        self.analytics_period.setCurrentIndex(1)
+        
+        refresh_btn = QtWidgets.QPushButton("🔄 Refresh")
+        refresh_btn.setObjectName("toolbarBtn")
+        refresh_btn.clicked.connect(self._load_analytics)
+        
+        self.analytics_scope.currentIndexChanged.connect(self._load_analytics)
+        self.analytics_period.currentIndexChanged.connect(self._load_analytics)
+        
+        toolbar.addWidget(self.analytics_scope)
+        toolbar.addWidget(self.analytics_period)
+        toolbar.addWidget(refresh_btn)
+        toolbar.addStretch()
+        layout.addLayout(toolbar)
+        
+        self.analytics_summary = QtWidgets.QLabel("")
+        self.analytics_summary.setObjectName("infoLabel")
+        layout.addWidget(self.analytics_summary)
+        
+        self.analytics_chart = DailyBarChart()
+        layout.addWidget(self.analytics_chart, 1)
+        
+        self.table_analytics = QtWidgets.QTableWidget(0, 5)
+        self.table_analytics.setObjectName("feedTable")
+        self.table_analytics.setHorizontalHeaderLabels([
+            "Day", "Views", "Unique Viewers", "Likes", "Bookmarks"
+        ])
+        self.table_analytics.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
+        self.table_analytics.verticalHeader().setVisible(False)
+        self.table_analytics.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table_analytics.setAlternatingRowColors(True)
+        layout.addWidget(self.table_analytics, 1)
+        
+        return widget
+    
+    def _on_tab_changed(self, index):
+        if self.tabs.widget(index) is self.tab_analytics:
+            self._refresh_analytics_scopes()
+            self._load_analytics()
+    
+    def _refresh_analytics_scopes(self):
+        """Isi pilihan artikel dari tabel My Articles (tanpa query baru)"""
+        current = self.analytics_scope.currentData()
+        self.analytics_scope.blockSignals(True)
+        self.analytics_scope.clear()
+        self.analytics_scope.addItem("All my articles", None)
+        for row in range(self.articles_model.rowCount()):
+            aid, title, _, _ = self.articles_model.row_values(row)
+            self.analytics_scope.addItem(f"#{aid} • {title}", aid)
+        pos = self.analytics_scope.findData(current)
+        self.analytics_scope.setCurrentIndex(max(pos, 0))
+        self.analytics_scope.blockSignals(False)
+    
+    def _load_analytics(self, *_):
+        """Ambil time series di worker thread; hasil lama (seq basi) diabaikan"""
+        self._analytics_seq += 1
+        seq = self._analytics_seq
+        article_id = self.analytics_scope.currentData()
+        days = self.ANALYTICS_PERIODS.get(self.analytics_period.currentText(), 30)
+        self.analytics_summary.setText("⏳ Loading analytics...")
+        self._analytics_executor.submit(self._fetch_analytics, seq, article_id, days)
+    
+    def _fetch_analytics(self, seq, article_id, days):
+        unique = -1  # -1 = tidak tersedia
+        try:
+            if article_id is None:
+                rows = get_author_daily_stats(self.username, days)
+                unique = get_penerbit_stats(self.username, days)['period_unique']
+            else:
+                rows = get_article_daily_stats(article_id, days)
+        except Exception as e:
+            print(f"⚠️ Error loading analytics: {e}")
+            rows = []
+        self._analytics_loaded.emit(seq, rows, unique)
+    
+    def _on_analytics_loaded(self, seq, rows, unique):
+        if seq != self._analytics_seq:
+            return  # pilihan sudah berubah
+        
+        self.analytics_chart.set_rows(rows)
+        views = sum(r[1] for r in rows)
+        likes = sum(r[3] for r in rows)
+        bookmarks = sum(r[4] for r in rows)
+        summary = f"👁️ {views:,} views  •  ❤️ {likes:,} likes  •  🔖 {bookmarks:,} bookmarks"
+        if unique >= 0:
+            summary += f"  •  👥 ~{unique:,} unique readers"
+        self.analytics_summary.setText(summary)
+        
+        # Hari terbaru di atas
+        self.table_analytics.setRowCount(len(rows))
+        for i, row in enumerate(reversed(rows)):
+            for col, value in enumerate(row):
+                item = QtWidgets.QTableWidgetItem(value if col == 0 else f"{value:,}")
+                if col:
+                    item.setTextAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+                self.table_analytics.setItem(i, col, item)
+    
+    def _setup_autosave(self):
+        """Journal lokal per user + recovery draft setelah crash"""
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", self.username)
+        journal_path = os.path.join("drafts", f"{safe_name}.journal")
+        
+        state = recover_draft(journal_path)
+        self.journal = DraftJournal(journal_path)
+        self.autosave = DraftAutosave(self.username, self.input_title, self.editor,
+                                      self.journal, self)
+        self.autosave.saved.connect(self.articles_model.upsert)
+        
+        if state and state.has_unsaved_changes:
+            reply = QtWidgets.QMessageBox.question(
+                self, "Recover Draft",
+                f"An unsaved draft was found:\n\n'{state.title or 'Untitled'}'\n\n"
+                "Do you want to restore it?",
+                QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No
+            )
+            if reply == QtWidgets.QMessageBox.Yes:
+                self.autosave.restore(state)
+                return
+        self.journal.start()
+    
     def _save_article(self, publish=True):
         """Save article as draft or publish"""
         title = self.input_title.text().strip()
@@ -501,22 +1204,34 @@ class PenerbitDashboard(QtWidgets.QMainWindow):
             self.editor.editor.setFocus()
             return
         
-        # Save to database
-        success = create_news(self.username, title, content, publish=publish)
+        # Save to database (update draft hasil autosave jika sudah ada)
+        self.autosave.wait_idle()
+        draft_id = self.autosave.draft_id
+        if draft_id:
+            row = update_news(self.username, draft_id, title, content, publish=publish)
+        else:
+            row = create_news(self.username, title, content, publish=publish)
         
-        if success:
+        if row:
+            self.autosave.mark_saved(row)
             status = "published" if publish else "saved as draft"
             QtWidgets.QMessageBox.information(
                 self, "Success",
                 f"Article '{title}' has been {status}!"
             )
             
-            self._clear_form()
+            # Artikel sudah tersimpan: kosongkan form tanpa konfirmasi, supaya
+            # autosave tidak lanjut menulis ke artikel yang baru disimpan
+            self._reset_form()
             self._load_statistics()
-            self._load_my_articles()
+            # Patch tabel di tempat, tanpa reload
+            self.articles_model.upsert(row)
             
             if publish:
-                self._load_feed()
+                if self.table_feed.rowCount() and not draft_id:
+                    self._prepend_feed_row(row)
+                else:
+                    self._load_feed()
         else:
             QtWidgets.QMessageBox.critical(
                 self, "Error",
@@ -532,94 +1247,124 @@ class PenerbitDashboard(QtWidgets.QMainWindow):
         )
         
         if reply == QtWidgets.QMessageBox.Yes:
-            self.input_title.clear()
-            self.editor.clear()
-            self.input_title.setFocus()
+            self._reset_form()
+    
+    def _reset_form(self):
+        """Kosongkan form dan mulai draft baru (autosave + journal)"""
+        self.input_title.clear()
+        self.editor.clear()
+        self.autosave.reset()
+        self.input_title.setFocus()
     
     def _load_statistics(self):
-        """Load and update statistics"""
-        articles = list_my_news(self.username, limit=1000)
+        """Load and update statistics (satu query agregat, skip jika tidak berubah)"""
+        summary = get_author_summary(self.username)
         
-        total = len(articles)
-        published = len([a for a in articles if a[2] == 'published'])
-        draft = len([a for a in articles if a[2] == 'draft'])
+        token = summary['change_token']
+        if token and token == self._stats_token:
+            return
+        self._stats_token = token
         
-        self.card_total.update_value(total)
-        self.card_published.update_value(published)
-        self.card_draft.update_value(draft)
+        self.card_total.update_value(summary['total'])
+        self.card_published.update_value(summary['published'])
+        self.card_draft.update_value(summary['draft'])
+        self.card_views.update_value(f"{summary['views']:,}")
     
     def _load_my_articles(self):
         """Load my articles into table"""
-        articles = list_my_news(self.username, limit=100)
+        self.articles_model.set_rows(list_my_news(self.username, limit=100))
+    
+    def _on_article_action(self, action: str, article_id: int):
+        """Handle tombol aksi dari ArticleActionsDelegate"""
+        article = self.articles_model.row_for_id(article_id)
+        if not article:
+            return
+        aid, title, status, created = article
         
-        self.table_articles.setRowCount(len(articles))
+        if action == "view":
+            QtWidgets.QMessageBox.information(
+                self, "Article",
+                f"#{aid} • {title}\nStatus: {status}\nCreated: {created or 'N/A'}"
+            )
+        elif action == "delete":
+            self._delete_articles([aid])
+    
+    def _selected_article_ids(self):
+        rows = self.table_articles.selectionModel().selectedRows()
+        return [self.articles_model.row_values(index.row())[0] for index in rows]
+    
+    def _update_bulk_buttons(self, *_):
+        has_selection = self.table_articles.selectionModel().hasSelection()
+        for btn in (self.btn_bulk_publish, self.btn_bulk_unpublish, self.btn_bulk_delete):
+            btn.setEnabled(has_selection)
+    
+    def _bulk_set_status(self, publish: bool):
+        """Publish / unpublish semua artikel terpilih dalam satu UPDATE"""
+        ids = self._selected_article_ids()
+        if not ids:
+            return
         
-        for row, (aid, title, status, created) in enumerate(articles):
-            # ID
-            id_item = QtWidgets.QTableWidgetItem(str(aid))
-            self.table_articles.setItem(row, 0, id_item)
-            
-            # Title
-            title_item = QtWidgets.QTableWidgetItem(title)
-            self.table_articles.setItem(row, 1, title_item)
-            
-            # Status with badge
-            status_widget = QtWidgets.QWidget()
-            status_layout = QtWidgets.QHBoxLayout(status_widget)
-            status_layout.setContentsMargins(8, 4, 8, 4)
-            
-            status_label = QtWidgets.QLabel(status.upper())
-            status_label.setObjectName("statusBadge")
-            
-            if status == 'published':
-                status_label.setStyleSheet("""
-                    background: #10b981; color: white;
-                    padding: 4px 12px; border-radius: 12px;
-                    font-size: 11px; font-weight: 600;
-                """)
-            else:
-                status_label.setStyleSheet("""
-                    background: #6b7280; color: white;
-                    padding: 4px 12px; border-radius: 12px;
-                    font-size: 11px; font-weight: 600;
-                """)
-            
-            status_layout.addWidget(status_label)
-            status_layout.addStretch()
-            
-            self.table_articles.setCellWidget(row, 2, status_widget)
-            
-            # Created
-            created_item = QtWidgets.QTableWidgetItem(created or "N/A")
-            self.table_articles.setItem(row, 3, created_item)
-            
-            # Actions
-            actions_widget = QtWidgets.QWidget()
-            actions_layout = QtWidgets.QHBoxLayout(actions_widget)
-            actions_layout.setContentsMargins(4, 4, 4, 4)
-            actions_layout.setSpacing(4)
-            
-            btn_view = QtWidgets.QPushButton("👁️")
-            btn_view.setToolTip("View article")
-            btn_view.setFixedSize(32, 32)
-            btn_view.setObjectName("actionBtn")
-            
-            btn_edit = QtWidgets.QPushButton("✏️")
-            btn_edit.setToolTip("Edit article")
-            btn_edit.setFixedSize(32, 32)
-            btn_edit.setObjectName("actionBtn")
-            
-            btn_delete = QtWidgets.QPushButton("🗑️")
-            btn_delete.setToolTip("Delete article")
-            btn_delete.setFixedSize(32, 32)
-            btn_delete.setObjectName("actionBtnDanger")
-            
-            actions_layout.addWidget(btn_view)
-            actions_layout.addWidget(btn_edit)
-            actions_layout.addWidget(btn_delete)
-            actions_layout.addStretch()
-            
-            self.table_articles.setCellWidget(row, 4, actions_widget)
+        rows = bulk_set_news_status(self.username, ids, publish)
+        self.articles_model.upsert_many(rows)
+        if rows:
+            self._load_statistics()
+            self._load_feed()
+    
+    def _bulk_delete(self):
+        self._delete_articles(self._selected_article_ids())
+    
+    def _delete_articles(self, ids):
+        """Hapus artikel (satu DELETE untuk semua id) setelah konfirmasi"""
+        if not ids:
+            return
+        
+        reply = QtWidgets.QMessageBox.question(
+            self, "Delete Articles",
+            f"Delete {len(ids)} article(s)? This cannot be undone.",
+            QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No
+        )
+        if reply != QtWidgets.QMessageBox.Yes:
+            return
+        
+        deleted = bulk_delete_news(self.username, ids)
+        if not deleted:
+            QtWidgets.QMessageBox.critical(
+                self, "Error",
+                "Failed to delete articles. Please check database connection."
+            )
+            return
+        
+        self.articles_model.remove_ids(deleted)
+        self._load_statistics()
+        self._load_feed()
+    
+    def _import_csv(self):
+        """Import artikel dari CSV (kolom: title, content) sebagai draft"""
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Import Articles", "", "CSV Files (*.csv)"
+        )
+        if not path:
+            return
+        
+        try:
+            with open(path, newline='', encoding='utf-8-sig') as f:
+                articles = [
+                    ((row.get('title') or '').strip(), (row.get('content') or '').strip())
+                    for row in csv.DictReader(f)
+                ]
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Import Failed", f"Cannot read CSV:\n{e}")
+            return
+        
+        rows = bulk_create_news(self.username, articles, publish=False)
+        self.articles_model.upsert_many(rows)
+        if rows:
+            self._load_statistics()
+        
+        QtWidgets.QMessageBox.information(
+            self, "Import Complete",
+            f"Imported {len(rows)} of {len(articles)} article(s) as drafts."
+        )
     
     def _load_feed(self):
         """Load published feed"""
@@ -633,6 +1378,15 @@ class PenerbitDashboard(QtWidgets.QMainWindow):
             self.table_feed.setItem(row, 2, QtWidgets.QTableWidgetItem(author))
             self.table_feed.setItem(row, 3, QtWidgets.QTableWidgetItem(published or "N/A"))
     
+    def _prepend_feed_row(self, article_row):
+        """Sisipkan artikel yang baru dipublish di atas feed (tanpa reload)"""
+        aid, title, _, created = article_row
+        self.table_feed.insertRow(0)
+        self.table_feed.setItem(0, 0, QtWidgets.QTableWidgetItem(str(aid)))
+        self.table_feed.setItem(0, 1, QtWidgets.QTableWidgetItem(title))
+        self.table_feed.setItem(0, 2, QtWidgets.QTableWidgetItem(self.username))
+        self.table_feed.setItem(0, 3, QtWidgets.QTableWidgetItem(created or "N/A"))
+    
     def _logout(self):
         """Logout and close dashboard"""
         if self.hb_timer and self.hb_timer.isActive():
@@ -887,8 +1641,21 @@ class PenerbitDashboard(QtWidgets.QMainWindow):
                 border: 1px solid #7c5cff;
             }
             
+            #analyticsCombo {
+                background: #15161d;
+                color: #e5e7eb;
+                border: 1px solid #25262f;
+                border-radius: 10px;
+                padding: 8px 16px;
+            }
+            #analyticsCombo QAbstractItemView {
+                background: #15161d;
+                color: #e5e7eb;
+                selection-background-color: #1f2937;
+            }
+            
             /* Tables */
-            QTableWidget {
+            QTableView {
                 background: #15161d;
                 color: #e5e7eb;
                 border: 1px solid #25262f;
@@ -897,7 +1664,7 @@ class PenerbitDashboard(QtWidgets.QMainWindow):
                 selection-background-color: #1f2937;
                 selection-color: #ffffff;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 8px;
             }
             QHeaderView::section {
@@ -910,7 +1677,7 @@ class PenerbitDashboard(QtWidgets.QMainWindow):
                 font-size: 12px;
                 text-transform: uppercase;
             }
-            QTableWidget::item:alternate {
+            QTableView::item:alternate {
                 background: #1a1b26;
             }
             
@@ -966,6 +1733,8 @@ class PenerbitDashboard(QtWidgets.QMainWindow):
     
     def closeEvent(self, event):
         """Handle close event"""
+        self.autosave.close()
+        self._analytics_executor.shutdown(wait=False)
         self._logout()
         event.accept()
 
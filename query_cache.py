@@ -0,0 +1,227 @@
+# query_cache.py — TTL/LRU cache untuk article stats dan feed ranking
+"""
+Cache di depan query yang dipanggil ulang setiap tab switch / refresh:
+get_article_stats, get_trending_articles, get_popular_articles,
+get_most_liked_articles.
+
+- Ukuran dibatasi (LRU, MAX_ENTRIES), TTL per entry
+- Stale-while-revalidate: setelah TTL, data lama masih dipakai selama
+  STALE window sambil di-refresh di background; setelah itu query sinkron
+- Invalidation otomatis lewat wrapper write di modul ini: like/bookmark
+  menghapus stats artikel itu + feed, create/update/publish/delete news
+  menghapus feed
+- stats(): hits / stale hits / misses / refreshes / evictions untuk tuning
+
+Pakai fungsi dari modul ini sebagai pengganti fungsi app_db_* yang sama.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple, Union
+
+import app_db_fixed
+import app_db_interactions
+
+MAX_ENTRIES = 512
+
+# (ttl, stale) dalam detik
+STATS_TTL = (30.0, 300.0)
+FEED_TTL = (60.0, 600.0)
+
+FEEDS_TAG = "feeds"
+
+
+class _Entry:
+    __slots__ = ("value", "fetched_at", "ttl", "stale", "tags", "refreshing")
+
+    def __init__(self, value, ttl: float, stale: float, tags: Tuple[str, ...]):
+        self.value = value
+        self.fetched_at = time.monotonic()
+        self.ttl = ttl
+        self.stale = stale
+        self.tags = tags
+        self.refreshing = False
+
+
+class QueryCache:
+    """LRU + TTL cache dengan stale-while-revalidate dan invalidation per tag."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        # Generasi per tag (+ global untuk invalidate semua): naik setiap
+        # invalidation; hasil query yang mulai sebelum invalidation tag-nya dibuang
+        self._generation = 0
+        self._tag_generations: Dict[str, int] = {}
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="QueryCache")
+        self._counters = {"hits": 0, "stale_hits": 0, "misses": 0,
+                          "refreshes": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, key: Hashable, loader: Callable, ttl: float, stale: float,
+            tags: Iterable[str] = ()):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry.fetched_at
+                if age < entry.ttl:
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return entry.value
+                if age < entry.ttl + entry.stale:
+                    self._entries.move_to_end(key)
+                    self._counters["stale_hits"] += 1
+                    if not entry.refreshing:
+                        entry.refreshing = True
+                        tags = tuple(tags)
+                        self._executor.submit(self._refresh, key, loader, ttl, stale,
+                                              tags, self._snapshot(tags))
+                    return entry.value
+            self._counters["misses"] += 1
+            tags = tuple(tags)
+            generation = self._snapshot(tags)
+
+        value = loader()
+        self._store(key, value, ttl, stale, tags, generation)
+        return value
+
+    def _snapshot(self, tags: Tuple[str, ...]) -> tuple:
+        """Generasi yang relevan untuk entry dengan tags tsb. Caller pegang lock."""
+        return (self._generation,) + tuple(self._tag_generations.get(tag, 0) for tag in tags)
+
+    def _refresh(self, key, loader: Callable, ttl: float, stale: float,
+                 tags: Tuple[str, ...], generation: tuple):
+        try:
+            value = loader()
+        except Exception as e:
+            print(f"⚠️ Cache refresh failed for {key[0]}: {e}")
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refreshing = False
+            return
+        with self._lock:
+            self._counters["refreshes"] += 1
+        self._store(key, value, ttl, stale, tags, generation)
+
+    def _store(self, key, value, ttl: float, stale: float, tags: Tuple[str, ...], generation: tuple):
+        with self._lock:
+            if generation != self._snapshot(tags):
+                # Ada invalidation selama query berjalan: hasil mungkin sudah basi
+                # dan tidak boleh menimpa entry yang lebih baru
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refreshing = False  # stale hit berikutnya boleh refresh lagi
+                return
+            self._entries[key] = _Entry(value, ttl, stale, tags)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def invalidate(self, tag: Optional[str] = None) -> int:
+        """Hapus entry dengan tag tsb (None = semua). Return jumlah entry."""
+        with self._lock:
+            keys = [key for key, entry in self._entries.items()
+                    if tag is None or tag in entry.tags]
+            for key in keys:
+                del self._entries[key]
+            if tag is None:
+                self._generation += 1
+            else:
+                self._tag_generations[tag] = self._tag_generations.get(tag, 0) + 1
+            self._counters["invalidations"] += 1
+            return len(keys)
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        with self._lock:
+            result = dict(self._counters)
+            result["size"] = len(self._entries)
+        lookups = result["hits"] + result["stale_hits"] + result["misses"]
+        result["hit_rate"] = (result["hits"] + result["stale_hits"]) / lookups if lookups else 0.0
+        return result
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+cache = QueryCache()
+
+
+def _cached(fn: Callable, ttl: Tuple[float, float], tags: Callable[..., Tuple[str, ...]]):
+    def wrapper(*args, **kwargs):
+        key = (fn.__name__, args, tuple(sorted(kwargs.items())))
+        return cache.get(key, lambda: fn(*args, **kwargs), ttl[0], ttl[1], tags(*args, **kwargs))
+    wrapper.__name__ = fn.__name__
+    wrapper.__doc__ = fn.__doc__
+    return wrapper
+
+
+def _stats_tag(article_id: int) -> str:
+    return f"stats:{article_id}"
+
+
+# ---------- Cached reads ----------
+get_article_stats = _cached(app_db_interactions.get_article_stats, STATS_TTL,
+                            lambda article_id, *a, **k: (_stats_tag(article_id),))
+get_trending_articles = _cached(app_db_interactions.get_trending_articles, FEED_TTL,
+                                lambda *a, **k: (FEEDS_TAG,))
+get_popular_articles = _cached(app_db_interactions.get_popular_articles, FEED_TTL,
+                               lambda *a, **k: (FEEDS_TAG,))
+get_most_liked_articles = _cached(app_db_interactions.get_most_liked_articles, FEED_TTL,
+                                  lambda *a, **k: (FEEDS_TAG,))
+
+
+# ---------- Writes + invalidation ----------
+def invalidate_article(article_id: int):
+    """Counter artikel berubah: stats artikel dan urutan feed."""
+    cache.invalidate(_stats_tag(article_id))
+    cache.invalidate(FEEDS_TAG)
+
+
+def invalidate_feeds():
+    cache.invalidate(FEEDS_TAG)
+
+
+def _invalidating_article_write(fn: Callable):
+    def wrapper(article_id: int, username: str) -> bool:
+        success = fn(article_id, username)
+        if success:
+            invalidate_article(article_id)
+        return success
+    wrapper.__name__ = fn.__name__
+    wrapper.__doc__ = fn.__doc__
+    return wrapper
+
+
+def _invalidating_news_write(fn: Callable):
+    def wrapper(*args, **kwargs):
+        result = fn(*args, **kwargs)
+        if result:
+            invalidate_feeds()
+        return result
+    wrapper.__name__ = fn.__name__
+    wrapper.__doc__ = fn.__doc__
+    return wrapper
+
+
+like_article = _invalidating_article_write(app_db_interactions.like_article)
+unlike_article = _invalidating_article_write(app_db_interactions.unlike_article)
+bookmark_article = _invalidating_article_write(app_db_interactions.bookmark_article)
+unbookmark_article = _invalidating_article_write(app_db_interactions.unbookmark_article)
+
+create_news = _invalidating_news_write(app_db_fixed.create_news)
+update_news = _invalidating_news_write(app_db_fixed.update_news)
+bulk_create_news = _invalidating_news_write(app_db_fixed.bulk_create_news)
+bulk_set_news_status = _invalidating_news_write(app_db_fixed.bulk_set_news_status)
+bulk_delete_news = _invalidating_news_write(app_db_fixed.bulk_delete_news)
+
+
+def log_stats():
+    s = cache.stats()
+    print(f"📦 Query cache: {s['hits']} hits, {s['stale_hits']} stale, {s['misses']} misses "
+          f"({s['hit_rate']:.0%}), {s['refreshes']} refreshes, {s['evictions']} evictions, "
+          f"{s['size']} entries")
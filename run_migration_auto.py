@@ -48,12 +48,12 @@ def find_database_url():
         return None
 
 
-def run_migration():
-    """Run the Phase 1 migration script"""
+def run_migration(migration_file='migration_phase1.sql'):
+    """Run a migration script (default: Phase 1)"""
     
     print()
     print("=" * 60)
-    print("🚀 CRYPTO INSIGHT - PHASE 1 MIGRATION")
+    print(f"🚀 CRYPTO INSIGHT - MIGRATION ({migration_file})")
     print("=" * 60)
     print()
     
@@ -113,13 +113,13 @@ def run_migration():
     # Step 2: Read migration file
     print("📄 Step 2: Reading migration file...")
     try:
-        with open('migration_phase1.sql', 'r', encoding='utf-8') as f:
+        with open(migration_file, 'r', encoding='utf-8') as f:
             sql = f.read()
         print("   ✅ Migration file loaded")
         print(f"   📊 File size: {len(sql)} characters")
     except FileNotFoundError:
-        print("   ❌ ERROR: migration_phase1.sql not found!")
-        print("   💡 Make sure migration_phase1.sql is in the same folder")
+        print(f"   ❌ ERROR: {migration_file} not found!")
+        print(f"   💡 Make sure {migration_file} is in the same folder")
         return False
     except Exception as e:
         print(f"   ❌ ERROR reading file: {e}")
@@ -289,14 +289,17 @@ if __name__ == "__main__":
         print()
         sys.exit(1)
     
-    if not os.path.exists('migration_phase1.sql'):
-        print("❌ ERROR: migration_phase1.sql not found in current directory")
-        print("💡 Make sure migration_phase1.sql is in the same folder")
+    # Optional: python run_migration_auto.py migration_phase2_admin_users.sql
+    migration_file = sys.argv[1] if len(sys.argv) > 1 else 'migration_phase1.sql'
+    
+    if not os.path.exists(migration_file):
+        print(f"❌ ERROR: {migration_file} not found in current directory")
+        print(f"💡 Make sure {migration_file} is in the same folder")
         print()
         sys.exit(1)
     
     # Run migration
-    success = run_migration()
+    success = run_migration(migration_file)
     
     print()
     
@@ -5,6 +5,8 @@ Enhanced User Dashboard dengan:
 - Liked Articles tab
 - Saved/Bookmarked Articles tab
 - Article cards dengan Like/Bookmark buttons
+- Full-text search (debounced, ranked, dengan snippet)
+- Autocomplete judul & penerbit
 - Real-time stats
 
 Author: Claude + Reza
@@ -15,21 +17,22 @@ from PyQt5 import QtWidgets, QtCore, QtGui
 from typing import Optional, List, Tuple
 from app_db_fixed import heartbeat, end_session
 from app_db_interactions import (
-    get_trending_articles,
-    get_popular_articles,
-    get_most_liked_articles,
     get_user_liked_articles,
     get_user_bookmarked_articles,
-    get_user_interaction_summary,
     get_article_full_info,
+    search_news
+)
+import query_cache
+import local_replica
+from local_replica import (
     like_article,
     unlike_article,
     bookmark_article,
-    unbookmark_article,
-    is_article_liked,
-    is_article_bookmarked,
-    track_article_view
+    unbookmark_article
 )
+import interaction_state
+from view_tracker import record_view
+from autocomplete import AutocompleteController
 
 
 class ArticleCardCompact(QtWidgets.QFrame):
@@ -41,7 +44,7 @@ class ArticleCardCompact(QtWidgets.QFrame):
     
     def __init__(self, article_id: int, title: str, author: str, 
                  username: str, views: int = 0, likes: int = 0, 
-                 bookmarks: int = 0, parent=None):
+                 bookmarks: int = 0, snippet: str = "", parent=None):
         super().__init__(parent)
         self.article_id = article_id
         self.title = title
@@ -50,9 +53,10 @@ class ArticleCardCompact(QtWidgets.QFrame):
         self.views = views
         self.likes = likes
         self.bookmarks = bookmarks
+        self.snippet = snippet
         
-        self.is_liked = is_article_liked(article_id, username)
-        self.is_bookmarked = is_article_bookmarked(article_id, username)
+        self.is_liked = interaction_state.is_liked(article_id, username)
+        self.is_bookmarked = interaction_state.is_bookmarked(article_id, username)
         
         self.setObjectName("articleCard")
         self.setCursor(QtCore.Qt.PointingHandCursor)
@@ -76,6 +80,14 @@ class ArticleCardCompact(QtWidgets.QFrame):
         author_label.setObjectName("cardAuthor")
         layout.addWidget(author_label)
         
+        # Snippet (hasil search, match ditandai <b>)
+        if self.snippet:
+            snippet_label = QtWidgets.QLabel(self.snippet.replace("\n", " "))
+            snippet_label.setObjectName("cardSnippet")
+            snippet_label.setTextFormat(QtCore.Qt.RichText)
+            snippet_label.setWordWrap(True)
+            layout.addWidget(snippet_label)
+        
         # Stats + Buttons row
         stats_row = QtWidgets.QHBoxLayout()
         stats_row.setSpacing(12)
@@ -132,6 +144,10 @@ class ArticleCardCompact(QtWidgets.QFrame):
                 font-size: 11px;
                 font-weight: 500;
             }
+            #cardSnippet {
+                color: #d1d5db;
+                font-size: 12px;
+            }
             QPushButton {
                 background: transparent;
                 border: none;
@@ -157,6 +173,7 @@ class ArticleCardCompact(QtWidgets.QFrame):
                 self.likes += 1
         
         if success:
+            interaction_state.record_like(self.article_id, self.username, self.is_liked)
             self._update_like_button()
     
     def _update_like_button(self):
@@ -182,6 +199,7 @@ class ArticleCardCompact(QtWidgets.QFrame):
                 self.bookmarks += 1
         
         if success:
+            interaction_state.record_bookmark(self.article_id, self.username, self.is_bookmarked)
             self._update_bookmark_button()
     
     def _update_bookmark_button(self):
@@ -196,8 +214,8 @@ class ArticleCardCompact(QtWidgets.QFrame):
     def mousePressEvent(self, event):
         """Handle card click"""
         if event.button() == QtCore.Qt.LeftButton:
-            # Track view
-            track_article_view(self.article_id, self.username)
+            # Track view (dedupe + rate limit, insert di background)
+            record_view(self.article_id, self.username)
             self.article_clicked.emit(self.article_id)
         super().mousePressEvent(event)
 
@@ -239,27 +257,31 @@ class ArticleListWidget(QtWidgets.QWidget):
         scroll.setWidget(self.container)
         layout.addWidget(scroll)
     
-    def load_articles(self, articles: List[Tuple]):
+    def load_articles(self, articles: List[Tuple], append: bool = False):
         """
         Load articles into list
         articles: [(id, title, author, views, likes, bookmarks, created_at), ...]
+        Row hasil search_news() boleh dipakai langsung (snippet ikut ditampilkan).
+        append: tambahkan di bawah list yang ada (halaman berikutnya)
         """
         # Clear existing
-        while self.container_layout.count() > 1:
-            item = self.container_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        if not append:
+            while self.container_layout.count() > 1:
+                item = self.container_layout.takeAt(0)
+                if item.widget():
+                    item.widget().deleteLater()
         
         # Add articles
         if not articles:
-            no_data = QtWidgets.QLabel("No articles found")
-            no_data.setAlignment(QtCore.Qt.AlignCenter)
-            no_data.setStyleSheet("color: #6b7280; font-size: 14px; padding: 40px;")
-            self.container_layout.insertWidget(0, no_data)
+            if not append:
+                no_data = QtWidgets.QLabel("No articles found")
+                no_data.setAlignment(QtCore.Qt.AlignCenter)
+                no_data.setStyleSheet("color: #6b7280; font-size: 14px; padding: 40px;")
+                self.container_layout.insertWidget(0, no_data)
             return
         
         for article in articles:
-            article_id, title, author, views, likes, bookmarks, _ = article
+            article_id, title, author, views, likes, bookmarks, _ = article[:7]
             
             card = ArticleCardCompact(
                 article_id=article_id,
@@ -268,7 +290,8 @@ class ArticleListWidget(QtWidgets.QWidget):
                 username=self.username,
                 views=views,
                 likes=likes,
-                bookmarks=bookmarks
+                bookmarks=bookmarks,
+                snippet=article[8] if len(article) > 8 else ""
             )
             card.article_clicked.connect(self._on_article_clicked)
             self.container_layout.insertWidget(self.container_layout.count() - 1, card)
@@ -280,16 +303,63 @@ class ArticleListWidget(QtWidgets.QWidget):
         # TODO: Open article detail view
 
 
+class ReplicaSyncWorker(QtCore.QThread):
+    """Jalankan LocalReplica.sync() (replay outbox + tarik perubahan) di background."""
+    
+    synced = QtCore.pyqtSignal(bool, bool, int)  # online, feeds changed, replayed
+    
+    def __init__(self, replica, parent=None):
+        super().__init__(parent)
+        self.replica = replica
+    
+    def run(self):
+        try:
+            result = self.replica.sync()
+        except Exception as e:
+            print(f"⚠️ Replica sync failed: {e}")
+            result = {"online": False, "feeds_changed": False, "replayed": 0}
+        self.synced.emit(result["online"], result["feeds_changed"], result["replayed"])
+
+
+class SearchWorker(QtCore.QThread):
+    """Jalankan search_news di background thread."""
+    
+    results = QtCore.pyqtSignal(int, list, bool)  # request seq, rows, append
+    
+    def __init__(self, seq: int, query: str, after=None, parent=None):
+        super().__init__(parent)
+        self.seq = seq
+        self.query = query
+        self.after = after
+    
+    def run(self):
+        rows = search_news(self.query, limit=EnhancedUserDashboard.SEARCH_PAGE_SIZE,
+                           after=self.after)
+        self.results.emit(self.seq, rows, self.after is not None)
+
+
 class EnhancedUserDashboard(QtWidgets.QMainWindow):
     """
     Enhanced User Dashboard dengan Phase 1 features
     """
     
+    SEARCH_PAGE_SIZE = 20
+    SEARCH_DEBOUNCE_MS = 300
+    
     def __init__(self, username: str = "user", session_id: Optional[int] = None):
         super().__init__()
         self.username = username
         self.session_id = session_id
         
+        # Search state: hanya hasil dengan seq terbaru yang ditampilkan
+        self._search_seq = 0
+        self._search_last_key = None
+        self._search_workers = set()
+        
+        # Offline-first: feed dirender dari replica lokal, sync di background
+        self.replica = local_replica.open_replica(username)
+        self._sync_worker = None
+        
         self.setWindowTitle("Crypto Insight — User Dashboard")
         self.resize(1100, 700)
         
@@ -302,6 +372,11 @@ class EnhancedUserDashboard(QtWidgets.QMainWindow):
             self.hb_timer = QtCore.QTimer(self)
             self.hb_timer.timeout.connect(lambda: heartbeat(self.session_id))
             self.hb_timer.start(20000)
+        
+        # Reconcile replica + replay outbox berkala
+        self.sync_timer = QtCore.QTimer(self)
+        self.sync_timer.timeout.connect(self._start_sync)
+        self.sync_timer.start(int(local_replica.SYNC_INTERVAL * 1000))
     
     def _setup_ui(self):
         """Setup UI"""
@@ -322,6 +397,25 @@ class EnhancedUserDashboard(QtWidgets.QMainWindow):
         
         header_layout.addStretch()
         
+        # Search box (debounced, query jalan di worker thread)
+        self.search_input = QtWidgets.QLineEdit()
+        self.search_input.setObjectName("searchInput")
+        self.search_input.setPlaceholderText("🔍 Search articles...")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setFixedWidth(280)
+        header_layout.addWidget(self.search_input)
+        
+        self.search_timer = QtCore.QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self._run_search)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        self.search_input.returnPressed.connect(self._run_search)
+        
+        # Autocomplete judul/author (trie lokal, fallback pg_trgm)
+        self.autocomplete = AutocompleteController(self.search_input, self)
+        self.autocomplete.completer.activated.connect(lambda _: self._run_search())
+        
         # Stats
         self.stats_label = QtWidgets.QLabel()
         self.stats_label.setObjectName("statsLabel")
@@ -361,6 +455,10 @@ class EnhancedUserDashboard(QtWidgets.QMainWindow):
         self.saved_tab = ArticleListWidget(self.username)
         self.tabs.addTab(self.saved_tab, "🔖 Saved")
         
+        # Tab 4: Search results
+        self.search_tab = self._create_search_tab()
+        self.tabs.addTab(self.search_tab, "🔍 Search")
+        
         layout.addWidget(self.tabs)
     
     def _create_news_feed_tab(self) -> QtWidgets.QWidget:
@@ -389,6 +487,28 @@ class EnhancedUserDashboard(QtWidgets.QMainWindow):
         
         return tab
     
+    def _create_search_tab(self) -> QtWidgets.QWidget:
+        """Create search results tab"""
+        tab = QtWidgets.QWidget()
+        layout = QtWidgets.QVBoxLayout(tab)
+        layout.setContentsMargins(0, 8, 0, 0)
+        
+        self.search_status = QtWidgets.QLabel("Type in the search box to find articles")
+        self.search_status.setObjectName("statsLabel")
+        layout.addWidget(self.search_status)
+        
+        self.search_list = ArticleListWidget(self.username)
+        layout.addWidget(self.search_list)
+        
+        self.search_more_btn = QtWidgets.QPushButton("Load more")
+        self.search_more_btn.setObjectName("iconBtn")
+        self.search_more_btn.setFixedHeight(32)
+        self.search_more_btn.setVisible(False)
+        self.search_more_btn.clicked.connect(self._load_more_search)
+        layout.addWidget(self.search_more_btn)
+        
+        return tab
+    
     def _apply_styles(self):
         """Apply styles"""
         self.setStyleSheet("""
@@ -418,6 +538,17 @@ class EnhancedUserDashboard(QtWidgets.QMainWindow):
                 border-color: #374151;
                 color: #e5e7eb;
             }
+            #searchInput {
+                background: #15161d;
+                color: #e5e7eb;
+                border: 1px solid #25262f;
+                border-radius: 6px;
+                padding: 8px 12px;
+                font-size: 13px;
+            }
+            #searchInput:focus {
+                border-color: #7c5cff;
+            }
             #logoutBtn {
                 background: #ef4444;
                 color: white;
@@ -459,44 +590,45 @@ class EnhancedUserDashboard(QtWidgets.QMainWindow):
     def _load_initial_data(self):
         """Load initial data"""
         self._update_stats()
-        self._load_trending()
-        self._load_popular()
-        self._load_most_liked()
+        self._render_feeds()
+        self._start_sync()
     
     def _update_stats(self):
-        """Update user stats"""
+        """Update user stats (dari replica lokal, tanpa query)"""
         try:
-            summary = get_user_interaction_summary(self.username)
-            liked = summary.get('liked', 0)
-            bookmarked = summary.get('bookmarked', 0)
-            self.stats_label.setText(f"❤️ {liked} liked  •  🔖 {bookmarked} saved")
+            summary = self.replica.interaction_counts()
+            text = f"❤️ {summary['liked']} liked  •  🔖 {summary['bookmarked']} saved"
+            if self.replica.online is False:
+                pending = self.replica.pending()
+                text += "  •  📴 Offline" + (f" ({pending} pending)" if pending else "")
+            self.stats_label.setText(text)
         except Exception as e:
             print(f"Error updating stats: {e}")
             self.stats_label.setText("Stats unavailable")
     
-    def _load_trending(self):
-        """Load trending articles"""
-        try:
-            articles = get_trending_articles(limit=20, days=7)
-            self.trending_list.load_articles(articles)
-        except Exception as e:
-            print(f"Error loading trending: {e}")
+    def _render_feeds(self):
+        """Render trending / popular / most liked dari replica lokal"""
+        for name, list_widget in (("trending", self.trending_list),
+                                  ("popular", self.popular_list),
+                                  ("most_liked", self.most_liked_list)):
+            try:
+                list_widget.load_articles(self.replica.feed(name))
+            except Exception as e:
+                print(f"Error loading {name} feed: {e}")
     
-    def _load_popular(self):
-        """Load popular articles"""
-        try:
-            articles = get_popular_articles(limit=20)
-            self.popular_list.load_articles(articles)
-        except Exception as e:
-            print(f"Error loading popular: {e}")
+    def _start_sync(self):
+        """Sync replica di background (skip jika sync sebelumnya masih jalan)"""
+        if self._sync_worker is not None and self._sync_worker.isRunning():
+            return
+        self._sync_worker = ReplicaSyncWorker(self.replica, self)
+        self._sync_worker.synced.connect(self._on_synced)
+        self._sync_worker.start()
     
-    def _load_most_liked(self):
-        """Load most liked articles"""
-        try:
-            articles = get_most_liked_articles(limit=20)
-            self.most_liked_list.load_articles(articles)
-        except Exception as e:
-            print(f"Error loading most liked: {e}")
+    def _on_synced(self, online: bool, feeds_changed: bool, replayed: int):
+        """Render ulang feed hanya jika urutannya berubah"""
+        if feeds_changed:
+            self._render_feeds()
+        self._update_stats()
     
     def _load_liked_articles(self):
         """Load user's liked articles"""
@@ -514,6 +646,56 @@ class EnhancedUserDashboard(QtWidgets.QMainWindow):
         except Exception as e:
             print(f"Error loading saved articles: {e}")
     
+    def _run_search(self):
+        """Mulai search baru (halaman pertama) untuk isi search box"""
+        self.search_timer.stop()
+        query = self.search_input.text().strip()
+        self._search_seq += 1
+        self._search_last_key = None
+        
+        if not query:
+            self.search_list.load_articles([])
+            self.search_status.setText("Type in the search box to find articles")
+            self.search_more_btn.setVisible(False)
+            return
+        
+        self.search_status.setText(f"Searching for \"{query}\"...")
+        self.tabs.setCurrentWidget(self.search_tab)
+        self._start_search_worker(query, None)
+    
+    def _load_more_search(self):
+        """Halaman berikutnya (keyset: rank + id dari baris terakhir)"""
+        query = self.search_input.text().strip()
+        if query and self._search_last_key:
+            self.search_more_btn.setEnabled(False)
+            self._start_search_worker(query, self._search_last_key)
+    
+    def _start_search_worker(self, query: str, after):
+        worker = SearchWorker(self._search_seq, query, after, self)
+        worker.results.connect(self._on_search_results)
+        worker.finished.connect(lambda w=worker: self._search_workers.discard(w))
+        self._search_workers.add(worker)
+        worker.start()
+    
+    def _on_search_results(self, seq: int, rows: list, append: bool):
+        """Tampilkan hasil; hasil dari query lama diabaikan"""
+        if seq != self._search_seq:
+            return
+        
+        self.search_list.load_articles(rows, append=append)
+        if rows:
+            last = rows[-1]
+            self._search_last_key = (last[7], last[0])
+        
+        has_more = len(rows) == self.SEARCH_PAGE_SIZE
+        self.search_more_btn.setVisible(has_more)
+        self.search_more_btn.setEnabled(True)
+        if not append:
+            query = self.search_input.text().strip()
+            self.search_status.setText(
+                f"Results for \"{query}\"" if rows else f"No results for \"{query}\""
+            )
+    
     def _on_tab_changed(self, index: int):
         """Handle tab change"""
         if index == 1:  # Liked tab
@@ -528,13 +710,13 @@ class EnhancedUserDashboard(QtWidgets.QMainWindow):
         current_tab = self.tabs.currentIndex()
         
         if current_tab == 0:  # News Feed
-            self._load_trending()
-            self._load_popular()
-            self._load_most_liked()
+            self._start_sync()
         elif current_tab == 1:  # Liked
             self._load_liked_articles()
         elif current_tab == 2:  # Saved
             self._load_saved_articles()
+        elif current_tab == 3:  # Search
+            self._run_search()
         
         self._update_stats()
         print("✅ Refreshed!")
@@ -543,6 +725,7 @@ class EnhancedUserDashboard(QtWidgets.QMainWindow):
         """Logout"""
         if hasattr(self, 'hb_timer') and self.hb_timer.isActive():
             self.hb_timer.stop()
+        self.sync_timer.stop()
         
         if self.session_id:
             try:
@@ -550,11 +733,19 @@ class EnhancedUserDashboard(QtWidgets.QMainWindow):
             except Exception as e:
                 print(f"Error ending session: {e}")
         
+        interaction_state.release(self.username)
+        query_cache.log_stats()
         self.close()
     
     def closeEvent(self, event):
         """Handle window close"""
+        for worker in list(self._search_workers):
+            worker.wait(2000)
+        self.autocomplete.shutdown()
         self._logout()
+        if self._sync_worker is not None:
+            self._sync_worker.wait(5000)
+        local_replica.close_replica()
         event.accept()
 
 
@@ -0,0 +1,141 @@
+# view_tracker.py — Dedupe + rate limit view tracking sebelum ke database
+"""
+Semua view dari UI lewat record_view():
+- Dedupe: (user, article) yang sudah dikirim dalam DEDUPE_WINDOW detik
+  terakhir tidak dikirim lagi (TTL cache, LRU dengan batas ukuran), jadi
+  membuka ulang artikel atau rebuild widget saat refresh tidak menambah view
+- Rate limit: token bucket per user; view di atas limit dibuang
+- Insert dijalankan di worker thread, tidak pernah di UI thread
+
+View yang gagal terkirim (offline) masuk outbox local_replica.
+Window dan limit bisa diubah lewat app_settings (views.dedupe_window_seconds,
+views.rate_per_minute). Server juga punya guard yang sama
+(migration_phase15_view_guard.sql) untuk client yang tidak memakai modul ini.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from app_db_fixed import get_app_settings
+from app_db_interactions import track_article_view
+import local_replica
+
+DEDUPE_WINDOW = 1800.0   # detik
+RATE_PER_MINUTE = 30.0   # view per user per menit
+BURST = 10               # kapasitas token bucket
+MAX_ENTRIES = 10000      # batas ukuran TTL cache
+
+
+class TokenBucket:
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate  # token per detik
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self, now: float) -> bool:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class ViewTracker:
+    """Filter view redundant di client; yang lolos dikirim di background."""
+
+    def __init__(self, window: float = DEDUPE_WINDOW, rate_per_minute: float = RATE_PER_MINUTE,
+                 burst: int = BURST, max_entries: int = MAX_ENTRIES):
+        self.window = window
+        self.rate_per_minute = rate_per_minute
+        self.burst = burst
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # (user, article_id) -> waktu terakhir dikirim (monotonic), urut LRU
+        self._seen: "OrderedDict[Tuple[str, int], float]" = OrderedDict()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ViewTracker")
+        self._settings_loaded = False
+        self.sent = 0
+        self.deduped = 0
+        self.throttled = 0
+
+    def record_view(self, article_id: int, username: Optional[str] = None) -> bool:
+        """
+        Catat view. Return True jika view dikirim ke database, False jika
+        dibuang (duplikat dalam window atau melebihi rate limit).
+        """
+        user = username or ""
+        key = (user, article_id)
+        now = time.monotonic()
+        with self._lock:
+            last = self._seen.get(key)
+            if last is not None and now - last < self.window:
+                self.deduped += 1
+                return False
+
+            bucket = self._buckets.get(user)
+            if bucket is None:
+                bucket = self._buckets[user] = TokenBucket(self.burst, self.rate_per_minute / 60.0)
+            if not bucket.take(now):
+                self.throttled += 1
+                return False
+
+            self._seen[key] = now
+            self._seen.move_to_end(key)
+            while len(self._seen) > self.max_entries:
+                self._seen.popitem(last=False)
+            self.sent += 1
+
+        self._executor.submit(self._send, article_id, username)
+        return True
+
+    def _send(self, article_id: int, username: Optional[str]):
+        if not self._settings_loaded:
+            self._load_settings()
+        replica = local_replica.current()
+        if replica is not None and replica.online is False:
+            local_replica.enqueue_view(article_id, username)
+            return
+        try:
+            if not track_article_view(article_id, username):
+                local_replica.enqueue_view(article_id, username)
+        except Exception as e:
+            print(f"⚠️ View tracking failed: {e}")
+
+    def _load_settings(self):
+        """Window/limit dari app_settings (sekali, di worker thread)."""
+        self._settings_loaded = True
+        settings = get_app_settings("views.")
+        with self._lock:
+            self.window = float(settings.get("views.dedupe_window_seconds", self.window))
+            rate = float(settings.get("views.rate_per_minute", self.rate_per_minute))
+            if rate != self.rate_per_minute:
+                self.rate_per_minute = rate
+                self._buckets.clear()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+_default_tracker: Optional[ViewTracker] = None
+_default_lock = threading.Lock()
+
+
+def default_tracker() -> ViewTracker:
+    global _default_tracker
+    with _default_lock:
+        if _default_tracker is None:
+            _default_tracker = ViewTracker()
+        return _default_tracker
+
+
+def record_view(article_id: int, username: Optional[str] = None) -> bool:
+    """Catat view lewat tracker bersama (dedupe + rate limit + background insert)."""
+    return default_tracker().record_view(article_id, username)